@@ -1,5 +1,47 @@
 #!/bin/bash
 # SwiftRDP.sh – Vérifie les dépendances, corrige le fichier desktop et lance l'application SwiftRDP
+# Les vérifications sont mises en cache : elles ne sont refaites que si l'empreinte
+# (chemins des binaires, fichier desktop, version) a changé, ou avec --recheck.
+
+INSTALL_DIR="/opt/SwiftRDP"
+# Après une mise à jour, la version active est dans current -> versions/<version>
+APP_DIR="$INSTALL_DIR"
+if [ -d "$INSTALL_DIR/current" ]; then
+    APP_DIR="$INSTALL_DIR/current"
+fi
+if [ "$(readlink -f "$(dirname "$0")")" != "$(readlink -f "$APP_DIR")" ] && [ -f "$APP_DIR/SwiftRDP.sh" ]; then
+    exec /bin/bash "$APP_DIR/SwiftRDP.sh" "$@"
+fi
+
+DESKTOP_FILE="/usr/share/applications/SwiftRDP.desktop"
+CACHE_DIR="${XDG_CACHE_HOME:-$HOME/.cache}/SwiftRDP"
+CACHE_FILE="$CACHE_DIR/launcher.cache"
+
+# --- Arguments : --recheck force une vérification complète, le reste est transmis à l'application ---
+RECHECK=0
+ARGS=()
+for arg in "$@"; do
+    if [ "$arg" = "--recheck" ]; then
+        RECHECK=1
+    else
+        ARGS+=("$arg")
+    fi
+done
+
+launcher_fingerprint() {
+    {
+        for cmd in zenity python3 pip3 xfreerdp wmctrl git; do
+            echo "$cmd=$(command -v "$cmd")"
+        done
+        echo "python3_real=$(readlink -f "$(command -v python3)")"
+        echo "desktop=$(sha256sum "$DESKTOP_FILE" 2>/dev/null | cut -d' ' -f1)"
+        echo "version=$(cat "$APP_DIR/version.txt" 2>/dev/null)"
+    } | sha256sum | cut -d' ' -f1
+}
+
+if [ "$RECHECK" -eq 0 ] && [ -f "$CACHE_FILE" ] && [ "$(cat "$CACHE_FILE")" = "$(launcher_fingerprint)" ]; then
+    exec python3 "$APP_DIR/SwiftRDP_app.py" "${ARGS[@]}"
+fi
 
 # --- Vérification des dépendances ---
 if ! command -v zenity >/dev/null 2>&1; then
@@ -67,11 +109,10 @@ if ! command -v git >/dev/null 2>&1; then
     fi
 fi
 
-# --- Vérifier et corriger le fichier desktop ---
-DESKTOP_FILE="/usr/share/applications/SwiftRDP.desktop"
+# --- Vérifier et corriger le fichier desktop (sudo seulement s'il faut le modifier) ---
 REQUIRED_EXEC="Exec=/opt/SwiftRDP/SwiftRDP.sh %u"
 REQUIRED_MIME="MimeType=x-scheme-handler/rdp;"
-if [ -f "$DESKTOP_FILE" ]; then
+if [ -f "$DESKTOP_FILE" ] && ! { grep -qxF "$REQUIRED_EXEC" "$DESKTOP_FILE" && grep -qxF "$REQUIRED_MIME" "$DESKTOP_FILE"; }; then
     sudo sed -i "s|^Exec=.*|$REQUIRED_EXEC|" "$DESKTOP_FILE"
     if grep -q "^MimeType=" "$DESKTOP_FILE"; then
         sudo sed -i "s|^MimeType=.*|$REQUIRED_MIME|" "$DESKTOP_FILE"
@@ -81,5 +122,8 @@ if [ -f "$DESKTOP_FILE" ]; then
     sudo update-desktop-database /usr/share/applications/
 fi
 
+# --- Mémoriser l'empreinte de cette vérification réussie ---
+mkdir -p "$CACHE_DIR" && launcher_fingerprint > "$CACHE_FILE"
+
 # --- Lancer l'application Python en transmettant les arguments (y compris les liens rdp://)
-python3 /opt/SwiftRDP/SwiftRDP_app.py "$@"
+exec python3 "$APP_DIR/SwiftRDP_app.py" "${ARGS[@]}"
@@ -1,15 +1,58 @@
 #!/usr/bin/env python3
+import time
+# Début du démarrage (profilage des phases, voir StartupProfiler)
+STARTUP_T0 = time.perf_counter()
 import re
 import webbrowser
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog, filedialog
-import subprocess, os, zipfile, shutil, tempfile, threading, time, sys, hashlib, socket
+import subprocess, io, os, collections, asyncio, zipfile, shutil, tempfile, threading, sys, hashlib, socket, sqlite3, json, atexit, uuid, shlex, signal, random
 from datetime import datetime
 from functools import partial
 from base64 import b64encode, b64decode
 
+######################################
+# Profilage du démarrage
+######################################
+class StartupProfiler:
+    """
+    Mesure la durée des phases de démarrage (imports, configuration, création de la fenêtre,
+    remplissage du tableau, mot de passe maître, premier affichage). Actif avec SWIFTRDP_PROFILE=1 ou --profile-startup ;
+    une ligne par lancement est ajoutée à startup_profile.log.
+    """
+    def __init__(self, t0):
+        self.enabled = os.environ.get("SWIFTRDP_PROFILE") == "1" or "--profile-startup" in sys.argv
+        self.last = t0
+        self.phases = []
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self.last) * 1000))
+        self.last = now
+
+    def report(self):
+        total = sum(ms for _, ms in self.phases)
+        parts = " ".join(f"{phase}={ms:.0f}ms" for phase, ms in self.phases)
+        return f"{parts} total={total:.0f}ms"
+
+    def write(self, path):
+        if not self.enabled:
+            return
+        line = f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} {self.report()}"
+        print(line, file=sys.stderr)
+        try:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError:
+            pass
+
+startup_profiler = StartupProfiler(STARTUP_T0)
+startup_profiler.mark("imports")
+
 # Seuil pour considérer un double-clic rapide (en millisecondes)
 DOUBLE_CLICK_THRESHOLD = 250
+# Modificateur Maj dans event.state (Maj + double-clic : forcer une nouvelle session)
+SHIFT_MASK = 0x0001
 
 ######################################
 # Utilitaire de dérivation de clé à partir du mot de passe maître
@@ -81,12 +124,16 @@ translations = {
         "warning_duplicate_ip": "L'IP '{ip}' est déjà enregistrée. Voulez-vous continuer ?",
         "connection_added": "Connexion ajoutée.",
         "connection_modified": "Connexion modifiée.",
-        "language_saved_restart": "La langue, le thème et les raccourcis ont été enregistrés.\nL'application va redémarrer automatiquement.",
+        "password_saved": "Le mot de passe de l'application a été enregistré.",
         "new_version_available": "Une nouvelle version est disponible. Voulez-vous mettre à jour SwiftRDP ?",
         "no_update_available": "Aucune mise à jour disponible.",
         "update_failed": "La mise à jour a échoué",
         "update_complete": "Mise à jour et redémarrage.",
         "update_in_progress_t": "Mise à jour en cours...",
+        "rollback_option": "Revenir à la version précédente",
+        "rollback_confirm": "Revenir à la version précédente de SwiftRDP et redémarrer ?",
+        "rollback_failed": "Le retour à la version précédente a échoué",
+        "no_previous_version": "Aucune version précédente disponible.",
         "select_connection": "Veuillez sélectionner une connexion.",
         "delete_connection": "Supprimer la connexion",
         "connection_deleted": "Connexion supprimée.",
@@ -96,6 +143,7 @@ translations = {
         "enter_password_for": "Entrez le mot de passe pour",
         "no_password": "Aucun mot de passe fourni.",
         "launch_error": "Erreur lors du lancement de SwiftRDP",
+        "xfreerdp_launch_error": "Impossible de lancer xfreerdp",
         "connecting": "Connexion en cours...",
         "please_wait": "Connexion en cours, veuillez patienter...",
         "connection_failed": "Connexion échouée",
@@ -128,6 +176,14 @@ translations = {
         "configuration_saved": "Configuration sauvegardée dans : {path}",
         "configuration_exported": "Configuration exportée dans : {path}",
         "configuration_imported": "Configuration importée.",
+        "import_preview": "Fusion : {added} connexion(s) à ajouter, {duplicates} doublon(s), {conflicts} conflit(s) de nom.\nRemplacement : les {existing} connexion(s) existante(s) sont supprimées.",
+        "import_merge": "Fusionner",
+        "import_replace": "Remplacer tout",
+        "cancel": "Annuler",
+        "import_replace_confirm": "Les {removed} connexion(s) existante(s) vont être supprimées et remplacées par les {imported} connexion(s) de l'archive.\n\nContinuer ?",
+        "import_report": "Importation terminée : {added} ajoutée(s), {duplicates} doublon(s) ignoré(s), {conflicts} conflit(s).",
+        "import_conflicts": "Connexions existantes conservées (même nom, contenu différent) :",
+        "import_invalid": "Archive de configuration invalide",
         "configuration_deleted": "Configuration supprimée.",
         "language": "Langue:",
         "theme": "Thème:",
@@ -143,7 +199,69 @@ translations = {
         "delete_all_connections": "Voulez-vous supprimer toutes les connexions ?",
         "delete_all_groups": "Voulez-vous supprimer tous les groupes ?",
         "save": "Enregistrer",
-        "about": "A propos"
+        "about": "A propos",
+        "load_more": "Afficher {count} de plus ({total} restantes)...",
+        "bulk_delete_confirm": "Supprimer les {count} connexions sélectionnées ?",
+        "bulk_deleted": "{count} connexion(s) supprimée(s).",
+        "bulk_updated": "{count} connexion(s) modifiée(s).",
+        "move_to_group": "Déplacer vers un groupe",
+        "choose_group": "Choisissez un groupe (vide = sans groupe) :",
+        "set_login": "Changer le(s) login(s)",
+        "clear_password": "Effacer le mot de passe",
+        "clear_password_confirm": "Effacer le mot de passe enregistré de {count} connexion(s) ?",
+        "connect_all": "Se connecter à toutes",
+        "session_log": "Journal de connexion",
+        "no_session_log": "Aucune session lancée pour cette connexion.",
+        "refresh": "Actualiser",
+        "auth_failed": "identifiants refusés",
+        "dns_failed": "nom d'hôte introuvable",
+        "tls_failed": "échec de la négociation TLS",
+        "connect_failed": "hôte injoignable",
+        "session_exited": "xfreerdp s'est arrêté",
+        "connection_timeout": "délai dépassé",
+        "probe": "Tester la disponibilité",
+        "probe_all": "Tester toutes les connexions",
+        "not_rdp": "pas de service RDP",
+        "launch_queue": "Lancement des connexions",
+        "launch_state": "État",
+        "launch_detail": "Détail",
+        "launch_queued": "En attente",
+        "launch_launching": "Connexion...",
+        "launch_connected": "Connectée",
+        "launch_failed": "Échec",
+        "launch_summary": "{connected} connectée(s), {failed} en échec, {pending} en attente",
+        "profile": "Profil :",
+        "set_profile": "Profil de performance",
+        "profile_default": "Par défaut",
+        "profile_lan": "Réseau local (LAN)",
+        "profile_wan": "Réseau distant (WAN/VPN)",
+        "profile_low_bandwidth": "Faible débit",
+        "profile_auto": "Automatique (selon la latence)",
+        "auto_profile_log": "Profil automatique : {profile} (RTT {rtt} ms, {source})",
+        "auto_profile_unmeasured": "Profil automatique : {profile} (RTT non mesurable)",
+        "rtt_measured": "mesuré",
+        "rtt_average": "moyenne récente",
+        "address_selected": "Adresse retenue : {address}",
+        "address_failover": "Échec sur {address} ({reason}), essai des autres adresses",
+        "sessions": "Sessions",
+        "sessions_summary": "{count} session(s) ouverte(s), {memory} Mo",
+        "session_address": "Adresse",
+        "session_login": "Login",
+        "session_state": "État",
+        "session_duration": "Durée",
+        "session_memory": "Mémoire",
+        "session_cpu": "CPU",
+        "session_ended": "Terminée",
+        "focus_session": "Afficher",
+        "kill_session": "Fermer la session",
+        "kill_session_confirm": "Fermer la session {name} ?",
+        "session_limit": "nombre maximal de sessions atteint",
+        "memory_limit": "limite de mémoire des sessions atteinte",
+        "new_session": "Nouvelle session",
+        "auto_reconnect": "Reconnexion automatique si la session est interrompue",
+        "reconnecting": "reconnexion {attempt}/{total}",
+        "reconnect_failed": "reconnexion abandonnée ({count} échecs)",
+        "reconnect_gave_up": "La session {name} a été interrompue et n'a pas pu être rétablie après {count} tentatives.\n\nDernière erreur : {reason}"
     },
     "en": {
         "title": "SwiftRDP",
@@ -168,12 +286,16 @@ translations = {
         "warning_duplicate_ip": "The IP '{ip}' already exists. Do you want to continue?",
         "connection_added": "Connection added.",
         "connection_modified": "Connection modified.",
-        "language_saved_restart": "Language, theme and shortcuts saved.\nThe application will restart automatically.",
+        "password_saved": "The application password has been saved.",
         "new_version_available": "A new version is available. Do you want to update SwiftRDP?",
         "no_update_available": "No update available.",
         "update_failed": "Update failed",
         "update_complete": "Update and restart.",
         "update_in_progress_t": "Update in progress...",
+        "rollback_option": "Roll back to previous version",
+        "rollback_confirm": "Roll back SwiftRDP to the previous version and restart?",
+        "rollback_failed": "Rollback failed",
+        "no_previous_version": "No previous version available.",
         "select_connection": "Please select a connection.",
         "delete_connection": "Delete connection",
         "connection_deleted": "Connection deleted.",
@@ -183,6 +305,7 @@ translations = {
         "enter_password_for": "Enter password for",
         "no_password": "No password provided.",
         "launch_error": "Error launching SwiftRDP",
+        "xfreerdp_launch_error": "Could not start xfreerdp",
         "connecting": "Connecting...",
         "please_wait": "Please wait while connecting...",
         "connection_failed": "Connection failed",
@@ -215,6 +338,14 @@ translations = {
         "configuration_saved": "Configuration saved in: {path}",
         "configuration_exported": "Configuration exported in: {path}",
         "configuration_imported": "Configuration imported.",
+        "import_preview": "Merge: {added} connection(s) to add, {duplicates} duplicate(s), {conflicts} name conflict(s).\nReplace: the {existing} existing connection(s) are deleted.",
+        "import_merge": "Merge",
+        "import_replace": "Replace all",
+        "cancel": "Cancel",
+        "import_replace_confirm": "The {removed} existing connection(s) will be deleted and replaced by the {imported} connection(s) from the archive.\n\nContinue?",
+        "import_report": "Import complete: {added} added, {duplicates} duplicate(s) skipped, {conflicts} conflict(s).",
+        "import_conflicts": "Existing connections kept (same name, different content):",
+        "import_invalid": "Invalid configuration archive",
         "configuration_deleted": "Configuration deleted.",
         "language": "Language:",
         "theme": "Theme:",
@@ -230,7 +361,69 @@ translations = {
         "delete_all_connections": "Do you want to delete all connections?",
         "delete_all_groups": "Do you want to delete all groups?",
         "save": "Save",
-        "about": "About"
+        "about": "About",
+        "load_more": "Show {count} more ({total} remaining)...",
+        "bulk_delete_confirm": "Delete the {count} selected connections?",
+        "bulk_deleted": "{count} connection(s) deleted.",
+        "bulk_updated": "{count} connection(s) modified.",
+        "move_to_group": "Move to group",
+        "choose_group": "Choose a group (empty = no group):",
+        "set_login": "Change username(s)",
+        "clear_password": "Clear password",
+        "clear_password_confirm": "Clear the saved password of {count} connection(s)?",
+        "connect_all": "Connect to all",
+        "session_log": "Connection log",
+        "no_session_log": "No session has been started for this connection.",
+        "refresh": "Refresh",
+        "auth_failed": "credentials rejected",
+        "dns_failed": "host name not found",
+        "tls_failed": "TLS negotiation failed",
+        "connect_failed": "host unreachable",
+        "session_exited": "xfreerdp exited",
+        "connection_timeout": "timed out",
+        "probe": "Check availability",
+        "probe_all": "Check all connections",
+        "not_rdp": "no RDP service",
+        "launch_queue": "Launching connections",
+        "launch_state": "State",
+        "launch_detail": "Detail",
+        "launch_queued": "Queued",
+        "launch_launching": "Connecting...",
+        "launch_connected": "Connected",
+        "launch_failed": "Failed",
+        "launch_summary": "{connected} connected, {failed} failed, {pending} pending",
+        "profile": "Profile:",
+        "set_profile": "Performance profile",
+        "profile_default": "Default",
+        "profile_lan": "Local network (LAN)",
+        "profile_wan": "Remote network (WAN/VPN)",
+        "profile_low_bandwidth": "Low bandwidth",
+        "profile_auto": "Automatic (based on latency)",
+        "auto_profile_log": "Automatic profile: {profile} (RTT {rtt} ms, {source})",
+        "auto_profile_unmeasured": "Automatic profile: {profile} (RTT could not be measured)",
+        "rtt_measured": "measured",
+        "rtt_average": "recent average",
+        "address_selected": "Selected address: {address}",
+        "address_failover": "{address} failed ({reason}), trying the other addresses",
+        "sessions": "Sessions",
+        "sessions_summary": "{count} open session(s), {memory} MB",
+        "session_address": "Address",
+        "session_login": "Username",
+        "session_state": "State",
+        "session_duration": "Duration",
+        "session_memory": "Memory",
+        "session_cpu": "CPU",
+        "session_ended": "Ended",
+        "focus_session": "Show",
+        "kill_session": "Close session",
+        "kill_session_confirm": "Close the session {name}?",
+        "session_limit": "maximum number of sessions reached",
+        "memory_limit": "session memory limit reached",
+        "new_session": "New session",
+        "auto_reconnect": "Reconnect automatically if the session drops",
+        "reconnecting": "reconnecting {attempt}/{total}",
+        "reconnect_failed": "reconnection given up ({count} failures)",
+        "reconnect_gave_up": "The session {name} was interrupted and could not be restored after {count} attempts.\n\nLast error: {reason}"
     }
 }
 
@@ -241,24 +434,45 @@ def t(key, **kwargs):
 ######################################
 # Dossiers, chemins et permissions
 ######################################
-PROJECT_DIR = "/opt/SwiftRDP"  
+INSTALL_DIR = "/opt/SwiftRDP"
+# Installation versionnée (voir install_update) : current -> versions/<version>
+CURRENT_LINK = os.path.join(INSTALL_DIR, "current")
+PREVIOUS_LINK = os.path.join(INSTALL_DIR, "previous")
+VERSIONS_DIR = os.path.join(INSTALL_DIR, "versions")
+PROJECT_DIR = CURRENT_LINK if os.path.isdir(CURRENT_LINK) else INSTALL_DIR
 CONFIG_DIR = "/usr/local/share/appdata/.SwiftRDP"
 
-if not os.path.exists(CONFIG_DIR):
-    os.makedirs(CONFIG_DIR, exist_ok=True)
-    subprocess.call(["sudo", "chown", "-R", f"{os.environ.get('USER')}:{os.environ.get('USER')}", CONFIG_DIR])
+def fatal_error(title, message):
+    """Erreur bloquante avant la création de la fenêtre principale."""
+    root = tk.Tk()
+    root.withdraw()
+    messagebox.showerror(title, message, parent=root)
+    root.destroy()
+    sys.exit(1)
+
+def config_dir_ready():
+    """Dossier de configuration présent et accessible en écriture (un seul appel système)."""
+    return os.access(CONFIG_DIR, os.W_OK)
 
 def check_and_fix_permissions():
+    """
+    Crée le dossier de configuration et vérifie qu'il est accessible en écriture.
+    sudo n'est sollicité que si ce n'est pas le cas (premier lancement, droits perdus).
+    Appelé au lancement uniquement quand config_dir_ready() échoue : l'import du module
+    ne crée rien et ne lance jamais sudo.
+    """
+    user = os.environ.get("USER")
+    try:
+        os.makedirs(CONFIG_DIR, exist_ok=True)
+    except PermissionError:
+        subprocess.call(["sudo", "mkdir", "-p", CONFIG_DIR])
     if not os.access(CONFIG_DIR, os.W_OK):
         try:
-            subprocess.check_call(["sudo", "chown", "-R", f"{os.environ.get('USER')}:{os.environ.get('USER')}", CONFIG_DIR])
+            subprocess.check_call(["sudo", "chown", "-R", f"{user}:{user}", CONFIG_DIR])
         except Exception:
-            messagebox.showerror("Erreur de permissions",
+            fatal_error("Erreur de permissions",
                 "Impossible de modifier les droits sur le dossier de configuration.\n"
                 "Veuillez lancer l'application en sudo ou vérifier les permissions manuellement.")
-            sys.exit(1)
-
-check_and_fix_permissions()
 
 # Chemins de configuration
 LANGUAGE_FILE     = os.path.join(CONFIG_DIR, "language.conf")
@@ -269,6 +483,23 @@ PASSWORD_FILE     = os.path.join(CONFIG_DIR, "password.conf")
 SHORTCUTS_FILE    = os.path.join(CONFIG_DIR, "shortcuts.conf")
 DISPLAY_MODE_FILE = os.path.join(CONFIG_DIR, "display_mode.conf")
 DEFAULT_RDP_FILE  = os.path.join(CONFIG_DIR, "default_rdp.conf")
+DEFAULT_RDP_STAMP = os.path.join(CONFIG_DIR, "default_rdp.stamp")
+STARTUP_LOG_FILE  = os.path.join(CONFIG_DIR, "startup_profile.log")
+STORAGE_FILE      = os.path.join(CONFIG_DIR, "storage.conf")
+DB_FILE           = os.path.join(CONFIG_DIR, "connexions.db")
+JOURNAL_FILE      = os.path.join(CONFIG_DIR, "connexions.journal")
+JOURNAL_SYNC_FILE = os.path.join(CONFIG_DIR, "journal_fsync.conf")
+LAZY_THRESHOLD_FILE = os.path.join(CONFIG_DIR, "lazy_threshold.conf")
+PROBE_MODE_FILE   = os.path.join(CONFIG_DIR, "probe_mode.conf")
+LAUNCH_CONCURRENCY_FILE = os.path.join(CONFIG_DIR, "launch_concurrency.conf")
+PROFILES_FILE     = os.path.join(CONFIG_DIR, "profiles.conf")
+AUTO_PROFILE_FILE = os.path.join(CONFIG_DIR, "auto_profile.conf")
+LAST_ADDRESSES_FILE = os.path.join(CONFIG_DIR, "last_addresses.conf")
+MAX_SESSIONS_FILE = os.path.join(CONFIG_DIR, "max_sessions.conf")
+MAX_SESSION_MEMORY_FILE = os.path.join(CONFIG_DIR, "max_session_memory.conf")
+UPDATE_REPO_FILE = os.path.join(CONFIG_DIR, "update_repo.conf")
+UPDATE_INTERVAL_FILE = os.path.join(CONFIG_DIR, "update_interval.conf")
+UPDATE_CACHE_FILE = os.path.join(CONFIG_DIR, "update_check.json")
 
 # Fichiers du projet
 CHANGELOG_FILE   = os.path.join(PROJECT_DIR, "CHANGELOG")
@@ -283,24 +514,37 @@ MASTER_KEY = None
 ######################################
 # Configuration RDP par défaut
 ######################################
-if not os.path.exists(DEFAULT_RDP_FILE) or not open(DEFAULT_RDP_FILE, "r", encoding="utf-8").read().strip():
-    if messagebox.askyesno("Application par défaut", "Voulez-vous définir SwiftRDP comme application par défaut pour les liens rdp:// ?"):
-        try:
-            with open(DEFAULT_RDP_FILE, "w", encoding="utf-8") as f:
-                f.write("yes")
-            subprocess.call(["sudo", "xdg-mime", "default", "SwiftRDP.desktop", "x-scheme-handler/rdp"])
-        except Exception as e:
-            messagebox.showerror("Erreur", f"Erreur lors de la configuration RDP par défaut : {e}")
-    else:
+def register_default_rdp(force=False):
+    """
+    Associe les liens rdp:// à SwiftRDP (xdg-mime, par utilisateur). Fait une seule fois :
+    default_rdp.stamp évite de relancer xdg-mime à chaque démarrage.
+    """
+    if not force and os.path.exists(DEFAULT_RDP_STAMP):
+        return True
+    try:
+        ok = subprocess.call(["xdg-mime", "default", "SwiftRDP.desktop", "x-scheme-handler/rdp"]) == 0
+    except OSError:
+        ok = False
+    if ok:
+        with open(DEFAULT_RDP_STAMP, "w", encoding="utf-8") as f:
+            f.write(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    return ok
+
+def setup_default_rdp(app):
+    """
+    Au premier lancement, propose de gérer les liens rdp:// ; ensuite, vérifie
+    l'association en arrière-plan si elle a été acceptée.
+    """
+    choice = ""
+    if os.path.exists(DEFAULT_RDP_FILE):
+        with open(DEFAULT_RDP_FILE, "r", encoding="utf-8") as f:
+            choice = f.read().strip().lower()
+    if not choice:
+        choice = "yes" if messagebox.askyesno("Application par défaut", "Voulez-vous définir SwiftRDP comme application par défaut pour les liens rdp:// ?", parent=app) else "no"
         with open(DEFAULT_RDP_FILE, "w", encoding="utf-8") as f:
-            f.write("no")
-else:
-    DEFAULT_RDP = open(DEFAULT_RDP_FILE, "r", encoding="utf-8").read().strip().lower() == "yes"
-    if DEFAULT_RDP:
-        try:
-            subprocess.call(["sudo", "xdg-mime", "default", "SwiftRDP.desktop", "x-scheme-handler/rdp"])
-        except Exception as e:
-            messagebox.showerror("Erreur", f"Erreur lors de la configuration RDP par défaut : {e}")
+            f.write(choice)
+    if choice == "yes":
+        threading.Thread(target=register_default_rdp, daemon=True).start()
 
 ######################################
 # Chargement de la configuration
@@ -320,6 +564,78 @@ if os.path.exists(DISPLAY_MODE_FILE):
         CONN_DISPLAY_MODE = f.read().strip()
 else:
     CONN_DISPLAY_MODE = "fenetres"
+# Moteur de stockage des connexions : "text" (connexions.txt) ou "sqlite" (connexions.db)
+if os.path.exists(STORAGE_FILE):
+    with open(STORAGE_FILE, "r", encoding="utf-8") as f:
+        STORAGE_BACKEND = f.read().strip().lower() or "text"
+else:
+    STORAGE_BACKEND = "text"
+# Politique fsync du journal : "always" (écriture immédiate), "batch" (par lot) ou "never"
+if os.path.exists(JOURNAL_SYNC_FILE):
+    with open(JOURNAL_SYNC_FILE, "r", encoding="utf-8") as f:
+        JOURNAL_FSYNC = f.read().strip().lower() or "batch"
+else:
+    JOURNAL_FSYNC = "batch"
+# Au-delà de ce nombre de connexions affichées, les groupes sont remplis à la demande
+LAZY_THRESHOLD = 2000
+if os.path.exists(LAZY_THRESHOLD_FILE):
+    with open(LAZY_THRESHOLD_FILE, "r", encoding="utf-8") as f:
+        try:
+            LAZY_THRESHOLD = int(f.read().strip())
+        except ValueError:
+            pass
+# Sondage de disponibilité : "tcp" (port ouvert) ou "x224" (négociation RDP)
+if os.path.exists(PROBE_MODE_FILE):
+    with open(PROBE_MODE_FILE, "r", encoding="utf-8") as f:
+        PROBE_MODE = f.read().strip().lower() or "tcp"
+else:
+    PROBE_MODE = "tcp"
+# Profil automatique : RTT (ms) maximal des paliers LAN et WAN, au-delà : faible débit
+AUTO_PROFILE_THRESHOLDS = (20.0, 150.0)
+if os.path.exists(AUTO_PROFILE_FILE):
+    with open(AUTO_PROFILE_FILE, "r", encoding="utf-8") as f:
+        try:
+            lan_max, wan_max = (float(v) for v in f.read().replace(",", " ").split())
+            AUTO_PROFILE_THRESHOLDS = (lan_max, wan_max)
+        except ValueError:
+            pass
+# Limites des sessions ouvertes : nombre et mémoire totale en Mo (0 = sans limite)
+MAX_SESSIONS = 0
+MAX_SESSION_MEMORY = 0
+if os.path.exists(MAX_SESSIONS_FILE):
+    with open(MAX_SESSIONS_FILE, "r", encoding="utf-8") as f:
+        try:
+            MAX_SESSIONS = int(f.read().strip())
+        except ValueError:
+            pass
+if os.path.exists(MAX_SESSION_MEMORY_FILE):
+    with open(MAX_SESSION_MEMORY_FILE, "r", encoding="utf-8") as f:
+        try:
+            MAX_SESSION_MEMORY = int(f.read().strip())
+        except ValueError:
+            pass
+# Nombre de connexions d'un lot établies simultanément
+LAUNCH_CONCURRENCY = 4
+if os.path.exists(LAUNCH_CONCURRENCY_FILE):
+    with open(LAUNCH_CONCURRENCY_FILE, "r", encoding="utf-8") as f:
+        try:
+            LAUNCH_CONCURRENCY = int(f.read().strip())
+        except ValueError:
+            pass
+# Dépôt de mise à jour et intervalle (en heures) entre deux vérifications au démarrage
+UPDATE_REPO_URL = "https://github.com/Equinoxx83/SwiftRDP.git"
+if os.path.exists(UPDATE_REPO_FILE):
+    with open(UPDATE_REPO_FILE, "r", encoding="utf-8") as f:
+        UPDATE_REPO_URL = f.read().strip() or UPDATE_REPO_URL
+UPDATE_INTERVAL = 6.0
+if os.path.exists(UPDATE_INTERVAL_FILE):
+    with open(UPDATE_INTERVAL_FILE, "r", encoding="utf-8") as f:
+        try:
+            UPDATE_INTERVAL = float(f.read().strip())
+        except ValueError:
+            pass
+
+startup_profiler.mark("config")
 
 ######################################
 # Socket listener pour instance unique
@@ -344,8 +660,8 @@ def socket_listener(app):
 ######################################
 # Thème / styles
 ######################################
-def get_theme():
-    if CURRENT_THEME == "light":
+def get_theme(name=None):
+    if (name or CURRENT_THEME) == "light":
         return {
             "bg": "#ffffff",
             "fg": "#000000",
@@ -368,7 +684,8 @@ def get_theme():
 
 def apply_custom_treeview_style():
     style = ttk.Style()
-    style.theme_use("clam")
+    if style.theme_use() != "clam":
+        style.theme_use("clam")
     if CURRENT_THEME == "dark":
         style.configure("My.Treeview", background="#2b2b2b", fieldbackground="#2b2b2b", foreground="#c0c0c0")
         style.configure("My.Treeview.Heading", background="#1b1b1b", foreground="#ffffff")
@@ -376,6 +693,72 @@ def apply_custom_treeview_style():
         style.configure("My.Treeview", background="#ffffff", fieldbackground="#ffffff", foreground="#000000")
         style.configure("My.Treeview.Heading", background="#e0e0e0", foreground="#000000")
 
+# Options de couleur reprises lors d'un changement de thème à chaud
+THEMED_OPTIONS = ("bg", "fg", "insertbackground", "highlightbackground")
+# Clés de thème à privilégier par classe de widget quand plusieurs clés ont la même couleur
+THEME_KEYS_BY_CLASS = {
+    "Button": ("button_bg", "button_fg"),
+    "Entry": ("entry_bg", "fg"),
+    "Text": ("entry_bg", "fg"),
+}
+
+def restyle_widgets(widget, old_theme, new_theme):
+    """
+    Recolore 'widget' et ses descendants (fenêtres ouvertes comprises) : chaque couleur
+    issue de l'ancien thème est remplacée par la couleur de la même clé dans le nouveau.
+    Les couleurs propres à un widget (liens, boutons de sélection...) sont conservées.
+    """
+    by_color = {}
+    for key, color in old_theme.items():
+        by_color.setdefault(color.lower(), []).append(key)
+    preferred = {}
+    stack = [widget]
+    while stack:
+        w = stack.pop()
+        stack.extend(w.winfo_children())
+        cls = w.winfo_class()
+        if cls not in preferred:
+            preferred[cls] = THEME_KEYS_BY_CLASS.get(cls, ()) + ("bg", "fg")
+        changes = {}
+        for option in THEMED_OPTIONS:
+            try:
+                value = str(w.cget(option)).lower()
+            except tk.TclError:
+                continue
+            keys = by_color.get(value)
+            if not keys:
+                continue
+            key = next((k for k in preferred[cls] if k in keys), keys[0])
+            if new_theme[key] != old_theme[key]:
+                changes[option] = new_theme[key]
+        if changes:
+            w.configure(**changes)
+
+def retranslate_widgets(widget, old_lang):
+    """
+    Remplace, dans 'widget' et ses descendants, les textes et titres de fenêtre traduits
+    dans 'old_lang' par leur traduction dans la langue courante.
+    """
+    old = translations.get(old_lang, translations["fr"])
+    by_text = {}
+    for key, text in old.items():
+        by_text.setdefault(text, key)
+    stack = [widget]
+    while stack:
+        w = stack.pop()
+        stack.extend(w.winfo_children())
+        if isinstance(w, (tk.Tk, tk.Toplevel)):
+            key = by_text.get(w.title())
+            if key:
+                w.title(t(key))
+            continue
+        try:
+            key = by_text.get(str(w.cget("text")))
+        except tk.TclError:
+            continue
+        if key:
+            w.configure(text=t(key))
+
 ######################################
 # Fonctions utilitaires
 ######################################
@@ -383,6 +766,35 @@ def format_note(note: str) -> str:
     display = note.replace("\n", " ")
     return display if len(display) <= 30 else display[:30] + "..."
 
+# http:// ou https:// jusqu'à l'espace
+URL_PATTERN = re.compile(r'https?://[^\s]+')
+
+# Identifiant de connexion -> (empreinte de la note, texte affiché, URL de la note)
+_note_meta_cache = {}
+
+def note_metadata(row):
+    """
+    Retourne (texte tronqué pour le tableau, liste des URL) pour la note de 'row'.
+    Le calcul n'est refait que si le contenu de la note a changé.
+    """
+    note = row[4] or ""
+    digest = hash(note)
+    key = row[7] if len(row) > 7 and row[7] else None
+    cached = _note_meta_cache.get(key) if key else None
+    if cached is not None and cached[0] == digest:
+        return cached[1], cached[2]
+    display = format_note(note)
+    urls = URL_PATTERN.findall(note)
+    if key:
+        _note_meta_cache[key] = (digest, display, urls)
+    return display, urls
+
+def connection_logins(row):
+    """Logins proposés par une connexion (champ Login(s) séparé par des virgules)."""
+    if ',' not in row[2]:
+        return [row[2]]
+    return [u.strip() for u in row[2].split(',') if u.strip()]
+
 def ask_login_selection(options, parent=None):
     top = tk.Toplevel(parent)
     top.title("Sélectionnez un login")
@@ -412,112 +824,916 @@ def ask_login_selection(options, parent=None):
     top.wait_window()
     return result[0] if result else options[0]
 
+def ask_group_selection(options, parent=None):
+    """
+    Demande un groupe (liste existante ou saisie libre). Retourne None si annulé.
+    """
+    top = tk.Toplevel(parent)
+    top.title(t("move_to_group"))
+    top.geometry("350x150")
+    if parent is not None:
+        top.transient(parent)
+    tk.Label(top, text=t("choose_group"), font=("Segoe Script", 12)).pack(padx=10, pady=10)
+    var = tk.StringVar()
+    combo = ttk.Combobox(top, textvariable=var, values=options, font=("Segoe Script", 12))
+    combo.pack(padx=10, pady=10)
+    result = []
+    def on_ok():
+        result.append(var.get().strip())
+        top.destroy()
+    tk.Button(top, text="OK", command=on_ok, font=("Segoe Script", 12)).pack(padx=10, pady=10)
+    top.wait_window()
+    return result[0] if result else None
+
+def ask_profile_selection(parent=None):
+    """
+    Demande un profil de performance. Retourne None si annulé.
+    """
+    top = tk.Toplevel(parent)
+    top.title(t("set_profile"))
+    top.geometry("350x150")
+    if parent is not None:
+        top.transient(parent)
+    tk.Label(top, text=t("profile"), font=("Segoe Script", 12)).pack(padx=10, pady=10)
+    var = tk.StringVar(value=profile_label(""))
+    combo = ttk.Combobox(top, textvariable=var, values=[profile_label(name) for name in PERFORMANCE_PROFILES],
+                         state="readonly", font=("Segoe Script", 12))
+    combo.pack(padx=10, pady=10)
+    result = []
+    def on_ok():
+        result.append(profile_from_label(var.get()))
+        top.destroy()
+    tk.Button(top, text="OK", command=on_ok, font=("Segoe Script", 12)).pack(padx=10, pady=10)
+    top.wait_window()
+    return result[0] if result else None
+
+def ask_import_mode(parent, message):
+    """
+    Demande le mode d'importation : "merge", "replace" ou None si annulé.
+    Chaque mode a son propre bouton (pas de Oui/Non ambigu).
+    """
+    top = tk.Toplevel(parent)
+    top.title(t("import_configuration_option"))
+    if parent is not None:
+        top.transient(parent)
+    tk.Label(top, text=message, font=("Segoe Script", 12), justify="left", wraplength=520).pack(padx=10, pady=10)
+    buttons = tk.Frame(top)
+    buttons.pack(padx=10, pady=10)
+    result = []
+    def choose(mode):
+        result.append(mode)
+        top.destroy()
+    tk.Button(buttons, text=t("import_merge"), command=lambda: choose("merge"),
+              font=("Segoe Script", 12)).pack(side=tk.LEFT, padx=5)
+    tk.Button(buttons, text=t("import_replace"), command=lambda: choose("replace"),
+              font=("Segoe Script", 12)).pack(side=tk.LEFT, padx=5)
+    tk.Button(buttons, text=t("cancel"), command=top.destroy,
+              font=("Segoe Script", 12)).pack(side=tk.LEFT, padx=5)
+    top.wait_window()
+    return result[0] if result else None
+
+######################################
+# Stockage des connexions (cache mémoire)
+######################################
+# Nom|IP|Login(s)|Dernière connexion|Note|Groupe|MotDePasseChiffré|Identifiant|Profil|Reconnexion
+ROW_FIELDS = 10
+
+def new_connection_id():
+    return uuid.uuid4().hex
+
+def parse_connection_line(line):
+    """
+    Convertit une ligne de connexions.txt en liste de ROW_FIELDS champs.
+    """
+    parts = line.split("|")
+    # Restaurer la note multi-lignes (et les "|" échappés)
+    if len(parts) >= 5:
+        parts[4] = parts[4].replace("<NL>", "\n").replace("<PIPE>", "|")
+    while len(parts) < ROW_FIELDS:
+        parts.append("")
+    return parts
+
+def format_connection_line(row):
+    """
+    Convertit une connexion en ligne de connexions.txt (note échappée).
+    """
+    escaped = list(row)
+    while len(escaped) < ROW_FIELDS:
+        escaped.append("")
+    escaped[4] = escaped[4].replace("|", "<PIPE>").replace("\n", "<NL>")
+    return "|".join(escaped) + "\n"
+
+# Délai (s) de regroupement des écritures du journal et seuil de compactage
+JOURNAL_FLUSH_DELAY = 0.5
+JOURNAL_COMPACT_ENTRIES = 1000
+
+def _pad_row(row):
+    row = list(row)
+    while len(row) < ROW_FIELDS:
+        row.append("")
+    return row
+
+def _assign_ids(rows):
+    """
+    Donne un identifiant aux connexions qui n'en ont pas (anciens fichiers) ou dont
+    l'identifiant est en double. Retourne True si au moins une ligne a changé.
+    """
+    seen = set()
+    changed = False
+    for row in rows:
+        if not row[7] or row[7] in seen:
+            row[7] = new_connection_id()
+            changed = True
+        seen.add(row[7])
+    return changed
+
+class ConnectionStore:
+    """
+    Copie mémoire unique (pour tout le processus) de connexions.txt et groups.txt.
+    Les fichiers ne sont relus que si leur signature (mtime, taille, inode) a changé ;
+    les écritures mettent le cache à jour directement.
+
+    Chaque connexion porte un identifiant unique (row[7]) : recherche, modification
+    et suppression passent par un dictionnaire identifiant -> ligne.
+
+    Les modifications unitaires (ajout, modification, suppression) ne réécrivent pas
+    connexions.txt : elles sont ajoutées au journal connexions.journal, par lots
+    (JOURNAL_FLUSH_DELAY), puis rejouées au chargement. Le journal est fusionné dans
+    connexions.txt au-delà de JOURNAL_COMPACT_ENTRIES entrées.
+    """
+    def __init__(self, conns_path, groups_path, journal_path=None, fsync_policy="batch"):
+        self.conns_path = conns_path
+        self.groups_path = groups_path
+        self.journal_path = journal_path
+        self.fsync_policy = fsync_policy
+        self._lock = threading.RLock()
+        self._rows = []
+        self._by_id = {}
+        self._pos = {}
+        self._by_name = {}
+        self._rows_sig = None
+        self._groups = []
+        self._groups_sig = None
+        self._pending = []
+        self._flush_timer = None
+        self._journal_entries = 0
+        # Incrémenté à chaque changement du contenu (utile aux caches dérivés)
+        self.version = 0
+
+    @staticmethod
+    def _signature(path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _write_atomic(self, path, lines):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+            if self.fsync_policy != "never":
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _set_rows(self, rows):
+        self._rows = rows
+        self._by_id = {}
+        self._pos = {}
+        self._by_name = {}
+        for i, row in enumerate(rows):
+            self._by_id[row[7]] = row
+            self._pos[row[7]] = i
+            self._by_name.setdefault(row[0], row)
+        self.version += 1
+
+    def _replace_row(self, new_row):
+        i = self._pos[new_row[7]]
+        old = self._rows[i]
+        self._rows[i] = new_row
+        self._by_id[new_row[7]] = new_row
+        if self._by_name.get(old[0]) is old:
+            del self._by_name[old[0]]
+        self._by_name.setdefault(new_row[0], new_row)
+        self.version += 1
+
+    def _append_row(self, row):
+        self._pos[row[7]] = len(self._rows)
+        self._rows.append(row)
+        self._by_id[row[7]] = row
+        self._by_name.setdefault(row[0], row)
+        self.version += 1
+
+    def _remove_row(self, conn_id):
+        self._set_rows([row for row in self._rows if row[7] != conn_id])
+
+    def _files_signature(self):
+        journal_sig = self._signature(self.journal_path) if self.journal_path else None
+        return (self._signature(self.conns_path), journal_sig)
+
+    def _ensure_rows(self):
+        # Des écritures attendent encore d'être journalisées : le cache fait foi
+        if self._pending:
+            return
+        if self._signature(self.conns_path) is None:
+            open(self.conns_path, "w", encoding="utf-8").close()
+        sig = self._files_signature()
+        if sig == self._rows_sig:
+            return
+        rows = []
+        with open(self.conns_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.rstrip("\n")
+                if line:
+                    rows.append(parse_connection_line(line))
+        self._journal_entries, rows = self._replay_journal(rows, sig[0])
+        # Le journal a pu être raccourci (ligne tronquée retirée)
+        self._rows_sig = self._files_signature()
+        if _assign_ids(rows):
+            # Ancien fichier sans identifiants : migration transparente
+            self.save(rows)
+        else:
+            self._set_rows(rows)
+
+    def rows(self):
+        """
+        Liste partagée des connexions (lecture seule : ne pas modifier les lignes).
+        """
+        with self._lock:
+            self._ensure_rows()
+            return self._rows
+
+    def connections(self):
+        """
+        Copie des connexions, modifiable librement par l'appelant.
+        """
+        return [row.copy() for row in self.rows()]
+
+    def get(self, conn_id):
+        with self._lock:
+            self._ensure_rows()
+            return self._by_id.get(conn_id)
+
+    def find_by_name(self, name):
+        with self._lock:
+            self._ensure_rows()
+            return self._by_name.get(name)
+
+    def _id_of(self, row):
+        """
+        Identifiant d'une ligne ; à défaut (ligne sans identifiant), recherche par valeur.
+        """
+        row = _pad_row(row)
+        if row[7]:
+            return row[7]
+        for r in self.rows():
+            if r[:7] == row[:7]:
+                return r[7]
+        return None
+
+    def save(self, data):
+        rows = [_pad_row(row) for row in data]
+        _assign_ids(rows)
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            # L'état complet est réécrit : les entrées en attente sont obsolètes
+            self._pending = []
+            self._write_atomic(self.conns_path, [format_connection_line(row) for row in rows])
+            self._reset_journal()
+            self._journal_entries = 0
+            self._rows_sig = self._files_signature()
+            self._set_rows(rows)
+
+    # Journal des modifications
+    @staticmethod
+    def _apply_entry(rows, pos, entry):
+        """
+        Applique une entrée du journal à 'rows' (les lignes supprimées deviennent None).
+        'pos' associe identifiant -> indice dans 'rows'.
+        """
+        op = entry.get("op")
+        if op == "add":
+            row = _pad_row(entry["row"])
+            pos[row[7]] = len(rows)
+            rows.append(row)
+        elif op == "update":
+            i = pos.get(entry["id"])
+            if i is not None:
+                rows[i] = _pad_row(entry["row"])
+        elif op == "delete":
+            i = pos.pop(entry["id"], None)
+            if i is not None:
+                rows[i] = None
+
+    def _journal_header(self, base_sig):
+        return json.dumps({"base": list(base_sig) if base_sig else None}) + "\n"
+
+    def _reset_journal(self):
+        if self.journal_path:
+            self._write_atomic(self.journal_path, [self._journal_header(self._signature(self.conns_path))])
+
+    def _replay_journal(self, rows, base_sig):
+        """
+        Rejoue le journal sur 'rows' et retourne (nombre d'entrées, lignes).
+        Un journal écrit pour une autre version de connexions.txt (compactage
+        interrompu, fichier remplacé) est ignoré. Une dernière ligne tronquée (arrêt
+        brutal pendant un ajout) est retirée du fichier, pour que les prochains ajouts
+        ne lui soient pas collés.
+        """
+        if not self.journal_path or not os.path.exists(self.journal_path):
+            return 0, rows
+        count = 0
+        pos = {row[7]: i for i, row in enumerate(rows) if row[7]}
+        with open(self.journal_path, "rb") as f:
+            header = f.readline()
+            try:
+                base = json.loads(header).get("base")
+            except (ValueError, AttributeError):
+                return 0, rows
+            if base is None or base_sig is None or tuple(base) != tuple(base_sig):
+                return 0, rows
+            good_end = f.tell()
+            torn = False
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    torn = True
+                    break
+                if not line.endswith(b"\n"):
+                    torn = True
+                    break
+                self._apply_entry(rows, pos, entry)
+                count += 1
+                good_end += len(line)
+        if torn:
+            os.truncate(self.journal_path, good_end)
+        return count, [row for row in rows if row is not None]
+
+    def _record(self, entry):
+        with self._lock:
+            self._ensure_rows()
+            op = entry["op"]
+            conn_id = entry["row"][7] if op != "delete" else entry["id"]
+            if op == "add":
+                self._append_row(entry["row"])
+            elif conn_id not in self._by_id:
+                return
+            elif op == "update":
+                self._replace_row(entry["row"])
+            else:
+                self._remove_row(conn_id)
+            if not self.journal_path:
+                self.save(self._rows)
+                return
+            # Plusieurs modifications successives d'une même ligne : une seule entrée
+            last = self._pending[-1] if self._pending else None
+            if (last is not None and op == "update" and last["op"] in ("add", "update")
+                    and last["row"][7] == conn_id):
+                last["row"] = entry["row"]
+            else:
+                self._pending.append(entry)
+            if self.fsync_policy == "always":
+                self.flush()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(JOURNAL_FLUSH_DELAY, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def flush(self):
+        """
+        Écrit les entrées en attente dans le journal (un seul ajout), puis compacte si besoin.
+        """
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._pending:
+                return
+            base_sig = self._signature(self.conns_path)
+            if self._rows_sig is None or self._rows_sig[1] is None or self._rows_sig[0] != base_sig:
+                self._reset_journal()
+                self._journal_entries = 0
+            lines = [json.dumps(entry, ensure_ascii=False) + "\n" for entry in self._pending]
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.writelines(lines)
+                if self.fsync_policy != "never":
+                    f.flush()
+                    os.fsync(f.fileno())
+            self._journal_entries += len(self._pending)
+            self._pending = []
+            self._rows_sig = self._files_signature()
+            if self._journal_entries >= JOURNAL_COMPACT_ENTRIES:
+                self.compact()
+
+    def compact(self):
+        """
+        Fusionne le journal dans connexions.txt.
+        """
+        with self._lock:
+            self.save(self.rows())
+
+    def add(self, row):
+        row = _pad_row(row)
+        if not row[7] or self.get(row[7]) is not None:
+            row[7] = new_connection_id()
+        self._record({"op": "add", "row": row})
+        return row[7]
+
+    def update(self, original_row, new_row):
+        with self._lock:
+            conn_id = self._id_of(original_row)
+            if conn_id is None:
+                return
+            new_row = _pad_row(new_row)
+            new_row[7] = conn_id
+            self._record({"op": "update", "id": conn_id, "row": new_row})
+
+    def delete(self, conn_id):
+        self._record({"op": "delete", "id": conn_id})
+
+    def bulk_update(self, conn_ids, transform):
+        """
+        Applique transform(copie de la ligne) -> nouvelle ligne à plusieurs connexions,
+        en une seule passe et une seule écriture.
+        """
+        with self._lock:
+            self._ensure_rows()
+            ids = set(conn_ids)
+            rows = []
+            for row in self._rows:
+                if row[7] in ids:
+                    new_row = _pad_row(transform(row.copy()))
+                    new_row[7] = row[7]
+                    rows.append(new_row)
+                else:
+                    rows.append(row)
+            self.save(rows)
+
+    def bulk_delete(self, conn_ids):
+        with self._lock:
+            ids = set(conn_ids)
+            self.save([row for row in self.rows() if row[7] not in ids])
+
+    def _ensure_groups(self):
+        sig = self._signature(self.groups_path)
+        if sig is None:
+            open(self.groups_path, "w", encoding="utf-8").close()
+            sig = self._signature(self.groups_path)
+        if sig == self._groups_sig:
+            return
+        groups = []
+        with open(self.groups_path, "r", encoding="utf-8") as f:
+            for line in f:
+                g = line.strip()
+                if g:
+                    groups.append(g)
+        self._groups_sig = sig
+        self._groups = groups
+        self.version += 1
+
+    def groups(self):
+        with self._lock:
+            self._ensure_groups()
+            return list(self._groups)
+
+    def save_groups(self, groups):
+        with self._lock:
+            self._write_atomic(self.groups_path, [g + "\n" for g in groups])
+            self._groups_sig = self._signature(self.groups_path)
+            self._groups = list(groups)
+            self.version += 1
+
+    def add_group(self, grp):
+        with self._lock:
+            groups = self.groups()
+            if grp not in groups:
+                groups.append(grp)
+                self.save_groups(groups)
+            return groups
+
+    def delete_group(self, grp):
+        with self._lock:
+            groups = self.groups()
+            if grp in groups:
+                groups.remove(grp)
+            self.save_groups(groups)
+            data = self.connections()
+            for row in data:
+                if row[5] == grp:
+                    row[5] = ""
+            self.save(data)
+
+class SQLiteConnectionStore(ConnectionStore):
+    """
+    Variante de ConnectionStore stockée dans connexions.db (SQLite).
+    Les modifications d'une connexion sont des UPDATE/DELETE ciblés (par identifiant)
+    au lieu d'une réécriture complète. connexions.txt (journal compris) et groups.txt
+    sont importés à la première ouverture.
+    """
+    COLUMNS = ("name", "ip", "login", "last_connection", "note", "grp", "password", "uid", "profile", "reconnect")
+    UPDATE_SQL = ("UPDATE connections SET name = ?, ip = ?, login = ?, last_connection = ?, note = ?, grp = ?, "
+                  "password = ?, profile = ?, reconnect = ? WHERE uid = ?")
+
+    def __init__(self, db_path, conns_path, groups_path, text_journal_path=None):
+        super().__init__(conns_path, groups_path)
+        self.db_path = db_path
+        self.text_journal_path = text_journal_path
+        self._data_version = None
+        self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+
+    def _init_schema(self):
+        with self._lock:
+            self._db.executescript("""
+                CREATE TABLE IF NOT EXISTS connections (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL DEFAULT '',
+                    ip TEXT NOT NULL DEFAULT '',
+                    login TEXT NOT NULL DEFAULT '',
+                    last_connection TEXT NOT NULL DEFAULT '',
+                    note TEXT NOT NULL DEFAULT '',
+                    grp TEXT NOT NULL DEFAULT '',
+                    password TEXT NOT NULL DEFAULT '',
+                    uid TEXT NOT NULL DEFAULT '',
+                    profile TEXT NOT NULL DEFAULT '',
+                    reconnect TEXT NOT NULL DEFAULT ''
+                );
+                CREATE INDEX IF NOT EXISTS idx_connections_name ON connections(name);
+                CREATE INDEX IF NOT EXISTS idx_connections_ip ON connections(ip);
+                CREATE INDEX IF NOT EXISTS idx_connections_grp ON connections(grp);
+                CREATE INDEX IF NOT EXISTS idx_connections_last ON connections(last_connection);
+                CREATE TABLE IF NOT EXISTS groups (
+                    position INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL UNIQUE
+                );
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+            """)
+            columns = [rec[1] for rec in self._db.execute("PRAGMA table_info(connections)")]
+            if "uid" not in columns:
+                self._db.execute("ALTER TABLE connections ADD COLUMN uid TEXT NOT NULL DEFAULT ''")
+            if "profile" not in columns:
+                self._db.execute("ALTER TABLE connections ADD COLUMN profile TEXT NOT NULL DEFAULT ''")
+            if "reconnect" not in columns:
+                self._db.execute("ALTER TABLE connections ADD COLUMN reconnect TEXT NOT NULL DEFAULT ''")
+            missing = [rec[0] for rec in self._db.execute("SELECT id FROM connections WHERE uid = ''")]
+            if missing:
+                self._db.executemany("UPDATE connections SET uid = ? WHERE id = ?",
+                                     [(new_connection_id(), row_id) for row_id in missing])
+            self._db.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_connections_uid ON connections(uid)")
+            migrated = self._db.execute("SELECT value FROM meta WHERE key = 'migrated'").fetchone()
+            if not migrated:
+                self._migrate_from_text()
+
+    def _migrate_from_text(self):
+        """
+        Import unique de connexions.txt / groups.txt (les fichiers texte sont conservés).
+        Les connexions sont lues via ConnectionStore : les modifications encore dans
+        connexions.journal (pas encore compactées) sont rejouées avant l'import.
+        """
+        rows, groups = [], []
+        if os.path.exists(self.conns_path):
+            text_store = ConnectionStore(self.conns_path, self.groups_path, self.text_journal_path)
+            rows = text_store.connections()
+            groups = text_store.groups()
+        elif os.path.exists(self.groups_path):
+            with open(self.groups_path, "r", encoding="utf-8") as f:
+                groups = [g.strip() for g in f if g.strip()]
+        self._db.execute("BEGIN")
+        try:
+            self._insert_rows(rows)
+            self._db.executemany("INSERT OR IGNORE INTO groups(name) VALUES (?)", [(g,) for g in groups])
+            self._db.execute("INSERT OR REPLACE INTO meta(key, value) VALUES ('migrated', '1')")
+            self._db.execute("COMMIT")
+        except Exception:
+            self._db.execute("ROLLBACK")
+            raise
+
+    def _insert_rows(self, rows):
+        self._db.executemany(
+            "INSERT INTO connections(name, ip, login, last_connection, note, grp, password, uid, profile, reconnect) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [tuple(row[:ROW_FIELDS]) for row in rows])
+
+    def _current_data_version(self):
+        return self._db.execute("PRAGMA data_version").fetchone()[0]
+
+    def _ensure_rows(self):
+        # data_version ne change que si une autre connexion (autre processus) a écrit
+        data_version = self._current_data_version()
+        if data_version == self._data_version:
+            return
+        rows = [list(rec) for rec in self._db.execute(
+            "SELECT name, ip, login, last_connection, note, grp, password, uid, profile, reconnect "
+            "FROM connections ORDER BY id")]
+        self._data_version = data_version
+        self._set_rows(rows)
+
+    def save(self, data):
+        rows = [_pad_row(row) for row in data]
+        _assign_ids(rows)
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.execute("DELETE FROM connections")
+                self._insert_rows(rows)
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+            self._data_version = self._current_data_version()
+            self._set_rows(rows)
+
+    def update(self, original_row, new_row):
+        with self._lock:
+            # Cache froid ou invalidé par un autre processus : relu avant la recherche
+            self._ensure_rows()
+            conn_id = self._id_of(original_row)
+            if conn_id is None:
+                return
+            new_row = _pad_row(new_row)
+            new_row[7] = conn_id
+            cursor = self._db.execute(self.UPDATE_SQL, tuple(new_row[:7]) + tuple(new_row[8:ROW_FIELDS]) + (conn_id,))
+            if cursor.rowcount and conn_id in self._by_id:
+                self._replace_row(new_row)
+
+    def add(self, row):
+        with self._lock:
+            self._ensure_rows()
+            row = _pad_row(row)
+            if not row[7] or row[7] in self._by_id:
+                row[7] = new_connection_id()
+            self._db.execute(
+                "INSERT INTO connections(name, ip, login, last_connection, note, grp, password, uid, profile, "
+                "reconnect) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", tuple(row[:ROW_FIELDS]))
+            self._append_row(row)
+            return row[7]
+
+    def delete(self, conn_id):
+        with self._lock:
+            self._ensure_rows()
+            self._db.execute("DELETE FROM connections WHERE uid = ?", (conn_id,))
+            if conn_id in self._by_id:
+                self._remove_row(conn_id)
+
+    def bulk_update(self, conn_ids, transform):
+        with self._lock:
+            self._ensure_rows()
+            changed = []
+            for conn_id in dict.fromkeys(conn_ids):
+                row = self._by_id.get(conn_id)
+                if row is None:
+                    continue
+                new_row = _pad_row(transform(row.copy()))
+                new_row[7] = conn_id
+                changed.append(new_row)
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany(self.UPDATE_SQL, [tuple(row[:7]) + tuple(row[8:ROW_FIELDS]) + (row[7],)
+                                                       for row in changed])
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+            for new_row in changed:
+                self._replace_row(new_row)
+
+    def bulk_delete(self, conn_ids):
+        with self._lock:
+            self._ensure_rows()
+            ids = set(conn_ids)
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany("DELETE FROM connections WHERE uid = ?", [(conn_id,) for conn_id in ids])
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+            self._set_rows([row for row in self._rows if row[7] not in ids])
+
+    def _ensure_groups(self):
+        pass
+
+    def groups(self):
+        with self._lock:
+            return [rec[0] for rec in self._db.execute("SELECT name FROM groups ORDER BY position")]
+
+    def save_groups(self, groups):
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.execute("DELETE FROM groups")
+                self._db.executemany("INSERT OR IGNORE INTO groups(name) VALUES (?)", [(g,) for g in groups])
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+            self.version += 1
+
+    def add_group(self, grp):
+        with self._lock:
+            self._db.execute("INSERT OR IGNORE INTO groups(name) VALUES (?)", (grp,))
+            self.version += 1
+            return self.groups()
+
+    def delete_group(self, grp):
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.execute("DELETE FROM groups WHERE name = ?", (grp,))
+                self._db.execute("UPDATE connections SET grp = '' WHERE grp = ?", (grp,))
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+            # Nouvelles listes (pas de modification en place) pour les caches dérivés
+            rows = [row if row[5] != grp else row[:5] + [""] + row[6:] for row in self._rows]
+            self._set_rows(rows)
+
+if STORAGE_BACKEND == "sqlite":
+    connection_store = SQLiteConnectionStore(DB_FILE, FILE_CONNS, GROUPS_FILE, JOURNAL_FILE)
+else:
+    connection_store = ConnectionStore(FILE_CONNS, GROUPS_FILE, JOURNAL_FILE, JOURNAL_FSYNC)
+atexit.register(connection_store.flush)
+
 def load_connections():
     """
-    Lit connexions.txt.
-    Chaque ligne contient : Nom|IP|Login(s)|Dernière connexion|Note (avec <NL> pour sauts de ligne)|Groupe|MotDePasseChiffré
-    Retourne une liste de listes à 7 éléments.
-    """
-    conns = []
-    if not os.path.exists(FILE_CONNS):
-        open(FILE_CONNS, "w", encoding="utf-8").close()
-    with open(FILE_CONNS, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.rstrip("\n")
-            if not line:
-                continue
-            parts = line.split("|")
-            # Restaurer la note multi-lignes
-            if len(parts) >= 5:
-                parts[4] = parts[4].replace("<NL>", "\n")
-            while len(parts) < 7:
-                parts.append("")
-            conns.append(parts)
-    return conns
+    Connexions de connexions.txt (servies par connection_store).
+    Chaque ligne contient : Nom|IP|Login(s)|Dernière connexion|Note (avec <NL> pour sauts de ligne)|Groupe|MotDePasseChiffré|Identifiant
+    Retourne une liste de listes à ROW_FIELDS éléments.
+    """
+    return connection_store.connections()
 
 def save_connections(data):
     """
-    Écrit la liste data (listes à 7 champs) dans connexions.txt.
+    Écrit la liste data (listes à ROW_FIELDS champs) dans connexions.txt.
     On remplace \n par <NL> dans la note avant d'écrire.
     """
-    with open(FILE_CONNS, "w", encoding="utf-8") as f:
-        for row in data:
-            row[4] = row[4].replace("\n", "<NL>")
-            while len(row) < 7:
-                row.append("")
-            f.write("|".join(row) + "\n")
+    connection_store.save(data)
+
+def get_connection(conn_id):
+    row = connection_store.get(conn_id)
+    return row.copy() if row is not None else None
 
 def update_connection_by_value(original_row, new_row):
-    data = load_connections()
-    for i, r in enumerate(data):
-        if r == original_row:
-            data[i] = new_row
-            break
-    save_connections(data)
+    # La ligne est retrouvée par son identifiant (row[7])
+    connection_store.update(original_row, new_row)
+
+def stamp_last_connection(conn_id):
+    """
+    Met à jour la date de dernière connexion à partir de la ligne actuelle du store :
+    les modifications faites pendant l'établissement de la session sont conservées.
+    """
+    current = connection_store.get(conn_id) if conn_id else None
+    if current is None:
+        return
+    new_row = current.copy()
+    new_row[3] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    connection_store.update(current, new_row)
 
-def delete_connection(key):
-    data = load_connections()
-    new_data = [row for row in data if (row[0], row[5]) != key]
-    save_connections(new_data)
+def delete_connection(conn_id):
+    connection_store.delete(conn_id)
 
 def load_groups():
-    groups = []
-    if not os.path.exists(GROUPS_FILE):
-        open(GROUPS_FILE, "w", encoding="utf-8").close()
-    with open(GROUPS_FILE, "r", encoding="utf-8") as f:
-        for line in f:
-            g = line.strip()
-            if g:
-                groups.append(g)
-    return groups
+    return connection_store.groups()
 
 def save_groups(groups):
-    with open(GROUPS_FILE, "w", encoding="utf-8") as f:
-        for g in groups:
-            f.write(g + "\n")
+    connection_store.save_groups(groups)
 
 def get_existing_groups():
     return load_groups()
 
 def delete_group_from_storage(grp):
-    groups = get_existing_groups()
-    if grp in groups:
-        groups.remove(grp)
-    save_groups(groups)
-    data = load_connections()
-    for i, row in enumerate(data):
-        if row[5] == grp:
-            data[i][5] = ""
-    save_connections(data)
+    connection_store.delete_group(grp)
 
 def backup_configuration(dest_path, export=False):
     zip_name = "SwiftRDPexport.zip" if export else "SwiftRDPsave.zip"
     full_path = os.path.join(dest_path, zip_name)
+    # Les données sont exportées depuis le stockage actif (texte ou SQLite) au format connexions.txt
     with zipfile.ZipFile(full_path, 'w') as zipf:
-        for file in (FILE_CONNS, GROUPS_FILE):
-            if os.path.exists(file):
-                zipf.write(file, os.path.basename(file))
+        zipf.writestr(os.path.basename(FILE_CONNS),
+                      "".join(format_connection_line(row) for row in connection_store.rows()))
+        zipf.writestr(os.path.basename(GROUPS_FILE),
+                      "".join(g + "\n" for g in connection_store.groups()))
     return full_path
 
-def import_configuration_func(zip_path):
-    with tempfile.TemporaryDirectory() as tmpdirname:
-        with zipfile.ZipFile(zip_path, 'r') as zipf:
-            zipf.extractall(tmpdirname)
-        src_conn = os.path.join(tmpdirname, os.path.basename(FILE_CONNS))
-        src_groups = os.path.join(tmpdirname, os.path.basename(GROUPS_FILE))
-        if os.path.exists(src_conn):
-            shutil.copy(src_conn, FILE_CONNS)
-        if os.path.exists(src_groups):
-            shutil.copy(src_groups, GROUPS_FILE)
+# Taille maximale (décompressée) acceptée pour un fichier d'une archive importée
+IMPORT_MAX_MEMBER_SIZE = 64 * 1024 * 1024
+
+def connection_fingerprint(row):
+    """
+    Empreinte du contenu d'une connexion (nom + IP + login) pour dédoublonner les imports.
+    """
+    return hashlib.sha256("\x1f".join((row[0], row[1], row[2])).encode("utf-8")).hexdigest()
+
+def _iter_archive_lines(zipf, info):
+    """
+    Lit un fichier de l'archive ligne par ligne, sans l'extraire sur le disque.
+    """
+    if info.file_size > IMPORT_MAX_MEMBER_SIZE:
+        raise ValueError(f"{info.filename} : fichier trop volumineux")
+    read = 0
+    with zipf.open(info) as raw:
+        for line in io.TextIOWrapper(raw, encoding="utf-8"):
+            read += len(line)
+            # La taille annoncée peut être fausse : on contrôle aussi ce qui est lu
+            if read > IMPORT_MAX_MEMBER_SIZE:
+                raise ValueError(f"{info.filename} : fichier trop volumineux")
+            line = line.rstrip("\r\n")
+            if line.strip():
+                yield line
+
+def import_configuration_func(zip_path, mode="replace", dry_run=False):
+    """
+    Importe une archive de configuration.
+    mode : "merge" (ajout des connexions absentes), "replace" (remplacement complet)
+    ou "dry-run" (simulation d'une fusion, rien n'est écrit) ; dry_run=True simule
+    n'importe quel mode.
+    Les connexions sont dédoublonnées par connection_fingerprint ; une connexion importée
+    portant le nom d'une connexion existante différente est un conflit (l'existante est gardée).
+    Retourne un rapport : {"added", "duplicates", "conflicts", "groups_added", "existing",
+    "removed"} ("removed" : connexions existantes supprimées par un remplacement).
+    """
+    conn_name = os.path.basename(FILE_CONNS)
+    groups_name = os.path.basename(GROUPS_FILE)
+    if mode == "dry-run":
+        mode, dry_run = "merge", True
+    merge = mode != "replace"
+    current = connection_store.rows()
+    existing = current if merge else []
+    seen = {connection_fingerprint(row) for row in existing}
+    names = {row[0] for row in existing}
+    ids = {row[7] for row in existing}
+    added = []
+    duplicates = 0
+    conflicts = []
+    imported_groups = None
+    with zipfile.ZipFile(zip_path, 'r') as zipf:
+        members = {}
+        for info in zipf.infolist():
+            # Seuls connexions.txt et groups.txt, à la racine, sont acceptés
+            if info.is_dir() or info.filename not in (conn_name, groups_name):
+                continue
+            members[info.filename] = info
+        if conn_name in members:
+            for line in _iter_archive_lines(zipf, members[conn_name]):
+                row = parse_connection_line(line)[:ROW_FIELDS]
+                fingerprint = connection_fingerprint(row)
+                if fingerprint in seen:
+                    duplicates += 1
+                    continue
+                if row[0] in names:
+                    conflicts.append(row[0])
+                    continue
+                if row[7] in ids:
+                    row[7] = ""
+                seen.add(fingerprint)
+                names.add(row[0])
+                ids.add(row[7])
+                added.append(row)
+        if groups_name in members:
+            imported_groups = list(_iter_archive_lines(zipf, members[groups_name]))
+    if conn_name not in members and imported_groups is None:
+        raise ValueError(f"{conn_name} / {groups_name} absents de l'archive")
+
+    current_groups = connection_store.groups() if merge else []
+    new_groups = list(current_groups)
+    known = set(new_groups)
+    for grp in (imported_groups or []) + [row[5] for row in added if row[5]]:
+        grp = grp.strip()
+        if grp and grp not in known:
+            known.add(grp)
+            new_groups.append(grp)
+    report = {"added": len(added), "duplicates": duplicates, "conflicts": conflicts,
+              "groups_added": len(new_groups) - len(current_groups), "existing": len(current),
+              "removed": 0 if merge or conn_name not in members else len(current)}
+    if dry_run:
+        return report
+    if merge:
+        if added:
+            connection_store.save(list(existing) + added)
+    elif conn_name in members:
+        connection_store.save(added)
+    if new_groups != current_groups or not merge:
+        connection_store.save_groups(new_groups)
+    return report
 
 def delete_configuration():
     conn_deleted = False
     group_deleted = False
     if messagebox.askyesno(t("confirm"), t("delete_all_connections"), parent=app):
-        open(FILE_CONNS, "w", encoding="utf-8").close()
+        save_connections([])
         conn_deleted = True
     if messagebox.askyesno(t("confirm"), t("delete_all_groups"), parent=app):
-        open(GROUPS_FILE, "w", encoding="utf-8").close()
+        save_groups([])
         data = load_connections()
         for i, row in enumerate(data):
             row[5] = ""
@@ -530,52 +1746,1263 @@ def delete_configuration():
         app.attributes("-topmost", False)
     app.refresh_table()
 
-def refresh_table_global(app):
-    # Vider l'arbre
-    for iid in app.tree.get_children():
-        app.tree.delete(iid)
+######################################
+# Recherche indexée
+######################################
+# Délai (ms) entre la dernière frappe et le lancement de la recherche
+SEARCH_DEBOUNCE_MS = 120
+
+# Champs indexés (le mot de passe chiffré et la date ne le sont pas) et préfixes de recherche
+SEARCH_FIELDS = {"name": 0, "nom": 0, "ip": 1, "login": 2, "group": 5, "groupe": 5, "note": 4}
+SEARCH_FIELD_ORDER = (0, 1, 2, 5, 4)
+
+class SearchCancelled(Exception):
+    pass
+
+class SearchIndex:
+    """
+    Index trigrammes (en minuscules) sur nom, IP, login, groupe et note.
+    Chaque contenu distinct n'est indexé qu'une fois : après une modification,
+    seules les lignes nouvelles ou changées (par identifiant de connexion) sont réindexées.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hids = {}         # texte indexé -> identifiant
+        self._hays = []         # identifiant -> texte indexé (None si libéré)
+        self._postings = {}     # trigramme -> set(identifiants)
+        self._version = None
+        self._rows = []
+        self._row_objs = {}     # identifiant de connexion -> ligne indexée
+        self._row_hids = {}     # identifiant de connexion -> identifiant indexé
+        self._rows_by_hid = {}
+
+    @staticmethod
+    def haystack(row):
+        return "\x1f".join((row[i] or "").lower() for i in SEARCH_FIELD_ORDER)
+
+    @staticmethod
+    def _trigrams(text):
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def _add(self, hay):
+        hid = len(self._hays)
+        self._hays.append(hay)
+        self._hids[hay] = hid
+        for gram in self._trigrams(hay):
+            self._postings.setdefault(gram, set()).add(hid)
+        return hid
+
+    def _reset(self):
+        self._hids = {}
+        self._hays = []
+        self._postings = {}
+
+    def _sync(self, rows, version):
+        if version == self._version and len(rows) == len(self._rows):
+            return
+        # Trop de contenus obsolètes : on repart de zéro
+        if len(self._hids) > 2 * len(rows) + 1024:
+            self._reset()
+            self._row_objs = {}
+            self._row_hids = {}
+        old_objs = self._row_objs
+        old_hids = self._row_hids
+        row_objs = {}
+        row_hids = {}
+        rows_by_hid = {}
+        for i, row in enumerate(rows):
+            # Ligne inchangée (même objet pour cet identifiant), même si elle a changé de place
+            key = row[7] or id(row)
+            if old_objs.get(key) is row:
+                hid = old_hids[key]
+            else:
+                hay = self.haystack(row)
+                hid = self._hids.get(hay)
+                if hid is None:
+                    hid = self._add(hay)
+            row_objs[key] = row
+            row_hids[key] = hid
+            if hid in rows_by_hid:
+                rows_by_hid[hid].append(i)
+            else:
+                rows_by_hid[hid] = [i]
+        self._rows = list(rows)
+        self._row_objs = row_objs
+        self._row_hids = row_hids
+        self._rows_by_hid = rows_by_hid
+        self._version = version
+
+    @staticmethod
+    def parse_query(query):
+        """
+        'prod ip:10.0' -> [(None, 'prod'), (1, '10.0')] ; tous les termes doivent correspondre.
+        """
+        terms = []
+        for token in query.lower().split():
+            field = None
+            if ":" in token:
+                prefix, rest = token.split(":", 1)
+                if prefix in SEARCH_FIELDS and rest:
+                    field, token = SEARCH_FIELDS[prefix], rest
+            terms.append((field, token))
+        return terms
+
+    def search(self, query, rows, version, cancelled=None):
+        """
+        Retourne les lignes de 'rows' correspondant à la requête, dans leur ordre d'origine.
+        """
+        terms = self.parse_query(query)
+        with self._lock:
+            self._sync(rows, version)
+            if not terms:
+                return list(rows)
+            candidates = None
+            for _field, term in terms:
+                if len(term) < 3:
+                    continue
+                for gram in self._trigrams(term):
+                    posting = self._postings.get(gram, set())
+                    candidates = set(posting) if candidates is None else candidates & posting
+                    if not candidates:
+                        return []
+            if candidates is None:
+                candidates = self._rows_by_hid.keys()
+            matched = []
+            for n, hid in enumerate(candidates):
+                if cancelled is not None and n % 2048 == 0 and cancelled():
+                    raise SearchCancelled()
+                if hid not in self._rows_by_hid:
+                    continue
+                hay = self._hays[hid]
+                fields = None
+                for field, term in terms:
+                    if field is None:
+                        if term not in hay:
+                            break
+                    else:
+                        if fields is None:
+                            fields = hay.split("\x1f")
+                        if term not in fields[SEARCH_FIELD_ORDER.index(field)]:
+                            break
+                else:
+                    matched.extend(self._rows_by_hid[hid])
+            matched.sort()
+            return [rows[i] for i in matched]
+
+class SearchEngine:
+    """
+    Exécute les recherches hors du thread Tk ; seule la plus récente est conservée,
+    les précédentes sont annulées.
+    """
+    def __init__(self):
+        self.index = SearchIndex()
+        self._generation = 0
+        self._result = None     # (requête, version, lignes)
+        self._pending = None    # (requête, version) de la recherche en cours
+
+    def results(self, query, version, on_done):
+        """
+        Dernier résultat calculé, sans attendre (None si aucune recherche n'a abouti).
+        S'il ne correspond pas à (requête, version), une recherche est lancée en
+        arrière-plan et on_done() sera appelé avec le résultat à jour.
+        """
+        cached = self._result
+        if cached and cached[0] == query and cached[1] == version:
+            return cached[2]
+        if self._pending != (query, version):
+            self.submit(query, on_done)
+        return cached[2] if cached else None
+
+    def submit(self, query, on_done):
+        """
+        Lance la recherche en arrière-plan ; on_done() est appelé (depuis le thread de
+        recherche) uniquement si aucune requête plus récente n'a été soumise entre-temps.
+        """
+        self._generation += 1
+        generation = self._generation
+        self._pending = (query, connection_store.version)
+        def cancelled():
+            return generation != self._generation
+        def worker():
+            rows = connection_store.rows()
+            version = connection_store.version
+            try:
+                found = self.index.search(query, rows, version, cancelled=cancelled)
+            except SearchCancelled:
+                return
+            if not cancelled():
+                self._result = (query, version, found)
+                self._pending = None
+                on_done()
+        threading.Thread(target=worker, daemon=True).start()
+
+######################################
+# Rafraîchissement incrémental du tableau
+######################################
+def _stable_subset(current, wanted):
+    """
+    Plus longue sous-suite de 'current' déjà dans l'ordre de 'wanted' :
+    ces éléments restent en place, seuls les autres sont déplacés.
+    """
+    rank = {iid: i for i, iid in enumerate(wanted)}
+    seq = [iid for iid in current if iid in rank]
+    tails = []      # tails[k] = indice (dans seq) de la fin de la meilleure suite de longueur k+1
+    prev = [None] * len(seq)
+    tail_ranks = []
+    for i, iid in enumerate(seq):
+        r = rank[iid]
+        lo, hi = 0, len(tail_ranks)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if tail_ranks[mid] < r:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo > 0:
+            prev[i] = tails[lo - 1]
+        if lo == len(tails):
+            tails.append(i)
+            tail_ranks.append(r)
+        else:
+            tails[lo] = i
+            tail_ranks[lo] = r
+    keep = set()
+    i = tails[-1] if tails else None
+    while i is not None:
+        keep.add(seq[i])
+        i = prev[i]
+    return keep
+
+class TreeReconciler:
+    """
+    Synchronise un ttk.Treeview avec le modèle (groupes -> connexions) en n'appliquant
+    que les insertions, suppressions, déplacements et mises à jour nécessaires.
+    Les iid sont stables : sélection, défilement et groupes repliés sont conservés.
+    """
+    def __init__(self, tree):
+        self.tree = tree
+        self.items = {}             # iid -> (parent, text, values, tags)
+        self.children = {"": []}    # parent -> [iid, ...] dans l'ordre affiché
+        self.opened = set()         # groupes dépliés
+
+    def is_open(self, iid):
+        return iid in self.opened
+
+    def set_open(self, iid, is_open):
+        if is_open:
+            self.opened.add(iid)
+        else:
+            self.opened.discard(iid)
+
+    def resync_order(self):
+        """
+        Relit l'ordre réel des enfants (après un tri manuel du Treeview).
+        """
+        for parent in list(self.children):
+            if parent == "" or self.tree.exists(parent):
+                self.children[parent] = list(self.tree.get_children(parent))
+
+    def apply(self, model):
+        """
+        model : liste ordonnée de (iid, texte, valeurs, tags, enfants, déplié) pour les groupes,
+        enfants étant une liste ordonnée de (iid, texte, valeurs, tags) ; 'déplié' n'est
+        utilisé qu'à la création du groupe.
+        """
+        tree = self.tree
+        desired = {}
+        order = {"": []}
+        open_default = {}
+        for g_iid, g_text, g_values, g_tags, kids, g_open in model:
+            open_default[g_iid] = g_open
+            desired[g_iid] = ("", g_text, tuple(g_values), tuple(g_tags))
+            order[""].append(g_iid)
+            order[g_iid] = []
+            for iid, text, values, tags in kids:
+                desired[iid] = (g_iid, text, tuple(values), tuple(tags))
+                order[g_iid].append(iid)
+
+        # 1) Détacher les éléments qui changent de place ou de parent
+        kept = {}
+        for parent, current in self.children.items():
+            wanted = order.get(parent)
+            if wanted is None:
+                keep = set()
+            else:
+                same_parent = [iid for iid in current if iid in desired and desired[iid][0] == parent]
+                keep = _stable_subset(same_parent, wanted)
+            kept[parent] = keep
+            for iid in current:
+                if iid in desired and iid not in keep:
+                    tree.detach(iid)
+
+        # 2) Supprimer les éléments disparus (les enfants d'un groupe supprimé partent avec lui)
+        for iid, (parent, _text, _values, _tags) in self.items.items():
+            if iid not in desired and (parent == "" or parent in desired):
+                tree.delete(iid)
+
+        # 3) Insérer, rattacher et mettre à jour, parents d'abord
+        for parent, wanted in order.items():
+            keep = kept.get(parent, ())
+            for index, iid in enumerate(wanted):
+                _parent, text, values, tags = desired[iid]
+                old = self.items.get(iid)
+                if old is None:
+                    if parent == "":
+                        tree.insert(parent, index, iid=iid, text=text, values=values, tags=tags,
+                                    open=open_default[iid])
+                        self.set_open(iid, open_default[iid])
+                    else:
+                        tree.insert(parent, index, iid=iid, text=text, values=values, tags=tags)
+                    continue
+                if iid not in keep:
+                    tree.move(iid, parent, index)
+                if old[1:] != (text, values, tags):
+                    tree.item(iid, text=text, values=values, tags=tags)
+
+        self.items = desired
+        self.children = order
+        self.opened &= set(order[""])
+
+def group_iid(grp):
+    return "grp:" + grp
+
+def connection_iid(row):
+    # L'identifiant de la connexion sert d'iid dans le Treeview
+    return row[7]
+
+# Taille des lots de connexions insérés à la fois en mode paresseux
+LAZY_CHUNK = 200
+
+def lazy_more_iid(grp):
+    return "more:" + grp
+
+def visible_rows(app):
+    """
+    Connexions correspondant au filtre de recherche courant. Si le résultat n'est pas à
+    jour (connexions modifiées, requête changée), le précédent est affiché en attendant
+    celui de la recherche en arrière-plan : le thread Tk ne recherche jamais lui-même.
+    """
+    data = connection_store.rows()
+    filtre = app.search_var.get().strip()
+    if filtre:
+        found = app.search.results(filtre, connection_store.version,
+                                   lambda: app.after(0, app.refresh_table))
+        # Première recherche pas encore aboutie : on garde la liste complète affichée
+        if found is not None:
+            data = found
+    return data
+
+def connection_status_text(app, row):
+    """Colonne Statut : reconnexion automatique en cours ou abandonnée, sinon disponibilité."""
+    entry = app.reconnector.status(row[7])
+    if entry is None:
+        return probe_status_text(row[1])
+    if entry["gave_up"]:
+        return f"✘ {t('reconnect_failed', count=entry['attempt'])}"
+    return f"↻ {t('reconnecting', attempt=entry['attempt'], total=app.reconnector.max_attempts)}"
+
+def refresh_table_global(app):
+    data = visible_rows(app)
+
+    # Grand inventaire : groupes repliés, remplis par lots à l'ouverture et au défilement
+    lazy = len(data) > LAZY_THRESHOLD
+    app.lazy_mode = lazy
+
+    # Regrouper par nom de groupe
+    groupes = {}
+    for row in data:
+        grp = row[5] if row[5] else "Sans groupe"
+        groupes.setdefault(grp, []).append(row)
+
+    model = []
+    for grp in sorted(groupes.keys(), key=lambda g: g.lower()):
+        g_iid = group_iid(grp)
+        rows = sorted(groupes[grp], key=lambda r: r[0].lower())
+        if lazy:
+            loaded = app.lazy_loaded.get(g_iid, 0)
+            if not loaded and app.table.is_open(g_iid):
+                loaded = app.lazy_loaded[g_iid] = LAZY_CHUNK
+            shown = rows[:loaded]
+        else:
+            shown = rows
+        kids = []
+        for row in shown:
+            note_affichage, urls = note_metadata(row)
+
+            # Si la note contient au moins une URL, on met le tag "has_url"
+            tags = ("has_url",) if urls else ()
+
+            kids.append((connection_iid(row), row[0],
+                         (row[1], row[2], row[3], note_affichage, connection_status_text(app, row)), tags))
+        remaining = len(rows) - len(shown)
+        if remaining:
+            # Enfant factice : rend le groupe dépliable, puis sert de "charger la suite"
+            text = t("load_more", count=min(remaining, LAZY_CHUNK), total=remaining) if shown else "..."
+            kids.append((lazy_more_iid(grp), text, (), ("lazy_more",)))
+        model.append((g_iid, grp, (), (), kids, not lazy))
+    app.table.apply(model)
+
+def treeview_sort_column(tv, col, reverse):
+    data = [(tv.set(k, col), k) for k in tv.get_children('')]
+    data.sort(key=lambda t: t[0].lower(), reverse=reverse)
+    for index, (val, k) in enumerate(data):
+        tv.move(k, '', index)
+    tv.heading(col, command=partial(treeview_sort_column, tv, col, not reverse))
+
+def window_exists(root, title):
+    for win in root.winfo_children():
+        if isinstance(win, tk.Toplevel) and win.title() == title:
+            win.lift()
+            return True
+    return False
+
+######################################
+# Profils de performance xfreerdp
+######################################
+# Options xfreerdp ajoutées selon le profil de la connexion ("" = options par défaut seules)
+PERFORMANCE_PROFILES = {
+    "": [],
+    "lan": ["/network:lan", "/bpp:32", "/gfx", "+clipboard"],
+    "wan": ["/network:wan", "/bpp:16", "/gfx", "/compression", "-wallpaper", "-themes", "+clipboard"],
+    "low_bandwidth": ["/network:modem", "/bpp:16", "/compression", "-wallpaper", "-themes", "-aero",
+                      "-menu-anims", "-window-drag", "-fonts", "/audio-mode:2", "+clipboard"],
+    # Choisi à chaque connexion parmi lan, wan et low_bandwidth selon le RTT mesuré
+    "auto": [],
+}
+AUTO_PROFILE = "auto"
+BUILTIN_PROFILES = tuple(PERFORMANCE_PROFILES)
+
+def load_custom_profiles(path):
+    """
+    Profils personnalisés, une ligne par profil : nom = options xfreerdp
+    (ex. : bureau = /network:broadband /rfx /drive:partage,/srv/partage +clipboard).
+    """
+    profiles = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#") or "=" not in line:
+                    continue
+                name, _, options = line.partition("=")
+                try:
+                    profiles[name.strip()] = shlex.split(options)
+                except ValueError:
+                    continue
+    return profiles
+
+PERFORMANCE_PROFILES.update(load_custom_profiles(PROFILES_FILE))
+
+def profile_options(name):
+    """Options xfreerdp d'un profil (profil inconnu = options par défaut)."""
+    return list(PERFORMANCE_PROFILES.get(name or "", []))
+
+def profile_label(name):
+    return t(f"profile_{name or 'default'}") if name in BUILTIN_PROFILES else name
+
+def profile_from_label(label):
+    for name in PERFORMANCE_PROFILES:
+        if profile_label(name) == label:
+            return name
+    return ""
+
+######################################
+# Sessions xfreerdp
+######################################
+# Nombre de lignes de sortie conservées par session
+SESSION_LOG_LINES = 500
+# Délai (s) accordé à xfreerdp pour établir une connexion
+CONNECT_TIMEOUT = 15
+
+# Événements reconnus dans la sortie de xfreerdp (le premier motif qui correspond l'emporte)
+XFREERDP_EVENTS = (
+    ("auth_failed", re.compile(r"ERRCONNECT_LOGON_FAILURE|ERRCONNECT_AUTHENTICATION_FAILED|"
+                               r"ERRCONNECT_PASSWORD_\w+|ERRCONNECT_ACCOUNT_\w+|STATUS_LOGON_FAILURE")),
+    ("dns_failed", re.compile(r"ERRCONNECT_DNS_NAME_NOT_FOUND|ERRCONNECT_DNS_ERROR|"
+                              r"Name or service not known|unable to resolve", re.IGNORECASE)),
+    ("tls_failed", re.compile(r"ERRCONNECT_TLS_CONNECT_FAILED|ERRCONNECT_SECURITY_NEGO_CONNECT_FAILED")),
+    ("connect_failed", re.compile(r"ERRCONNECT_CONNECT_FAILED|ERRCONNECT_CONNECT_TRANSPORT_FAILED|"
+                                  r"ERRCONNECT_CONNECT_CANCELLED|Connection refused|No route to host",
+                                  re.IGNORECASE)),
+    ("connected", re.compile(r"framebuffer format", re.IGNORECASE)),
+)
+
+def classify_xfreerdp_line(line):
+    """Retourne l'événement correspondant à une ligne de sortie de xfreerdp, ou None."""
+    for event, pattern in XFREERDP_EVENTS:
+        if pattern.search(line):
+            return event
+    return None
+
+class RDPSession:
+    """
+    Un processus xfreerdp en cours. Sa sortie (stdout et stderr) est lue en continu
+    par deux threads, conservée dans un tampon circulaire et analysée : le résultat
+    de la connexion (succès ou cause de l'échec) est connu dès que xfreerdp le journalise.
+    Les fonctions enregistrées via on_result / on_exit sont appelées depuis ces threads.
+    """
+    def __init__(self, row, login, proc):
+        self.row = row
+        self.conn_id = row[7]
+        self.login = login
+        self.proc = proc
+        self.log = collections.deque(maxlen=SESSION_LOG_LINES)
+        self.state = "connecting"  # connecting, connected, failed
+        self.reason = None
+        self.detail = ""
+        self.started_at = time.time()
+        self.connected_at = None
+        self.ended_at = None
+        self.returncode = None
+        self.window_id = None
+        self.window_closed_at = None
+        # Profil effectivement utilisé et RTT (ms) qui l'a déterminé (profil automatique)
+        self.profile = row[8]
+        self.rtt = None
+        # Adresse effectivement utilisée (connexions à plusieurs adresses)
+        self.address = row[1]
+        # Session fermée depuis SwiftRDP (pas de reconnexion automatique)
+        self.user_closed = False
+        # Mémoire résidente (octets) et CPU (% d'un cœur), relevés par SessionSupervisor.sample
+        self.rss = None
+        self.cpu = None
+        self._lock = threading.Lock()
+        self._result_callbacks = []
+        self._exit_callbacks = []
+        self._readers = [threading.Thread(target=self._read, args=(stream,), daemon=True)
+                         for stream in (proc.stdout, proc.stderr) if stream is not None]
+        for reader in self._readers:
+            reader.start()
+        threading.Thread(target=self._wait, daemon=True).start()
+
+    def on_result(self, callback):
+        """callback(ok, reason, detail), appelé une seule fois (immédiatement si déjà connu)."""
+        with self._lock:
+            if self.state == "connecting":
+                self._result_callbacks.append(callback)
+                return
+        callback(self.state == "connected", self.reason, self.detail)
+
+    def on_exit(self, callback):
+        """callback(session), appelé à la fin du processus xfreerdp."""
+        with self._lock:
+            if self.ended_at is None:
+                self._exit_callbacks.append(callback)
+                return
+        callback(self)
+
+    def mark_connected(self, detail=""):
+        self._decide("connected", None, detail)
+
+    def mark_failed(self, reason, detail=""):
+        self._decide("failed", reason, detail)
+
+    @property
+    def running(self):
+        return self.ended_at is None
+
+    def log_text(self):
+        return "\n".join(self.log)
+
+    def _decide(self, state, reason, detail):
+        with self._lock:
+            if self.state != "connecting":
+                return
+            self.state = state
+            self.reason = reason
+            self.detail = detail
+            if state == "connected":
+                self.connected_at = time.time()
+            callbacks, self._result_callbacks = self._result_callbacks, []
+        for callback in callbacks:
+            callback(state == "connected", reason, detail)
+
+    def _read(self, stream):
+        try:
+            for line in stream:
+                line = line.rstrip("\n")
+                self.log.append(line)
+                event = classify_xfreerdp_line(line)
+                if event == "connected":
+                    self.mark_connected(line)
+                elif event:
+                    self.mark_failed(event, line)
+        except (OSError, ValueError):
+            pass
+        finally:
+            stream.close()
+
+    def _wait(self):
+        self.returncode = self.proc.wait()
+        for reader in self._readers:
+            reader.join()
+        # xfreerdp s'est arrêté avant d'avoir signalé la connexion
+        self.mark_failed("session_exited", f"exit code {self.returncode}")
+        with self._lock:
+            self.ended_at = time.time()
+            callbacks, self._exit_callbacks = self._exit_callbacks, []
+        for callback in callbacks:
+            callback(self)
+
+# Intervalle (s) du relevé wmctrl partagé, utilisé si xprop n'est pas disponible
+WINDOW_POLL_INTERVAL = 0.5
+
+# Identifiants de fenêtres X dans la sortie de xprop / wmctrl
+WINDOW_ID_PATTERN = re.compile(r"0x[0-9a-fA-F]+")
+
+def list_windows():
+    """Fenêtres de premier niveau {identifiant: titre}, via un seul appel à wmctrl."""
+    try:
+        output = subprocess.check_output(["wmctrl", "-l"], text=True, errors="replace",
+                                         stderr=subprocess.DEVNULL)
+    except Exception:
+        return {}
+    windows = {}
+    for line in output.splitlines():
+        parts = line.split(None, 3)
+        if parts and WINDOW_ID_PATTERN.fullmatch(parts[0]):
+            windows[int(parts[0], 16)] = parts[3] if len(parts) > 3 else ""
+    return windows
+
+class WindowWatcher:
+    """
+    Surveillance unique des fenêtres X, partagée par toutes les sessions.
+    Un seul processus "xprop -spy -root _NET_CLIENT_LIST" signale chaque changement
+    de la liste des fenêtres ; à défaut, un seul thread relève wmctrl périodiquement.
+    Chaque abonné reçoit la première nouvelle fenêtre dont le titre lui correspond
+    (on_appeared(window_id, title)), puis sa fermeture (on_closed(window_id)).
+    Les fonctions sont appelées depuis le thread de surveillance.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._subscribers = []
+        self._windows = None
+        self._thread = None
+
+    def watch(self, match, on_appeared, on_closed=None):
+        """Abonne match(title) -> bool ; seules les fenêtres apparues ensuite sont prises en compte."""
+        subscriber = {"match": match, "appeared": on_appeared, "closed": on_closed, "window": None}
+        with self._lock:
+            self._subscribers.append(subscriber)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._wakeup.notify_all()
+        return subscriber
+
+    def unwatch(self, subscriber):
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def _run(self):
+        # Liste initiale : les fenêtres déjà ouvertes n'appartiennent à aucun abonné
+        self._windows = list_windows()
+        try:
+            spy = subprocess.Popen(["xprop", "-spy", "-root", "_NET_CLIENT_LIST"],
+                                   stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                   text=True, errors="replace")
+        except OSError:
+            spy = None
+        if spy is not None:
+            for line in spy.stdout:
+                ids = {int(w, 16) for w in WINDOW_ID_PATTERN.findall(line)}
+                if ids != set(self._windows):
+                    self._update(ids)
+            spy.wait()
+        # xprop absent ou arrêté : relevé partagé, uniquement tant qu'il y a des abonnés
+        while True:
+            with self._lock:
+                while not self._subscribers:
+                    self._wakeup.wait()
+            windows = list_windows()
+            if set(windows) != set(self._windows):
+                self._dispatch(windows)
+            time.sleep(WINDOW_POLL_INTERVAL)
+
+    def _update(self, ids):
+        if ids - set(self._windows):
+            # Nouvelles fenêtres : un seul appel pour connaître les titres
+            windows = list_windows()
+            self._dispatch({w: windows.get(w, "") for w in ids})
+        else:
+            self._dispatch({w: self._windows[w] for w in ids})
+
+    def _dispatch(self, windows):
+        appeared = [w for w in windows if w not in self._windows]
+        closed = [w for w in self._windows if w not in windows]
+        self._windows = windows
+        calls = []
+        with self._lock:
+            for window_id in closed:
+                for subscriber in self._subscribers:
+                    if subscriber["window"] == window_id:
+                        # Un abonné ne suit qu'une seule fenêtre
+                        subscriber["window"] = False
+                        if subscriber["closed"]:
+                            calls.append(partial(subscriber["closed"], window_id))
+            for window_id in appeared:
+                title = windows[window_id]
+                for subscriber in self._subscribers:
+                    if subscriber["window"] is None and subscriber["match"](title):
+                        subscriber["window"] = window_id
+                        calls.append(partial(subscriber["appeared"], window_id, title))
+                        break
+        for call in calls:
+            call()
+
+window_watcher = WindowWatcher()
+
+# Nombre de sessions terminées conservées (pour consulter leur journal)
+SESSION_HISTORY = 50
+# Intervalle (ms) de rafraîchissement du panneau des sessions
+SESSION_SAMPLE_MS = 1000
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+def read_process_usage(pid, proc_root="/proc"):
+    """(mémoire résidente en octets, temps CPU cumulé en ticks) d'un processus, via /proc."""
+    try:
+        with open(os.path.join(proc_root, str(pid), "statm"), "r") as f:
+            rss = int(f.read().split()[1]) * PAGE_SIZE
+        with open(os.path.join(proc_root, str(pid), "stat"), "r") as f:
+            # Les champs suivent le nom du programme, entre parenthèses
+            fields = f.read().rpartition(")")[2].split()
+        return rss, int(fields[11]) + int(fields[12])
+    except (OSError, IndexError, ValueError):
+        return None
+
+class SessionSupervisor:
+    """
+    Registre de toutes les sessions xfreerdp. Chaque processus est attendu dès sa fin
+    par sa session (aucun processus zombie), ses ressources (mémoire résidente, CPU)
+    sont relevées dans /proc, et les limites de sessions simultanées et de mémoire
+    totale sont vérifiées avant chaque lancement (0 = sans limite).
+    """
+    def __init__(self, max_sessions=0, max_memory_mb=0, history=SESSION_HISTORY, proc_root="/proc"):
+        self.max_sessions = max_sessions
+        self.max_memory_mb = max_memory_mb
+        self.history = history
+        self.proc_root = proc_root
+        self.sessions = []
+        # (identifiant de connexion, login) -> session en cours
+        self._live = {}
+        # Session -> (ticks CPU, instant) du relevé précédent
+        self._cpu_samples = {}
+
+    def add(self, session):
+        self.sessions.append(session)
+        if session.conn_id:
+            key = (session.conn_id, session.login)
+            self._live[key] = session
+            session.on_exit(lambda s: self._live.pop(key, None) if self._live.get(key) is s else None)
+        ended = [s for s in self.sessions if not s.running]
+        if len(ended) > self.history:
+            drop = set(map(id, ended[:len(ended) - self.history]))
+            self.sessions = [s for s in self.sessions if id(s) not in drop]
+
+    def live(self):
+        return [session for session in self.sessions if session.running]
+
+    def find(self, conn_id, login):
+        """Session en cours pour une connexion et un login, ou None."""
+        session = self._live.get((conn_id, login))
+        if session is None or not session.running or session.state == "failed":
+            return None
+        return session
+
+    def latest(self, conn_id):
+        """Dernière session lancée pour une connexion enregistrée."""
+        for session in reversed(self.sessions):
+            if session.conn_id == conn_id:
+                return session
+        return None
+
+    def sample(self):
+        """Met à jour session.rss (octets) et session.cpu (% d'un cœur) des sessions actives."""
+        now = time.monotonic()
+        live = self.live()
+        self._cpu_samples = {s: sample for s, sample in self._cpu_samples.items() if s in live}
+        for session in live:
+            usage = read_process_usage(session.proc.pid, self.proc_root)
+            if usage is None:
+                continue
+            session.rss, ticks = usage
+            previous = self._cpu_samples.get(session)
+            if previous is not None:
+                previous_ticks, previous_time = previous
+                elapsed = now - previous_time
+                if elapsed > 0:
+                    session.cpu = (ticks - previous_ticks) / CLOCK_TICKS / elapsed * 100
+            self._cpu_samples[session] = (ticks, now)
+
+    def total_memory(self):
+        return sum(session.rss or 0 for session in self.live())
+
+    def check_limits(self):
+        """(cause, détail) si une nouvelle session dépasserait une limite, sinon None."""
+        live = self.live()
+        if self.max_sessions and len(live) >= self.max_sessions:
+            return "session_limit", f"{len(live)}/{self.max_sessions}"
+        if self.max_memory_mb:
+            self.sample()
+            used_mb = self.total_memory() / 1048576
+            if used_mb >= self.max_memory_mb:
+                return "memory_limit", f"{used_mb:.0f}/{self.max_memory_mb} Mo"
+        return None
+
+    def terminate(self, session):
+        """Arrête xfreerdp (tout son groupe de processus)."""
+        if not session.running:
+            return
+        session.user_closed = True
+        try:
+            os.killpg(session.proc.pid, signal.SIGTERM)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+# Reconnexion automatique : délais initial et maximal (s) et nombre de tentatives consécutives
+RECONNECT_BASE_DELAY = 2
+RECONNECT_MAX_DELAY = 60
+RECONNECT_MAX_ATTEMPTS = 6
+# Codes de sortie de xfreerdp après une fin de session voulue (fenêtre fermée, déconnexion
+# ou fermeture de session depuis Windows, session reprise ailleurs) : pas de reconnexion
+XFREERDP_CLEAN_EXIT_CODES = {0, 1, 2, 3, 5, 11, 12}
+
+def reconnect_delay(attempt, base=RECONNECT_BASE_DELAY, cap=RECONNECT_MAX_DELAY):
+    """Attente (s) avant la tentative n° attempt : doublée à chaque fois, plafonnée, avec gigue."""
+    delay = min(cap, base * 2 ** (attempt - 1))
+    return random.uniform(delay / 2, delay)
+
+def session_dropped(session):
+    """Vrai si une session établie s'est arrêtée sans que l'utilisateur l'ait fermée."""
+    return (session.connected_at is not None and not session.user_closed
+            and session.returncode not in XFREERDP_CLEAN_EXIT_CODES)
+
+class AutoReconnector:
+    """
+    Relance les sessions interrompues des connexions où la reconnexion automatique est
+    activée, avec les identifiants déjà résolus. Les tentatives sont espacées par
+    reconnect_delay et abandonnées après max_attempts échecs consécutifs.
+    launch(conn_id, login, pwd, done) relance la connexion et appelle
+    done(connected, reason, detail) ; schedule(delay_ms, callback) programme un appel
+    dans le thread Tk ; on_change(conn_id) signale un changement d'état.
+    Utilisé uniquement depuis le thread Tk.
+    """
+    def __init__(self, launch, schedule, on_change, max_attempts=RECONNECT_MAX_ATTEMPTS):
+        self.launch = launch
+        self.schedule = schedule
+        self.on_change = on_change
+        self.max_attempts = max_attempts
+        # Identifiant -> {"login", "pwd", "attempt", "reason", "gave_up"}
+        self.state = {}
+
+    def session_ended(self, session, pwd):
+        if session_dropped(session):
+            self.state[session.conn_id] = {"login": session.login, "pwd": pwd, "attempt": 0,
+                                           "reason": f"exit code {session.returncode}", "gave_up": False}
+            self._retry(session.conn_id)
+
+    def cancel(self, conn_id):
+        if self.state.pop(conn_id, None) is not None:
+            self.on_change(conn_id)
+
+    def status(self, conn_id):
+        return self.state.get(conn_id)
+
+    def _retry(self, conn_id):
+        entry = self.state[conn_id]
+        entry["attempt"] += 1
+        self.on_change(conn_id)
+        self.schedule(int(reconnect_delay(entry["attempt"]) * 1000), partial(self._attempt, conn_id, entry))
+
+    def _attempt(self, conn_id, entry):
+        # Annulée entre-temps (reconnexion manuelle, option désactivée...)
+        if self.state.get(conn_id) is not entry:
+            return
+        self.launch(conn_id, entry["login"], entry["pwd"], partial(self._done, conn_id, entry))
+
+    def _done(self, conn_id, entry, connected, reason, detail):
+        if self.state.get(conn_id) is not entry:
+            return
+        if connected:
+            del self.state[conn_id]
+            self.on_change(conn_id)
+            return
+        entry["reason"] = t(reason) if reason else detail
+        if entry["attempt"] >= self.max_attempts:
+            entry["gave_up"] = True
+            entry["pwd"] = None
+            self.on_change(conn_id)
+            return
+        self._retry(conn_id)
+
+class LaunchScheduler:
+    """
+    File de lancement des sessions : au plus `concurrency` connexions en cours
+    d'établissement à la fois, les suivantes attendent leur tour.
+    Une tâche est un dict {"row", "login", "pwd", "state", "reason", "detail"} dont l'état
+    passe de queued à launching puis connected ou failed.
+    launch(job, done) démarre une tâche et appelle done(connected, reason, detail).
+    Utilisé uniquement depuis le thread Tk.
+    """
+    def __init__(self, launch, concurrency=LAUNCH_CONCURRENCY):
+        self.launch = launch
+        self.concurrency = max(1, concurrency)
+        self.jobs = []
+        self.listeners = []
+        self._queue = collections.deque()
+        self._active = 0
+        self._pumping = False
+
+    def submit(self, jobs):
+        for job in jobs:
+            job.setdefault("state", "queued")
+            job.setdefault("reason", None)
+            job.setdefault("detail", "")
+            self.jobs.append(job)
+            if job["state"] == "queued":
+                self._queue.append(job)
+            self._notify(job)
+        self._pump()
+
+    def counts(self):
+        counts = {"queued": 0, "launching": 0, "connected": 0, "failed": 0}
+        for job in self.jobs:
+            counts[job["state"]] += 1
+        return counts
+
+    def clear_finished(self):
+        self.jobs = [job for job in self.jobs if job["state"] in ("queued", "launching")]
+
+    def _pump(self):
+        # launch peut appeler done immédiatement (limite atteinte, échec de Popen) :
+        # la boucle en cours reprend alors les places libérées, sans récursion
+        if self._pumping:
+            return
+        self._pumping = True
+        try:
+            while self._queue and self._active < self.concurrency:
+                job = self._queue.popleft()
+                job["state"] = "launching"
+                self._active += 1
+                self._notify(job)
+                self.launch(job, partial(self._done, job))
+        finally:
+            self._pumping = False
+
+    def _done(self, job, connected, reason, detail):
+        self._active -= 1
+        job["state"] = "connected" if connected else "failed"
+        job["reason"] = reason
+        job["detail"] = detail
+        job["pwd"] = None
+        self._notify(job)
+        self._pump()
+
+    def _notify(self, job):
+        for listener in self.listeners:
+            listener(job)
+
+######################################
+# Disponibilité des hôtes (sondage TCP / RDP)
+######################################
+RDP_PORT = 3389
+# Nombre de sondes simultanées, délai (s) par hôte et durée de validité (s) d'un résultat
+PROBE_CONCURRENCY = 64
+PROBE_TIMEOUT = 3.0
+PROBE_TTL = 300
+# Délai (ms) de regroupement des rafraîchissements du tableau pendant un sondage
+PROBE_REFRESH_MS = 200
+
+# TPKT + X.224 Connection Request + RDP_NEG_REQ (TLS | CredSSP)
+X224_CONNECTION_REQUEST = bytes.fromhex("030000130ee000000000000100080003000000")
+
+def split_address(address, default_port=RDP_PORT):
+    """'hôte', 'hôte:port' ou '[ipv6]:port' -> (hôte, port)."""
+    address = address.strip()
+    port = ""
+    if address.startswith("["):
+        host, _, rest = address[1:].partition("]")
+        if rest.startswith(":"):
+            port = rest[1:]
+    elif address.count(":") == 1:
+        host, port = address.split(":")
+    else:
+        host = address
+    return host, int(port) if port.isdigit() else default_port
+
+async def open_timed_connection(host, port, timeout):
+    """
+    Connexion TCP vers host:port ; retourne (reader, writer, rtt en ms).
+    La résolution DNS est faite avant de démarrer le chronomètre : le RTT ne mesure que
+    l'établissement de la connexion. Lève socket.gaierror, OSError ou asyncio.TimeoutError.
+    """
+    loop = asyncio.get_running_loop()
+    infos = await asyncio.wait_for(loop.getaddrinfo(host, port, type=socket.SOCK_STREAM), timeout)
+    error = OSError(f"no address for {host}")
+    for family, _type, _proto, _name, sockaddr in infos:
+        start = time.monotonic()
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(sockaddr[0], sockaddr[1], family=family), timeout)
+        except (OSError, asyncio.TimeoutError) as e:
+            error = e
+            continue
+        return reader, writer, (time.monotonic() - start) * 1000
+    raise error
+
+class ReachabilityProber:
+    """
+    Sonde la disponibilité d'adresses RDP : connexion TCP (et, en mode "x224",
+    négociation X.224) avec un nombre borné de sondes simultanées via asyncio.
+    Les résultats {"ok", "rtt" (ms), "error", "at"} sont conservés PROBE_TTL secondes.
+    """
+    def __init__(self, concurrency=PROBE_CONCURRENCY, timeout=PROBE_TIMEOUT, ttl=PROBE_TTL, x224=False):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.ttl = ttl
+        self.x224 = x224
+        self._cache = {}
+        self.pending = set()
+
+    def cached(self, address):
+        """Résultat encore valide pour une adresse, ou None."""
+        result = self._cache.get(address)
+        if result is None or time.time() - result["at"] > self.ttl:
+            return None
+        return result
+
+    def probe(self, addresses, on_result=None, force=False):
+        """
+        Sonde (de façon bloquante) les adresses sans résultat valide, ou toutes si force.
+        on_result(adresse, résultat) est appelé à chaque sonde terminée.
+        Retourne {adresse: résultat}.
+        """
+        addresses = list(dict.fromkeys(a.strip() for a in addresses if a.strip()))
+        todo = [a for a in addresses if force or self.cached(a) is None]
+        if todo:
+            self.pending.update(todo)
+            try:
+                asyncio.run(self._probe_all(todo, on_result))
+            finally:
+                self.pending.difference_update(todo)
+        return {a: self._cache.get(a) for a in addresses}
+
+    def probe_in_background(self, addresses, on_result=None, on_done=None, force=False):
+        def run():
+            results = self.probe(addresses, on_result, force)
+            if on_done:
+                on_done(results)
+        threading.Thread(target=run, daemon=True).start()
+
+    async def _probe_all(self, addresses, on_result):
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def worker(address):
+            async with semaphore:
+                result = await self._probe_one(address)
+            self._cache[address] = result
+            self.pending.discard(address)
+            if result["ok"]:
+                rtt_estimator.add(address, result["rtt"])
+            if on_result:
+                on_result(address, result)
+        await asyncio.gather(*(worker(a) for a in addresses))
+
+    async def _probe_one(self, address):
+        host, port = split_address(address)
+        result = {"ok": False, "rtt": None, "error": None, "at": time.time()}
+        try:
+            reader, writer, result["rtt"] = await open_timed_connection(host, port, self.timeout)
+        except asyncio.TimeoutError:
+            result["error"] = "connection_timeout"
+            return result
+        except socket.gaierror:
+            result["error"] = "dns_failed"
+            return result
+        except OSError:
+            result["error"] = "connect_failed"
+            return result
+        try:
+            if self.x224:
+                # Le serveur doit répondre par un X.224 Connection Confirm
+                writer.write(X224_CONNECTION_REQUEST)
+                await writer.drain()
+                reply = await asyncio.wait_for(reader.readexactly(6), self.timeout)
+                if reply[0] != 3 or reply[5] & 0xF0 != 0xD0:
+                    result["error"] = "not_rdp"
+                    return result
+            result["ok"] = True
+        except asyncio.TimeoutError:
+            result["error"] = "connection_timeout"
+        except (OSError, asyncio.IncompleteReadError):
+            result["error"] = "not_rdp"
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+        return result
 
-    data = load_connections()
-    filtre = app.search_var.get().lower()
-    if filtre:
-        data = [row for row in data if any(filtre in str(field).lower() for field in row)]
+# Poids d'une nouvelle mesure dans la moyenne glissante du RTT, et durée (s) pendant
+# laquelle la moyenne dispense de mesurer à nouveau avant une connexion
+RTT_EWMA_ALPHA = 0.3
+RTT_MAX_AGE = 600
 
-    # Regrouper par nom de groupe
-    groupes = {}
-    for row in data:
-        grp = row[5] if row[5] else "Sans groupe"
-        groupes.setdefault(grp, []).append(row)
+class RttEstimator:
+    """
+    Moyenne glissante exponentielle du RTT (ms) par adresse, alimentée par les sondes.
+    """
+    def __init__(self, alpha=RTT_EWMA_ALPHA, max_age=RTT_MAX_AGE):
+        self.alpha = alpha
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._averages = {}
+
+    def add(self, address, rtt):
+        address = address.strip()
+        with self._lock:
+            previous = self._averages.get(address)
+            if previous is not None:
+                rtt = self.alpha * rtt + (1 - self.alpha) * previous[0]
+            self._averages[address] = (rtt, time.time())
+
+    def estimate(self, address):
+        """Moyenne récente pour une adresse, ou None."""
+        average = self._averages.get(address.strip())
+        if average is None or time.time() - average[1] > self.max_age:
+            return None
+        return average[0]
 
-    url_pattern = r'https?://[^\s]+'  # http:// ou https:// jusqu'à l'espace
+rtt_estimator = RttEstimator()
 
-    for grp in sorted(groupes.keys(), key=lambda g: g.lower()):
-        parent_id = app.tree.insert("", "end", text=grp, open=True)
-        for row in sorted(groupes[grp], key=lambda r: r[0].lower()):
-            note_complete = row[4] or ""
-            note_affichage = format_note(note_complete)
+def pick_auto_profile(rtt):
+    """Palier de performance correspondant à un RTT (ms) ; profil par défaut si inconnu."""
+    if rtt is None:
+        return ""
+    lan_max, wan_max = AUTO_PROFILE_THRESHOLDS
+    if rtt <= lan_max:
+        return "lan"
+    if rtt <= wan_max:
+        return "wan"
+    return "low_bandwidth"
+
+prober = ReachabilityProber(x224=PROBE_MODE == "x224")
+
+def probe_status_text(field):
+    """Texte de la colonne Statut pour le champ IP d'une connexion (une ou plusieurs adresses)."""
+    addresses = connection_addresses(field)
+    if any(address in prober.pending for address in addresses):
+        return "…"
+    results = [(address, prober.cached(address)) for address in addresses]
+    results = [(address, result) for address, result in results if result is not None]
+    if not results:
+        return ""
+    for address, result in results:
+        if result["ok"]:
+            suffix = f" ({address})" if len(addresses) > 1 else ""
+            return f"✔ {result['rtt']:.0f} ms{suffix}"
+    return f"✘ {t(results[0][1]['error'])}"
 
-            # Si la note contient au moins une URL, on met le tag "has_url"
-            has_link = True if re.search(url_pattern, note_complete) else False
-            tags = ("has_url",) if has_link else ()
+######################################
+# Connexions à plusieurs adresses
+######################################
+# Décalage (s) entre deux tentatives lors de la course entre les adresses d'une connexion
+ADDRESS_RACE_STAGGER = 0.25
+# Échecs de xfreerdp après lesquels l'adresse suivante est essayée (pas après un refus
+# des identifiants : les autres adresses mènent au même serveur)
+ADDRESS_FAILOVER_EVENTS = ("dns_failed", "tls_failed", "connect_failed", "connection_timeout")
 
-            app.tree.insert(parent_id, "end",
-                            text=row[0],
-                            values=(row[1], row[2], row[3], note_affichage),
-                            tags=tags)
+def connection_addresses(field):
+    """Liste ordonnée des adresses du champ IP ("10.0.0.5, 10.8.0.5, srv.example.com")."""
+    return [address.strip() for address in field.split(",") if address.strip()]
 
-def treeview_sort_column(tv, col, reverse):
-    data = [(tv.set(k, col), k) for k in tv.get_children('')]
-    data.sort(key=lambda t: t[0].lower(), reverse=reverse)
-    for index, (val, k) in enumerate(data):
-        tv.move(k, '', index)
-    tv.heading(col, command=partial(treeview_sort_column, tv, col, not reverse))
+class AddressSelector:
+    """
+    Choix de l'adresse d'une connexion qui en a plusieurs : connexions TCP lancées en
+    décalé vers chaque adresse (la dernière adresse gagnante en premier) et la première
+    qui répond l'emporte. La dernière adresse gagnante de chaque connexion est conservée
+    dans last_addresses.conf (Identifiant|Adresse).
+    """
+    def __init__(self, path, stagger=ADDRESS_RACE_STAGGER, timeout=PROBE_TIMEOUT):
+        self.path = path
+        self.stagger = stagger
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._winners = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    conn_id, _, address = line.rstrip("\n").partition("|")
+                    if conn_id and address:
+                        self._winners[conn_id] = address
+
+    def ordered(self, conn_id, addresses):
+        winner = self._winners.get(conn_id)
+        if winner in addresses:
+            return [winner] + [a for a in addresses if a != winner]
+        return list(addresses)
+
+    def race(self, conn_id, addresses):
+        """
+        Adresse retenue (la première qui accepte une connexion TCP), ou None si aucune
+        ne répond. Bloquant : à appeler hors du thread Tk.
+        """
+        winner, rtt = asyncio.run(self._race(self.ordered(conn_id, addresses)))
+        if winner is not None:
+            rtt_estimator.add(winner, rtt)
+            if conn_id and self._winners.get(conn_id) != winner:
+                self._remember(conn_id, winner)
+        return winner
+
+    async def _race(self, addresses):
+        async def attempt(address):
+            host, port = split_address(address)
+            _, writer, rtt = await open_timed_connection(host, port, self.timeout)
+            writer.close()
+            return address, rtt
+
+        pending = set()
+        index = 0
+        while True:
+            if index < len(addresses):
+                pending.add(asyncio.ensure_future(attempt(addresses[index])))
+                index += 1
+            if not pending:
+                return None, None
+            # La tentative suivante part après le décalage, ou dès qu'une tentative échoue
+            done, pending = await asyncio.wait(pending, timeout=self.stagger if index < len(addresses) else None,
+                                               return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    return task.result()
+
+    def forget(self, conn_id, address):
+        """Oublie l'adresse gagnante d'une connexion si c'est celle qui vient d'échouer."""
+        with self._lock:
+            if self._winners.get(conn_id) != address:
+                return
+            del self._winners[conn_id]
+            self._save()
 
-def window_exists(root, title):
-    for win in root.winfo_children():
-        if isinstance(win, tk.Toplevel) and win.title() == title:
-            win.lift()
-            return True
-    return False
+    def _remember(self, conn_id, address):
+        with self._lock:
+            self._winners[conn_id] = address
+            self._save()
+
+    def _save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for key, value in self._winners.items():
+                f.write(f"{key}|{value}\n")
+        os.replace(tmp_path, self.path)
+
+address_selector = AddressSelector(LAST_ADDRESSES_FILE)
 
 ######################################
 # Fenêtre "À propos"
@@ -621,89 +3048,242 @@ def about_dialog(app):
 ######################################
 # Vérification & mise à jour
 ######################################
-def check_for_update(app, from_menu=False):
-    repo_url = "https://github.com/Equinoxx83/SwiftRDP.git"
-    temp_dir = tempfile.mkdtemp()
+# Délai maximal d'une commande git de vérification (en secondes)
+UPDATE_GIT_TIMEOUT = 30
+
+def run_git(*args, cwd=None):
+    """Exécute git sans invite d'identifiants et retourne sa sortie standard."""
+    env = dict(os.environ, GIT_TERMINAL_PROMPT="0")
+    return subprocess.run(["git", *args], cwd=cwd, env=env, capture_output=True, text=True,
+                          timeout=UPDATE_GIT_TIMEOUT, check=True).stdout
+
+def read_local_version():
     try:
-        subprocess.check_call(["git", "clone", "--depth", "1", repo_url, temp_dir])
-        remote_version_file = os.path.join(temp_dir, "version.txt")
-        if not os.path.exists(remote_version_file):
-            remote_version = ""
-        else:
-            with open(remote_version_file, "r", encoding="utf-8") as f:
-                remote_version = f.read().strip()
+        with open(VERSION_FILE, "r", encoding="utf-8") as vf:
+            return vf.read().strip()
     except Exception:
-        remote_version = ""
+        return ""
+
+def load_update_cache():
+    try:
+        with open(UPDATE_CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_update_cache(cache):
+    tmp = UPDATE_CACHE_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f)
+    os.replace(tmp, UPDATE_CACHE_FILE)
+
+def fetch_remote_version(repo_url, ref):
+    """
+    Lit version.txt du commit 'ref' sans cloner le dépôt : clone sans extraction ni blobs,
+    puis git show ne récupère que le blob de version.txt.
+    """
+    temp_dir = tempfile.mkdtemp()
+    try:
+        run_git("clone", "--quiet", "--depth", "1", "--filter=blob:none", "--no-checkout", repo_url, temp_dir)
+        return run_git("show", f"{ref}:version.txt", cwd=temp_dir).strip()
     finally:
-        shutil.rmtree(temp_dir)
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+def probe_remote_version(repo_url=None, force=False):
+    """
+    Retourne la version distante, ou "" en cas d'échec. git ls-remote donne le commit de HEAD ;
+    version.txt n'est relu que si ce commit a changé depuis la dernière vérification.
+    Sans 'force', le résultat mis en cache est réutilisé pendant UPDATE_INTERVAL heures.
+    """
+    repo_url = repo_url or UPDATE_REPO_URL
+    cache = load_update_cache()
+    now = time.time()
+    if (not force and cache.get("repo") == repo_url
+            and now - cache.get("checked_at", 0) < UPDATE_INTERVAL * 3600):
+        return cache.get("version", "")
     try:
-        with open(VERSION_FILE, "r", encoding="utf-8") as vf:
-            local_version = vf.read().strip()
-    except Exception:
-        local_version = ""
-    if remote_version and remote_version != local_version:
+        head = run_git("ls-remote", repo_url, "HEAD").split()
+        if not head:
+            return ""
+        ref = head[0]
+        if cache.get("repo") == repo_url and cache.get("ref") == ref and cache.get("version"):
+            version = cache["version"]
+        else:
+            version = fetch_remote_version(repo_url, ref)
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    try:
+        save_update_cache({"repo": repo_url, "ref": ref, "version": version, "checked_at": now})
+    except OSError:
+        pass
+    return version
+
+def check_for_update(app, from_menu=False):
+    """
+    Vérifie en arrière-plan si une nouvelle version existe ; seule la question posée à
+    l'utilisateur repasse par le thread Tk. Depuis le menu, l'intervalle est ignoré.
+    """
+    def worker():
+        remote_version = probe_remote_version(force=from_menu)
+        if remote_version and remote_version != read_local_version():
+            app.after(0, ask_update, remote_version)
+        elif from_menu:
+            app.after(0, lambda: messagebox.showinfo(t("update_option"), t("no_update_available"), parent=app))
+
+    def ask_update(remote_version):
         if messagebox.askyesno(t("update_option"), t("new_version_available"), parent=app):
-            update_app(app, repo_url, remote_version)
-    else:
-        if from_menu:
-            messagebox.showinfo(t("update_option"), t("no_update_available"), parent=app)
+            update_app(app, UPDATE_REPO_URL, remote_version)
 
-def update_app(app, repo_url, remote_version):
+    threading.Thread(target=worker, daemon=True).start()
+
+def git_blob_hash(path):
+    """Empreinte git (blob SHA-1) d'un fichier local, comparable à celle de git ls-tree."""
+    h = hashlib.sha1()
+    h.update(b"blob %d\0" % os.path.getsize(path))
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def install_update(repo_url, remote_version):
+    """
+    Installe la version distante dans versions/<version> puis bascule le lien 'current'.
+    Seuls les fichiers dont l'empreinte diffère de la version en cours sont téléchargés ;
+    les autres sont copiés depuis le dossier courant. Le lien 'previous' permet de revenir
+    en arrière (rollback_update). Retourne le dossier installé.
+    """
+    current_dir = os.path.realpath(PROJECT_DIR)
+    os.makedirs(VERSIONS_DIR, exist_ok=True)
     temp_dir = tempfile.mkdtemp()
+    staging = tempfile.mkdtemp(prefix=".staging-", dir=VERSIONS_DIR)
     try:
-        subprocess.check_call(["git", "clone", "--depth", "1", repo_url, temp_dir])
-        dest_dir = PROJECT_DIR
-        for item in os.listdir(dest_dir):
-            s = os.path.join(dest_dir, item)
-            if os.path.isdir(s):
-                shutil.rmtree(s)
-            else:
-                os.remove(s)
-        for item in os.listdir(temp_dir):
-            s = os.path.join(temp_dir, item)
-            d = os.path.join(dest_dir, item)
-            if os.path.isdir(s):
-                shutil.copytree(s, d)
-            else:
-                shutil.copy2(s, d)
-        with open(os.path.join(dest_dir, "version.txt"), "w", encoding="utf-8") as vf:
-            vf.write(remote_version)
-        os.chmod(os.path.join(dest_dir, "SwiftRDP.sh"), 0o755)
-        if os.path.exists(CHANGELOG_HIDE):
-            os.remove(CHANGELOG_HIDE)
-        with open(os.path.join(PROJECT_DIR, "PATCH_NOTE_PENDING"), "w", encoding="utf-8") as f:
+        run_git("clone", "--quiet", "--depth", "1", "--filter=blob:none", "--no-checkout", repo_url, temp_dir)
+        files = {}
+        for line in run_git("ls-tree", "-r", "HEAD", cwd=temp_dir).splitlines():
+            meta, path = line.split("\t", 1)
+            mode, kind, sha = meta.split()
+            if kind == "blob":
+                files[path] = (mode, sha)
+        changed = [path for path, (mode, sha) in files.items()
+                   if not (os.path.isfile(os.path.join(current_dir, path))
+                           and git_blob_hash(os.path.join(current_dir, path)) == sha)]
+        if changed:
+            # Un seul checkout : git ne récupère que les blobs manquants, en un lot
+            run_git("checkout", "HEAD", "--", *changed, cwd=temp_dir)
+        changed = set(changed)
+        for path, (mode, sha) in files.items():
+            src = os.path.join(temp_dir if path in changed else current_dir, path)
+            dst = os.path.join(staging, path)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            shutil.copyfile(src, dst)
+            os.chmod(dst, 0o755 if mode == "100755" else 0o644)
+        if "version.txt" not in files:
+            with open(os.path.join(staging, "version.txt"), "w", encoding="utf-8") as vf:
+                vf.write(remote_version)
+        with open(os.path.join(staging, "PATCH_NOTE_PENDING"), "w", encoding="utf-8") as f:
             f.write("1")
-    except Exception as e:
-        messagebox.showerror(t("error"), f"{t('update_failed')}\n{e}", parent=app)
-        return
+        os.chmod(staging, 0o755)
+        # Suffixe unique : deux installations de la même version dans la même seconde
+        target = os.path.join(VERSIONS_DIR, f"{remote_version}-{int(time.time())}-{uuid.uuid4().hex[:8]}")
+        os.rename(staging, target)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
     finally:
-        shutil.rmtree(temp_dir)
-    def progress_and_restart():
-        progress_win = tk.Toplevel(app)
-        progress_win.title(t("update_complete"))
-        main_x = app.winfo_x()
-        main_y = app.winfo_y()
-        main_width = app.winfo_width()
-        main_height = app.winfo_height()
-        win_width = 400
-        win_height = 100
-        pos_x = main_x + (main_width - win_width) // 2
-        pos_y = main_y + (main_height - win_height) // 2
-        progress_win.geometry(f"{win_width}x{win_height}+{pos_x}+{pos_y}")
-        progress_win.configure(bg=app.theme["bg"])
-        tk.Label(progress_win, text=t("update_in_progress_t"), font=app.font_main,
-                 bg=app.theme["bg"], fg=app.theme["fg"]).pack(pady=10)
-        pb = ttk.Progressbar(progress_win, mode="determinate", maximum=100)
-        pb.pack(fill=tk.X, padx=20, pady=10)
-        for i in range(101):
-            pb['value'] = i
-            progress_win.update()
-            time.sleep(0.1)
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    switch_link(PREVIOUS_LINK, current_dir)
+    switch_link(CURRENT_LINK, target)
+    prune_versions()
+    return target
+
+def switch_link(link, target):
+    """Remplace atomiquement le lien symbolique 'link' (rename d'un lien temporaire)."""
+    tmp = f"{link}.tmp"
+    if os.path.lexists(tmp):
+        os.remove(tmp)
+    os.symlink(os.path.relpath(target, os.path.dirname(link)), tmp)
+    os.replace(tmp, link)
+
+def prune_versions():
+    """Ne garde que les versions pointées par 'current' et 'previous'."""
+    keep = {os.path.realpath(CURRENT_LINK), os.path.realpath(PREVIOUS_LINK)}
+    for name in os.listdir(VERSIONS_DIR):
+        path = os.path.join(VERSIONS_DIR, name)
+        if os.path.realpath(path) not in keep and not name.startswith(".staging-"):
+            shutil.rmtree(path, ignore_errors=True)
+
+def rollback_update():
+    """
+    Revient à la version précédente en échangeant 'current' et 'previous'.
+    Si la version précédente est l'installation d'origine (non versionnée), 'current' est retiré.
+    Retourne False s'il n'y a pas de version précédente.
+    """
+    if not os.path.lexists(PREVIOUS_LINK):
+        return False
+    previous = os.path.realpath(PREVIOUS_LINK)
+    current = os.path.realpath(CURRENT_LINK) if os.path.lexists(CURRENT_LINK) else INSTALL_DIR
+    if not os.path.isdir(previous) or previous == current:
+        return False
+    if previous == os.path.realpath(INSTALL_DIR):
+        os.remove(CURRENT_LINK)
+    else:
+        switch_link(CURRENT_LINK, previous)
+    switch_link(PREVIOUS_LINK, current)
+    return True
+
+def restart_app(app):
+    subprocess.Popen(["/bin/bash", os.path.join(INSTALL_DIR, "SwiftRDP.sh")])
+    app.destroy()
+    sys.exit(0)
+
+def update_app(app, repo_url, remote_version):
+    """
+    Installe la mise à jour dans un thread et redémarre dès que le lien 'current' a basculé.
+    """
+    progress_win = tk.Toplevel(app)
+    progress_win.title(t("update_complete"))
+    main_x = app.winfo_x()
+    main_y = app.winfo_y()
+    main_width = app.winfo_width()
+    main_height = app.winfo_height()
+    win_width = 400
+    win_height = 100
+    pos_x = main_x + (main_width - win_width) // 2
+    pos_y = main_y + (main_height - win_height) // 2
+    progress_win.geometry(f"{win_width}x{win_height}+{pos_x}+{pos_y}")
+    progress_win.configure(bg=app.theme["bg"])
+    tk.Label(progress_win, text=t("update_in_progress_t"), font=app.font_main,
+             bg=app.theme["bg"], fg=app.theme["fg"]).pack(pady=10)
+    pb = ttk.Progressbar(progress_win, mode="indeterminate")
+    pb.pack(fill=tk.X, padx=20, pady=10)
+    pb.start(20)
+
+    def failed(e):
         progress_win.destroy()
-        subprocess.Popen(["/bin/bash", os.path.join(PROJECT_DIR, "SwiftRDP.sh")])
-        app.destroy()
-        sys.exit(0)
-    threading.Thread(target=progress_and_restart, daemon=True).start()
+        messagebox.showerror(t("error"), f"{t('update_failed')}\n{e}", parent=app)
+
+    def worker():
+        try:
+            install_update(repo_url, remote_version)
+        except Exception as e:
+            app.after(0, failed, e)
+            return
+        app.after(0, restart_app, app)
+
+    threading.Thread(target=worker, daemon=True).start()
+
+def rollback_app(app):
+    if not messagebox.askyesno(t("rollback_option"), t("rollback_confirm"), parent=app):
+        return
+    try:
+        done = rollback_update()
+    except OSError as e:
+        messagebox.showerror(t("error"), f"{t('rollback_failed')}\n{e}", parent=app)
+        return
+    if not done:
+        messagebox.showinfo(t("rollback_option"), t("no_previous_version"), parent=app)
+        return
+    restart_app(app)
 
 ######################################
 # Classe principale de l’application
@@ -714,6 +3294,7 @@ class RDPApp(tk.Tk):
         self.note_tooltip = None
         self.connection_in_progress = False
         self.temp_connections = {}
+        self.supervisor = SessionSupervisor(MAX_SESSIONS, MAX_SESSION_MEMORY)
         self.theme = get_theme()
         self.logo = tk.PhotoImage(file=ICON_FILE)
         self.iconphoto(False, self.logo)
@@ -723,12 +3304,24 @@ class RDPApp(tk.Tk):
         self.font_main = ("Segoe Script", 12)
         self.font_heading = ("Segoe Script", 12)
         self.last_click_time = 0
+        self.search = SearchEngine()
+        self._search_after = None
+        self.lazy_mode = False
+        self.lazy_loaded = {}
+        self._lazy_check_pending = False
+        self._probe_refresh = None
+        self.launcher = LaunchScheduler(self._launch_job, LAUNCH_CONCURRENCY)
+        self.launcher.listeners.append(self.update_launch_progress)
+        self.reconnector = AutoReconnector(self._reconnect, self.after, self.on_reconnect_change)
+        self._launch_view = None
         self.create_widgets()
+        startup_profiler.mark("tk_init")
         self.refresh_table()
         self.tree.bind("<Button-1>", self.record_click)
         self.tree.bind("<Double-1>", self.handle_double_click)
         for i in range(1, 10):
-            self.bind_all(f"<Control-Key-{i}>", lambda event, n=i: treeview_sort_column(self.tree, "#0", False))
+            self.bind_all(f"<Control-Key-{i}>", lambda event, n=i: [treeview_sort_column(self.tree, "#0", False),
+                                                                    self.table.resync_order()])
         self.bind("<Map>", self.on_map)
         if not os.path.exists(CHANGELOG_HIDE):
             self.after(2000, lambda: self.show_patch_note_dialog(read_patch_note()))
@@ -743,20 +3336,29 @@ class RDPApp(tk.Tk):
         # Ne pas réagir si trop lent
         if (event.time - self.last_click_time) > DOUBLE_CLICK_THRESHOLD:
             return
+        iid = self.tree.identify_row(event.y)
+        if iid.startswith("more:"):
+            self.load_more(iid)
+            return
         row = self.get_selected_row()
         if row is None:
             return
         col = self.tree.identify_column(event.x)
         if col == "#4":  # Note
-            note = row[4] or ""
-            url_pattern = r'https?://[^\s]+'
-            match = re.search(url_pattern, note)
-            if match:
-                webbrowser.open(match.group())
+            urls = note_metadata(row)[1]
+            if len(urls) == 1:
+                webbrowser.open(urls[0])
+            elif urls:
+                # Plusieurs liens : on laisse choisir
+                menu = tk.Menu(self, tearoff=0)
+                for url in urls:
+                    menu.add_command(label=url, command=partial(webbrowser.open, url))
+                menu.tk_popup(event.x_root, event.y_root)
             else:
                 self.edit_connection_note(row)
         else:
-            self.connect_connection(row)
+            # Maj + double-clic : nouvelle session même si une session est déjà ouverte
+            self.connect_connection(row, force_new=bool(event.state & SHIFT_MASK))
 
     def on_tree_motion(self, event):
         iid = self.tree.identify_row(event.y)
@@ -764,27 +3366,20 @@ class RDPApp(tk.Tk):
         if not iid or col != "#4":
             self.hide_note_tooltip()
             return
-        item = self.tree.item(iid)
-        if not item.get("values"):
+        row = connection_store.get(iid)
+        if row is None:
             self.hide_note_tooltip()
             return
-        name = item["text"]
-        note = ""
-        for row in load_connections():
-            if row[0] == name:
-                note = row[4] or ""
-                break
-        match = re.search(r"https?://[^\s]+", note)
-        if not match:
+        urls = note_metadata(row)[1]
+        if not urls:
             self.hide_note_tooltip()
             return
-        url = match.group()
         x = event.x_root + 10
         y = event.y_root + 10
-        self.show_note_tooltip(url, x, y)
+        self.show_note_tooltip(urls, x, y)
 
-    def show_note_tooltip(self, url, x, y):
-        if self.note_tooltip and getattr(self.note_tooltip, "current_url", None) == url:
+    def show_note_tooltip(self, urls, x, y):
+        if self.note_tooltip and getattr(self.note_tooltip, "current_urls", None) == urls:
             try:
                 self.note_tooltip.geometry(f"+{x}+{y}")
             except:
@@ -794,12 +3389,13 @@ class RDPApp(tk.Tk):
         tw = tk.Toplevel(self)
         tw.overrideredirect(True)
         tw.attributes("-topmost", True)
-        tw.current_url = url
+        tw.current_urls = urls
         tw.configure(bg="white")
-        lbl = tk.Label(tw, text=url, fg="blue", cursor="hand2",
-                       font=("Segoe Script", 10, "underline"), bg="white")
-        lbl.pack(padx=2, pady=2)
-        lbl.bind("<Button-1>", lambda e: webbrowser.open(url))
+        for url in urls:
+            lbl = tk.Label(tw, text=url, fg="blue", cursor="hand2",
+                           font=("Segoe Script", 10, "underline"), bg="white")
+            lbl.pack(padx=2, pady=2, anchor="w")
+            lbl.bind("<Button-1>", lambda e, url=url: webbrowser.open(url))
         tw.bind("<FocusOut>", lambda e: self.hide_note_tooltip())
         tw.geometry(f"+{x}+{y}")
         self.note_tooltip = tw
@@ -816,20 +3412,39 @@ class RDPApp(tk.Tk):
         apply_custom_treeview_style()
         self.tree.configure(style="My.Treeview")
 
-    def connect_connection(self, row, pwd_provided=None, temporary=False):
-        """
-        Lance la connexion RDP. Si le mot de passe chiffré est présent, on le déchiffre
-        via MASTER_KEY. Sinon, on demande à l'utilisateur.
-        """
-        if row is None:
-            return
-        self.connection_in_progress = True
-        timeout = 15
+    def set_theme(self, theme):
+        """Change de thème sans redémarrer : styles ttk et couleurs des fenêtres ouvertes."""
+        global CURRENT_THEME
+        old_theme = self.theme
+        CURRENT_THEME = theme
+        self.theme = get_theme()
+        apply_custom_treeview_style()
+        restyle_widgets(self, old_theme, self.theme)
+
+    def set_language(self, lang):
+        """Change de langue sans redémarrer : libellés, titres et colonne Statut."""
+        global CURRENT_LANG
+        old_lang = CURRENT_LANG
+        CURRENT_LANG = lang
+        retranslate_widgets(self, old_lang)
+        self.refresh_table()
+
+    def select_login(self, row):
+        """Login à utiliser ; demandé si la connexion en propose plusieurs."""
         selected_login = row[2]
         if ',' in row[2]:
             available_logins = [u.strip() for u in row[2].split(',') if u.strip()]
             if len(available_logins) > 1:
                 selected_login = ask_login_selection(available_logins, parent=self)
+        return selected_login
+
+    def resolve_credentials(self, row, pwd_provided=None, login=None):
+        """
+        Login et mot de passe à utiliser pour une connexion. Si le mot de passe chiffré
+        est présent, on le déchiffre via MASTER_KEY. Sinon, on demande à l'utilisateur.
+        Retourne (login, mot de passe), ou None si aucun mot de passe n'est fourni.
+        """
+        selected_login = login if login is not None else self.select_login(row)
 
         # Choisir le mot de passe à utiliser :
         if pwd_provided is not None:
@@ -846,22 +3461,44 @@ class RDPApp(tk.Tk):
                     parent=self
                 )
         if not pwd:
+            return None
+        return selected_login, pwd
+
+    def connect_connection(self, row, pwd_provided=None, temporary=False, force_new=False):
+        """
+        Lance la connexion RDP avec une fenêtre de progression. Si une session est déjà
+        ouverte pour cette connexion et ce login, sa fenêtre est affichée à la place,
+        sauf si force_new.
+        """
+        if row is None:
+            return
+        self.reconnector.cancel(row[7])
+        login = self.select_login(row)
+        if not force_new and self.reuse_session(row, login):
+            return
+        self.connection_in_progress = True
+        credentials = self.resolve_credentials(row, pwd_provided, login)
+        if credentials is None:
             messagebox.showerror(t("error"), t("no_password"), parent=self)
             self.connection_in_progress = False
             return
 
-        try:
-            proc = subprocess.Popen(
-                ["xfreerdp", f"/v:{row[1]}", f"/u:{selected_login}", f"/p:{pwd}",
-                 "/dynamic-resolution", "/cert-ignore", f"/title:SwiftRDP - {row[0]} ({row[1]})"],
-                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-                text=True, start_new_session=True
-            )
-        except Exception as e:
-            messagebox.showerror(t("error"), f"{t('launch_error')}:\n{e}", parent=self)
-            self.connection_in_progress = False
-            return
+        progress_win = self.show_connect_progress()
 
+        def on_result(connected, reason, detail):
+            # Thread Tk : le résultat est connu (sortie de xfreerdp, fenêtre ou délai dépassé)
+            if progress_win.winfo_exists():
+                progress_win.destroy()
+            self.connection_in_progress = False
+            self.configure(bg=self.theme["bg"])
+            if not connected:
+                message = f"{t('connection_failed')} : {t(reason)}"
+                if detail:
+                    message += f"\n\n{detail}"
+                messagebox.showerror(t("error"), message, parent=self)
+        self.launch_session(row, *credentials, on_result=on_result, temporary=temporary)
+
+    def show_connect_progress(self):
         main_x = self.winfo_x()
         main_y = self.winfo_rooty()
         main_width = self.winfo_width()
@@ -893,64 +3530,290 @@ class RDPApp(tk.Tk):
                     if progress_win.winfo_exists():
                         progress_win.destroy()
         update_progress()
+        return progress_win
 
-        if not temporary:
-            def check_window():
-                start_time = time.time()
-                found = False
-                while time.time() - start_time < timeout:
-                    try:
-                        output = subprocess.check_output(["wmctrl", "-l"], text=True)
-                    except Exception:
-                        output = ""
-                    if "swiftrdp" in output.lower() and row[1].lower() in output.lower():
-                        found = True
-                        break
-                    time.sleep(0.1)
-                if progress_win.winfo_exists():
-                    progress_win.destroy()
-                if found:
-                    new_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    new_row = row.copy()
-                    new_row[3] = new_date
-                    update_connection_by_value(row, new_row)
-                    self.after(0, self.refresh_table)
-                    self.after(0, self.reset_treeview_style)
+    def launch_session(self, row, login, pwd, on_result=None, temporary=False):
+        """
+        Démarre xfreerdp pour une connexion. on_result(connected, reason, detail) est
+        appelé dans le thread Tk dès que l'issue est connue.
+        Refusé si une limite du superviseur est atteinte. Avec plusieurs adresses, celle
+        qui répond la première est retenue ; si xfreerdp échoue ensuite sur cette adresse,
+        elle est oubliée et les adresses restantes sont essayées. Le profil "auto" est
+        résolu d'après le RTT vers l'hôte : la moyenne glissante si elle est récente,
+        sinon une mesure. Les mesures sont faites en arrière-plan.
+        """
+        limit = self.supervisor.check_limits()
+        if limit is not None:
+            if on_result:
+                on_result(False, *limit)
+            return
+        addresses = connection_addresses(row[1]) or [row[1]]
+        tried = []
+        attempt = {}
+
+        def race(candidates, notes=()):
+            self.after(0, start, address_selector.race(row[7], candidates), True, notes)
+
+        def finish(connected, reason, detail):
+            # Thread Tk : échec sur l'adresse gagnante de la course (TLS, délai dépassé...)
+            if not connected and len(addresses) > 1 and reason != "xfreerdp_launch_error":
+                failed = tried[-1]
+                address_selector.forget(row[7], failed)
+                remaining = [a for a in addresses if a not in tried]
+                if reason in ADDRESS_FAILOVER_EVENTS and remaining:
+                    self.supervisor.terminate(attempt["session"])
+                    notes = [t("address_failover", address=failed, reason=t(reason))]
+                    threading.Thread(target=race, args=(remaining, notes), daemon=True).start()
+                    return
+            if on_result:
+                on_result(connected, reason, detail)
+
+        def start(address, measured, notes=()):
+            if address is None:
+                if on_result:
+                    on_result(False, "connect_failed", ", ".join(addresses))
+                return
+            tried.append(address)
+            notes = list(notes)
+            if len(addresses) > 1:
+                notes.append(t("address_selected", address=address))
+            profile = row[8]
+            rtt = None
+            if profile == AUTO_PROFILE:
+                rtt = rtt_estimator.estimate(address)
+                profile = pick_auto_profile(rtt)
+                if rtt is None:
+                    notes.append(t("auto_profile_unmeasured", profile=profile_label(profile)))
                 else:
-                    self.after(0, lambda: messagebox.showerror(t("error"), t("connection_failed"), parent=self))
-                self.connection_in_progress = False
-                self.configure(bg=self.theme["bg"])
-            threading.Thread(target=check_window, daemon=True).start()
+                    notes.append(t("auto_profile_log", profile=profile_label(profile), rtt=f"{rtt:.0f}",
+                                   source=t("rtt_measured") if measured else t("rtt_average")))
+            attempt["session"] = self._start_session(row, login, pwd, finish, temporary,
+                                                     address, profile, rtt, notes)
+
+        if len(addresses) > 1:
+            threading.Thread(target=race, args=(addresses,), daemon=True).start()
+        elif row[8] == AUTO_PROFILE and rtt_estimator.estimate(addresses[0]) is None:
+            def measure():
+                prober.probe(addresses, force=True)
+                self.after(0, start, addresses[0], True)
+            threading.Thread(target=measure, daemon=True).start()
         else:
+            start(addresses[0], False)
+
+    def _start_session(self, row, login, pwd, on_result, temporary, address, profile, rtt=None, notes=()):
+        try:
+            proc = subprocess.Popen(
+                ["xfreerdp", f"/v:{address}", f"/u:{login}", f"/p:{pwd}",
+                 "/dynamic-resolution", "/cert-ignore", *profile_options(profile),
+                 f"/title:SwiftRDP - {row[0]} ({address})"],
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                text=True, errors="replace", start_new_session=True
+            )
+        except Exception as e:
+            if on_result:
+                on_result(False, "xfreerdp_launch_error", str(e))
+            return None
+
+        session = RDPSession(row, login, proc)
+        session.address = address
+        session.profile = profile
+        session.rtt = rtt
+        for note in notes:
+            session.log.append(f"[SwiftRDP] {note}")
+        self.supervisor.add(session)
+        if temporary:
             self.temp_connections[row[1]] = {'row': row, 'proc': proc}
-            def check_temp_connection():
-                start_time = time.time()
-                found = False
-                while time.time() - start_time < timeout:
-                    try:
-                        output = subprocess.check_output(["wmctrl", "-l"], text=True)
-                    except Exception:
-                        output = ""
-                    if "swiftrdp" in output.lower() and row[1].lower() in output.lower():
-                        found = True
-                        break
-                    time.sleep(0.1)
-                if progress_win.winfo_exists():
-                    progress_win.destroy()
-                if found:
-                    proc.wait()
-                    if row[1] in self.temp_connections:
-                        del self.temp_connections[row[1]]
-                    existing = [r for r in load_connections() if r[1] == row[1]]
-                    if not existing:
-                        self.after(0, lambda: self.prompt_save_temporary(row))
+
+        def finish(connected, reason, detail):
+            if not connected:
+                if temporary:
+                    self.temp_connections.pop(row[1], None)
+            elif not temporary:
+                stamp_last_connection(row[7])
+                self.refresh_table()
+                self.reset_treeview_style()
+            if on_result:
+                on_result(connected, reason, detail)
+
+        def on_exit(session):
+            # Thread Tk : fin d'une session temporaire établie
+            if session.connected_at is None:
+                return
+            self.temp_connections.pop(row[1], None)
+            if not any(r[1] == row[1] for r in connection_store.rows()):
+                self.prompt_save_temporary(row)
+
+        session.on_result(lambda ok, reason, detail: self.after(0, finish, ok, reason, detail))
+        if temporary:
+            session.on_exit(lambda s: self.after(0, on_exit, s))
+        elif row[9]:
+            session.on_exit(lambda s: self.after(0, self.reconnector.session_ended, s, pwd))
+
+        def on_window(window_id, title):
+            session.window_id = window_id
+            session.mark_connected(title)
+
+        def on_window_closed(window_id):
+            session.window_closed_at = time.time()
+
+        # Repli si xfreerdp ne journalise rien d'exploitable : apparition de la fenêtre
+        watch = window_watcher.watch(
+            lambda title: "swiftrdp" in title.lower() and address.lower() in title.lower(),
+            on_window, on_window_closed)
+        session.on_exit(lambda s: window_watcher.unwatch(watch))
+        self.after(CONNECT_TIMEOUT * 1000, session.mark_failed, "connection_timeout")
+        return session
+
+    def _reconnect(self, conn_id, login, pwd, done):
+        row = connection_store.get(conn_id)
+        if row is None or not row[9]:
+            # Connexion supprimée ou option désactivée entre-temps
+            self.reconnector.cancel(conn_id)
+            return
+        self.launch_session(row.copy(), login, pwd, on_result=done)
+
+    def on_reconnect_change(self, conn_id):
+        self.refresh_table()
+        entry = self.reconnector.status(conn_id)
+        if entry is not None and entry["gave_up"]:
+            row = connection_store.get(conn_id)
+            name = row[0] if row is not None else conn_id
+            messagebox.showerror(t("error"), t("reconnect_gave_up", name=name, count=entry["attempt"],
+                                                reason=entry["reason"]), parent=self)
+
+    def reuse_session(self, row, login):
+        """
+        Affiche la session déjà ouverte pour cette connexion et ce login.
+        Retourne False s'il n'y en a pas (ou si sa fenêtre est introuvable).
+        """
+        session = self.supervisor.find(row[7], login) if row[7] else None
+        if session is None:
+            return False
+        # Connexion en cours d'établissement : la fenêtre va apparaître
+        return session.state == "connecting" or self.focus_session(session)
+
+    def focus_session(self, session):
+        """Met au premier plan la fenêtre d'une session."""
+        if session.window_id is None:
+            return False
+        try:
+            return subprocess.call(["wmctrl", "-i", "-a", hex(session.window_id)],
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) == 0
+        except OSError:
+            return False
+
+    def show_sessions_panel(self):
+        """Sessions en cours et récentes, avec leur consommation mémoire et CPU."""
+        if window_exists(self, t("sessions")):
+            return
+        win = tk.Toplevel(self)
+        win.iconphoto(False, self.logo)
+        win.title(t("sessions"))
+        win.geometry("1000x420")
+        win.configure(bg=self.theme["bg"])
+        label = tk.Label(win, font=self.font_main, bg=self.theme["bg"], fg=self.theme["fg"])
+        label.pack(pady=(10, 0))
+        columns = ("address", "login", "state", "duration", "memory", "cpu")
+        tree = ttk.Treeview(win, style="My.Treeview", columns=columns, show="tree headings", selectmode="browse")
+        tree.heading("#0", text="Nom")
+        tree.column("#0", width=220)
+        for col, width in zip(columns, (180, 120, 130, 100, 100, 80)):
+            tree.heading(col, text=t(f"session_{col}"))
+            tree.column(col, width=width)
+        tree.pack(fill=tk.BOTH, expand=True, padx=15, pady=10)
+        by_iid = {}
+
+        def selected():
+            selection = tree.selection()
+            return by_iid.get(selection[0]) if selection else None
+
+        def focus():
+            session = selected()
+            if session is not None and session.running:
+                self.focus_session(session)
+
+        def kill():
+            session = selected()
+            if session is not None and session.running and \
+                    messagebox.askyesno(t("confirm"), t("kill_session_confirm", name=session.row[0] or session.address),
+                                        parent=win):
+                self.supervisor.terminate(session)
+
+        def show_log():
+            session = selected()
+            if session is not None:
+                self.show_session_log(session)
+
+        btn_frame = tk.Frame(win, bg=self.theme["bg"])
+        btn_frame.pack(pady=(0, 10))
+        for text, command in ((t("focus_session"), focus), (t("kill_session"), kill), (t("session_log"), show_log)):
+            tk.Button(btn_frame, text=text, command=command, font=self.font_main, bg=self.theme["button_bg"],
+                      fg=self.theme["button_fg"], relief="flat", width=16).pack(side=tk.LEFT, padx=10)
+        tree.bind("<Double-1>", lambda e: focus())
+
+        def refresh():
+            if not win.winfo_exists():
+                return
+            self.supervisor.sample()
+            now = time.time()
+            current = set()
+            for session in self.supervisor.sessions:
+                iid = str(id(session))
+                current.add(iid)
+                by_iid[iid] = session
+                if not session.running:
+                    state = t("session_ended")
                 else:
-                    self.after(0, lambda: messagebox.showerror(t("error"), t("connection_failed"), parent=self))
-                self.configure(bg=self.theme["bg"])
-            threading.Thread(target=check_temp_connection, daemon=True).start()
+                    state = t(f"launch_{session.state}") if session.state != "connecting" else t("launch_launching")
+                duration = int((session.ended_at or now) - session.started_at)
+                values = (session.address, session.login, state,
+                          f"{duration // 3600}:{duration // 60 % 60:02d}:{duration % 60:02d}",
+                          f"{session.rss / 1048576:.0f} Mo" if session.running and session.rss else "",
+                          f"{session.cpu:.1f} %" if session.running and session.cpu is not None else "")
+                if tree.exists(iid):
+                    tree.item(iid, values=values)
+                else:
+                    tree.insert("", "end", iid=iid, text=session.row[0] or session.address, values=values)
+            for iid in set(tree.get_children()) - current:
+                tree.delete(iid)
+                by_iid.pop(iid, None)
+            label.config(text=t("sessions_summary", count=len(self.supervisor.live()),
+                                memory=f"{self.supervisor.total_memory() / 1048576:.0f}"))
+            win.after(SESSION_SAMPLE_MS, refresh)
+        refresh()
+
+    def show_session_log(self, session):
+        """Affiche la sortie de xfreerdp conservée pour une session."""
+        win = tk.Toplevel(self)
+        win.iconphoto(False, self.logo)
+        win.title(f"{t('session_log')} - {session.row[0] or session.row[1]}")
+        win.geometry("800x400")
+        win.configure(bg=self.theme["bg"])
+        text = tk.Text(win, wrap="none", bg=self.theme["entry_bg"], fg=self.theme["fg"])
+        text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        def fill():
+            text.config(state="normal")
+            text.delete("1.0", tk.END)
+            text.insert(tk.END, session.log_text())
+            text.see(tk.END)
+            text.config(state="disabled")
+        fill()
+        tk.Button(win, text=t("refresh"), command=fill,
+                  bg=self.theme["button_bg"], fg=self.theme["button_fg"]).pack(pady=(0, 10))
+
+    def action_session_log(self):
+        row = self.get_selected_row()
+        if row is None:
+            return
+        session = self.supervisor.latest(row[7])
+        if session is None:
+            messagebox.showinfo(t("info"), t("no_session_log"), parent=self)
+            return
+        self.show_session_log(session)
 
     def prompt_save_temporary(self, row):
-        if any(r[1] == row[1] for r in load_connections()):
+        if any(r[1] == row[1] for r in connection_store.rows()):
             return
         if messagebox.askyesno(t("confirm"), "Souhaitez-vous enregistrer cette connexion ?", parent=self):
             self.add_connection(prefill_ip=row[1], prefill_login=row[2], callback=False)
@@ -959,10 +3822,9 @@ class RDPApp(tk.Tk):
         self.deiconify()
         self.lift()
         self.focus_force()
-        conns = load_connections()
-        for row in conns:
-            if row[1] == ip:
-                self.connect_connection(row)
+        for row in connection_store.rows():
+            if row[1] == ip or ip in connection_addresses(row[1]):
+                self.connect_connection(row.copy())
                 return
         if messagebox.askyesno(t("confirm"), f"L'IP {ip} n'existe pas. Voulez-vous l'ajouter ?", parent=self):
             self.add_connection(prefill_ip=ip, callback=True)
@@ -971,7 +3833,7 @@ class RDPApp(tk.Tk):
             if not login:
                 messagebox.showerror("Erreur", "Login requis.", parent=self)
                 return
-            temp_row = [ip, ip, login, "N/A", "", "", ""]
+            temp_row = [ip, ip, login, "N/A", "", "", "", "", "", ""]
             self.connect_connection(temp_row, temporary=True)
 
     def add_connection(self, prefill_ip=None, prefill_login=None, callback=False):
@@ -981,7 +3843,7 @@ class RDPApp(tk.Tk):
         top.transient(self)
         top.iconphoto(False, self.logo)
         top.title(t("add_connection_title"))
-        top.geometry("825x350")
+        top.geometry("825x440")
         top.configure(bg=self.theme["bg"])
         top.resizable(False, False)
 
@@ -1034,19 +3896,26 @@ class RDPApp(tk.Tk):
                               relief="flat", width=1)
         btn_group.grid(row=0, column=1, padx=(5,0), sticky="w")
 
+        # Profil de performance
+        profile_var = self.create_profile_field(top, 5, "")
+
+        # Reconnexion automatique
+        reconnect_var = self.create_reconnect_field(top, 6, "")
+
         # Note
         top.note = ""
         note_frame = tk.Frame(top, bg=self.theme["bg"])
-        note_frame.grid(row=5, column=0, columnspan=2, pady=8)
+        note_frame.grid(row=7, column=0, columnspan=2, pady=8)
         tk.Button(note_frame, text=t("add_note"), command=lambda: self.open_note_window(top),
                   font=("Segoe Script", 12), bg=self.theme["button_bg"], fg=self.theme["button_fg"],
                   relief="flat", width=20).pack(pady=5)
 
         # Boutons Sauver / Retour
         btn_frame_top = tk.Frame(top, bg=self.theme["bg"])
-        btn_frame_top.grid(row=6, column=0, columnspan=2, pady=8)
+        btn_frame_top.grid(row=8, column=0, columnspan=2, pady=8)
         def save_and_callback():
-            self.save_new_connection(top, e_name, e_ip, e_login, e_password, group_var, top.note)
+            self.save_new_connection(top, e_name, e_ip, e_login, e_password, group_var, top.note, profile_var,
+                                     reconnect_var)
             if callback:
                 if messagebox.askyesno(t("confirm"), "Souhaitez-vous vous connecter à cette nouvelle connexion ?", parent=self):
                     new_row = load_connections()[-1]
@@ -1058,7 +3927,27 @@ class RDPApp(tk.Tk):
                   font=("Segoe Script", 12), bg=self.theme["button_bg"], fg=self.theme["button_fg"],
                   relief="flat", width=12).pack(side=tk.LEFT, padx=15, expand=True)
 
-    def save_new_connection(self, top, e_name, e_ip, e_login, e_password, group_var, note_value):
+    def create_profile_field(self, top, grid_row, current):
+        """Liste déroulante du profil de performance dans les formulaires de connexion."""
+        tk.Label(top, text=t("profile"), font=("Segoe Script", 12), bg=self.theme["bg"], fg=self.theme["button_fg"])\
+          .grid(row=grid_row, column=0, padx=15, pady=8, sticky="e")
+        profile_var = tk.StringVar(value=profile_label(current))
+        ttk.Combobox(top, textvariable=profile_var, values=[profile_label(name) for name in PERFORMANCE_PROFILES],
+                     font=("Segoe Script", 12), width=45, state="readonly")\
+          .grid(row=grid_row, column=1, padx=15, pady=8, sticky="w")
+        return profile_var
+
+    def create_reconnect_field(self, top, grid_row, current):
+        """Case à cocher de la reconnexion automatique ("1" si activée, "" sinon)."""
+        reconnect_var = tk.StringVar(value=current)
+        tk.Checkbutton(top, text=t("auto_reconnect"), variable=reconnect_var, onvalue="1", offvalue="",
+                       font=("Segoe Script", 12), bg=self.theme["bg"], fg=self.theme["button_fg"],
+                       selectcolor=self.theme["entry_bg"], activebackground=self.theme["bg"])\
+          .grid(row=grid_row, column=1, padx=15, pady=8, sticky="w")
+        return reconnect_var
+
+    def save_new_connection(self, top, e_name, e_ip, e_login, e_password, group_var, note_value, profile_var=None,
+                            reconnect_var=None):
         name_val = e_name.get().strip()
         ip_val = e_ip.get().strip()
         login_val = e_login.get().strip()
@@ -1068,21 +3957,22 @@ class RDPApp(tk.Tk):
         if not name_val or not ip_val or not login_val:
             messagebox.showerror(t("error"), t("all_fields_required"), parent=top)
             return
-        for r in load_connections():
-            if r[0] == name_val:
-                messagebox.showerror(t("error"), t("error_duplicate_name", name=name_val), parent=top)
-                return
-        if any(r[1] == ip_val for r in load_connections()):
+        if connection_store.find_by_name(name_val) is not None:
+            messagebox.showerror(t("error"), t("error_duplicate_name", name=name_val), parent=top)
+            return
+        if any(r[1] == ip_val for r in connection_store.rows()):
             if not messagebox.askyesno(t("warning"), t("warning_duplicate_ip", ip=ip_val), parent=top):
                 return
 
         # Chiffrer le mot de passe RDP s'il est renseigné
         pwd_encrypted = encrypt_password(pwd_plain, MASTER_KEY) if pwd_plain else ""
 
-        new_row = [name_val, ip_val, login_val, "N/A", note_value, group_val, pwd_encrypted]
-        data = load_connections()
-        data.append(new_row)
-        save_connections(data)
+        profile_val = profile_from_label(profile_var.get()) if profile_var is not None else ""
+        reconnect_val = reconnect_var.get() if reconnect_var is not None else ""
+
+        new_row = [name_val, ip_val, login_val, "N/A", note_value, group_val, pwd_encrypted, new_connection_id(),
+                   profile_val, reconnect_val]
+        connection_store.add(new_row)
         messagebox.showinfo(t("info"), t("connection_added"), parent=top)
         top.destroy()
         self.refresh_table()
@@ -1094,7 +3984,7 @@ class RDPApp(tk.Tk):
         top.transient(self)
         top.iconphoto(False, self.logo)
         top.title(t("modify_connection_title"))
-        top.geometry("825x350")
+        top.geometry("825x440")
         top.configure(bg=self.theme["bg"])
         top.resizable(False, False)
 
@@ -1151,33 +4041,39 @@ class RDPApp(tk.Tk):
                               font=("Segoe Script", 10), bg=self.theme["button_bg"], fg=self.theme["button_fg"], relief="flat", width=1)
         btn_group.grid(row=0, column=1, padx=(5,0), sticky="w")
 
+        # Profil de performance
+        profile_var = self.create_profile_field(top, 5, original_row[8])
+
+        # Reconnexion automatique
+        reconnect_var = self.create_reconnect_field(top, 6, original_row[9])
+
         # Bouton "Modifier la note"
         btn_frame_top = tk.Frame(top, bg=self.theme["bg"])
-        btn_frame_top.grid(row=5, column=0, columnspan=2, pady=8)
+        btn_frame_top.grid(row=7, column=0, columnspan=2, pady=8)
         tk.Button(btn_frame_top, text=t("modify_note_title"), command=lambda: self.edit_connection_note(original_row),
                   font=("Segoe Script", 12), bg=self.theme["button_bg"], fg=self.theme["button_fg"], relief="flat", width=15).pack(side=tk.LEFT, padx=10)
 
         # Boutons Sauver / Retour
         btn_frame_bottom = tk.Frame(top, bg=self.theme["bg"])
-        btn_frame_bottom.grid(row=6, column=0, columnspan=2, pady=8)
-        tk.Button(btn_frame_bottom, text=t("save"), command=lambda: self.save_modification(top, e_name, e_ip, e_login, e_password, group_var, original_row),
+        btn_frame_bottom.grid(row=8, column=0, columnspan=2, pady=8)
+        tk.Button(btn_frame_bottom, text=t("save"), command=lambda: self.save_modification(top, e_name, e_ip, e_login, e_password, group_var, original_row, profile_var, reconnect_var),
                   font=("Segoe Script", 12), bg=self.theme["button_bg"], fg=self.theme["button_fg"], relief="flat", width=12).pack(side=tk.LEFT, padx=10, expand=True)
         tk.Button(btn_frame_bottom, text=t("return"), command=top.destroy,
                   font=("Segoe Script", 12), bg=self.theme["button_bg"], fg=self.theme["button_fg"], relief="flat", width=12).pack(side=tk.LEFT, padx=10, expand=True)
 
-    def save_modification(self, top, e_name, e_ip, e_login, e_password, group_var, original_row):
+    def save_modification(self, top, e_name, e_ip, e_login, e_password, group_var, original_row, profile_var=None,
+                          reconnect_var=None):
         new_name = e_name.get().strip() or original_row[0]
         new_ip = e_ip.get().strip() or original_row[1]
         new_login = e_login.get().strip() or original_row[2]
         new_group = group_var.get().strip() or original_row[5]
 
         if new_name != original_row[0]:
-            for r in load_connections():
-                if r[0] == new_name:
-                    messagebox.showerror(t("error"), t("error_duplicate_name", name=new_name), parent=top)
-                    return
+            if connection_store.find_by_name(new_name) is not None:
+                messagebox.showerror(t("error"), t("error_duplicate_name", name=new_name), parent=top)
+                return
         if new_ip != original_row[1]:
-            if any(r[1] == new_ip for r in load_connections()):
+            if any(r[1] == new_ip for r in connection_store.rows()):
                 if not messagebox.askyesno(t("warning"), t("warning_duplicate_ip", ip=new_ip), parent=top):
                     return
 
@@ -1187,14 +4083,12 @@ class RDPApp(tk.Tk):
         else:
             pwd_encrypted = original_row[6]
 
-        new_row = [new_name, new_ip, new_login, original_row[3], original_row[4], new_group, pwd_encrypted]
+        new_profile = profile_from_label(profile_var.get()) if profile_var is not None else original_row[8]
+        new_reconnect = reconnect_var.get() if reconnect_var is not None else original_row[9]
 
-        data = load_connections()
-        for i, r in enumerate(data):
-            if r == original_row:
-                data[i] = new_row
-                break
-        save_connections(data)
+        new_row = [new_name, new_ip, new_login, original_row[3], original_row[4], new_group, pwd_encrypted, original_row[7],
+                   new_profile, new_reconnect]
+        update_connection_by_value(original_row, new_row)
         messagebox.showinfo(t("info"), t("connection_modified"), parent=top)
         top.destroy()
         self.refresh_table()
@@ -1221,11 +4115,8 @@ class RDPApp(tk.Tk):
         def add_new_group():
             new_grp = simpledialog.askstring(t("add_group_option"), t("enter_new_group"), parent=top)
             if new_grp:
-                groups = get_existing_groups()
-                if new_grp not in groups:
-                    groups.append(new_grp)
-                    with open(GROUPS_FILE, "a", encoding="utf-8") as gf:
-                        gf.write(new_grp + "\n")
+                if new_grp not in get_existing_groups():
+                    connection_store.add_group(new_grp)
                     listbox.insert(tk.END, new_grp)
         def delete_selected():
             sel = listbox.curselection()
@@ -1254,7 +4145,7 @@ class RDPApp(tk.Tk):
         top.attributes("-topmost", True)
         top.iconphoto(False, self.logo)
         top.title(t("options"))
-        top.geometry("400x430")
+        top.geometry("400x520")
         top.configure(bg=self.theme["bg"])
         btn_frame = tk.Frame(top, bg=self.theme["bg"])
         btn_frame.pack(expand=True, fill=tk.BOTH, pady=10)
@@ -1266,7 +4157,11 @@ class RDPApp(tk.Tk):
                   font=self.font_main, bg=self.theme["button_bg"], fg=self.theme["button_fg"], relief="flat", width=30).pack(pady=5)
         tk.Button(btn_frame, text=t("delete_configuration_option"), command=lambda: [top.destroy(), self.delete_configuration()],
                   font=self.font_main, bg=self.theme["button_bg"], fg=self.theme["button_fg"], relief="flat", width=30).pack(pady=5)
-        tk.Button(btn_frame, text=t("update_option"), command=lambda: [top.destroy(), threading.Thread(target=check_for_update, args=(self, True), daemon=True).start()],
+        tk.Button(btn_frame, text=t("probe_all"), command=lambda: [top.destroy(), self.action_probe_all()],
+                  font=self.font_main, bg=self.theme["button_bg"], fg=self.theme["button_fg"], relief="flat", width=30).pack(pady=5)
+        tk.Button(btn_frame, text=t("update_option"), command=lambda: [top.destroy(), check_for_update(self, True)],
+                  font=self.font_main, bg=self.theme["button_bg"], fg=self.theme["button_fg"], relief="flat", width=30).pack(pady=5)
+        tk.Button(btn_frame, text=t("rollback_option"), command=lambda: [top.destroy(), rollback_app(self)],
                   font=self.font_main, bg=self.theme["button_bg"], fg=self.theme["button_fg"], relief="flat", width=30).pack(pady=5)
         tk.Button(btn_frame, text=t("support_option"), command=lambda: [top.destroy(), webbrowser.open("https://github.com/Equinoxx83/SwiftRDP/issues")],
                   font=self.font_main, bg=self.theme["button_bg"], fg=self.theme["button_fg"], relief="flat", width=30).pack(pady=5)
@@ -1372,7 +4267,7 @@ class RDPApp(tk.Tk):
             if messagebox.askyesno("Application par défaut", t("default_rdp_label"), parent=top):
                 with open(DEFAULT_RDP_FILE, "w", encoding="utf-8") as f:
                     f.write("yes")
-                subprocess.call(["xdg-mime", "default", "SwiftRDP.desktop", "x-scheme-handler/rdp"])
+                register_default_rdp(force=True)
                 messagebox.showinfo(t("info"), "SwiftRDP est désormais défini comme application RDP par défaut.", parent=top)
             else:
                 with open(DEFAULT_RDP_FILE, "w", encoding="utf-8") as f:
@@ -1434,21 +4329,18 @@ class RDPApp(tk.Tk):
 
             new_lang = lang_var.get()
             new_theme = theme_var.get()
-            changed = (new_lang != CURRENT_LANG) or (new_theme != CURRENT_THEME)
-            if changed or pwd_changed:
-                CURRENT_LANG = new_lang
-                CURRENT_THEME = new_theme
+            if pwd_changed:
+                messagebox.showinfo(t("info"), t("password_saved"), parent=top)
+            top.destroy()
+            # Appliqué à chaud : pas de redémarrage, la clé maître reste en mémoire
+            if new_lang != CURRENT_LANG:
                 with open(LANGUAGE_FILE, "w", encoding="utf-8") as f:
-                    f.write(CURRENT_LANG)
+                    f.write(new_lang)
+                self.set_language(new_lang)
+            if new_theme != CURRENT_THEME:
                 with open(THEME_FILE, "w", encoding="utf-8") as f:
-                    f.write(CURRENT_THEME)
-                messagebox.showinfo(t("info"), t("language_saved_restart"), parent=top)
-                top.destroy()
-                subprocess.Popen(["/bin/bash", os.path.join(PROJECT_DIR, "SwiftRDP.sh")])
-                self.destroy()
-                sys.exit(0)
-            else:
-                top.destroy()
+                    f.write(new_theme)
+                self.set_theme(new_theme)
 
         tk.Button(top, text=t("save"), command=save_preferences, font=self.font_main,
                   bg=self.theme["button_bg"], fg=self.theme["button_fg"], relief="flat", width=12).pack(pady=10)
@@ -1475,18 +4367,40 @@ class RDPApp(tk.Tk):
         zip_file = filedialog.askopenfilename(title=t("select_import_file"),
                                               filetypes=[("Fichiers Zip", "*.zip")], parent=self)
         self.tk.call('tk', 'scaling', 1.0)
-        if zip_file:
-            import_configuration_func(zip_file)
-            messagebox.showinfo(t("info"), t("configuration_imported"), parent=self)
-            self.refresh_table()
+        if not zip_file:
+            return
+        try:
+            preview = import_configuration_func(zip_file, mode="merge", dry_run=True)
+            mode = ask_import_mode(self, t("import_preview", added=preview["added"], duplicates=preview["duplicates"],
+                                           conflicts=len(preview["conflicts"]), existing=preview["existing"]))
+            if mode is None:
+                return
+            if mode == "replace":
+                replace = import_configuration_func(zip_file, mode="replace", dry_run=True)
+                question = t("import_replace_confirm", removed=replace["removed"], imported=replace["added"])
+                if not messagebox.askyesno(t("confirm"), question, parent=self, icon="warning", default=messagebox.NO):
+                    return
+            report = import_configuration_func(zip_file, mode=mode)
+        except (zipfile.BadZipFile, ValueError, UnicodeDecodeError) as e:
+            messagebox.showerror(t("error"), f"{t('import_invalid')}\n{e}", parent=self)
+            return
+        message = t("import_report", added=report["added"], duplicates=report["duplicates"],
+                    conflicts=len(report["conflicts"]))
+        if report["conflicts"]:
+            shown = report["conflicts"][:10]
+            message += "\n\n" + t("import_conflicts") + "\n" + "\n".join(shown)
+            if len(report["conflicts"]) > len(shown):
+                message += "\n..."
+        messagebox.showinfo(t("info"), message, parent=self)
+        self.refresh_table()
 
     def delete_configuration(self):
         conn_deleted = messagebox.askyesno(t("confirm"), t("delete_all_connections"), parent=self)
         if conn_deleted:
-            open(FILE_CONNS, "w", encoding="utf-8").close()
+            save_connections([])
         group_deleted = messagebox.askyesno(t("confirm"), t("delete_all_groups"), parent=self)
         if group_deleted:
-            open(GROUPS_FILE, "w", encoding="utf-8").close()
+            save_groups([])
             data = load_connections()
             for i, row in enumerate(data):
                 row[5] = ""
@@ -1498,26 +4412,6 @@ class RDPApp(tk.Tk):
             self.attributes("-topmost", False)
         self.refresh_table()
 
-    def update_SwiftRDP(self):
-        def progress_and_restart():
-            progress_win = tk.Toplevel(self)
-            progress_win.title(t("update_complete"))
-            progress_win.geometry("400x100")
-            progress_win.configure(bg=self.theme["bg"])
-            tk.Label(progress_win, text=t("update_in_progress_t"), font=self.font_main,
-                     bg=self.theme["bg"], fg=self.theme["fg"]).pack(pady=10)
-            pb = ttk.Progressbar(progress_win, mode="determinate", maximum=100)
-            pb.pack(fill=tk.X, padx=20, pady=10)
-            for i in range(101):
-                pb['value'] = i
-                progress_win.update()
-                time.sleep(0.1)
-            progress_win.destroy()
-            subprocess.Popen(["/bin/bash", os.path.join(PROJECT_DIR, "SwiftRDP.sh")])
-            self.destroy()
-            sys.exit(0)
-        threading.Thread(target=progress_and_restart, daemon=True).start()
-
     def support(self):
         webbrowser.open("https://github.com/Equinoxx83/SwiftRDP/issues")
 
@@ -1558,7 +4452,7 @@ class RDPApp(tk.Tk):
         if not ip or not login:
             messagebox.showerror(t("error"), "IP et Login sont requis pour une connexion.", parent=self)
             return
-        temp_row = [ip, ip, login, "N/A", "", "", ""]
+        temp_row = [ip, ip, login, "N/A", "", "", "", "", "", ""]
         self.connect_connection(temp_row, temporary=True)
 
     def show_patch_note_dialog(self, content, show_checkbox=True):
@@ -1593,11 +4487,7 @@ class RDPApp(tk.Tk):
     def add_group(self, parent, combobox, var):
         new_grp = simpledialog.askstring(t("new_group"), t("enter_new_group"), parent=parent)
         if new_grp:
-            groups = get_existing_groups()
-            if new_grp not in groups:
-                groups.append(new_grp)
-                with open(GROUPS_FILE, "a", encoding="utf-8") as gf:
-                    gf.write(new_grp + "\n")
+            groups = connection_store.add_group(new_grp)
             combobox["values"] = groups
             var.set(new_grp)
 
@@ -1608,7 +4498,7 @@ class RDPApp(tk.Tk):
         search_frame.pack(fill=tk.X, padx=15, pady=10)
         tk.Label(search_frame, text=t("search"), font=self.font_main, bg=self.theme["bg"], fg=self.theme["fg"]).pack(side=tk.LEFT)
         self.search_var = tk.StringVar()
-        self.search_var.trace("w", lambda *args: self.refresh_table())
+        self.search_var.trace("w", lambda *args: self.schedule_search())
         tk.Entry(search_frame, textvariable=self.search_var, font=self.font_main, bg=self.theme["entry_bg"],
                  fg=self.theme["fg"], insertbackground=self.theme["fg"], relief="flat").pack(side=tk.LEFT, fill=tk.X, expand=True, padx=10)
 
@@ -1634,8 +4524,9 @@ class RDPApp(tk.Tk):
                                bg=self.theme["entry_bg"], fg=self.theme["fg"], relief="flat", width=35)
         login_entry.grid(row=0, column=4, padx=5, pady=5, sticky="w")
 
-        columns = ("IP", "Login", "Dernière connexion", "Note")
-        self.tree = ttk.Treeview(self, style="My.Treeview", columns=columns, show="tree headings", selectmode="browse")
+        columns = ("IP", "Login", "Dernière connexion", "Note", "Statut")
+        self.tree = ttk.Treeview(self, style="My.Treeview", columns=columns, show="tree headings", selectmode="extended")
+        self.table = TreeReconciler(self.tree)
         self.tree.bind("<Motion>", self.on_tree_motion)
         self.tree.bind("<Leave>", lambda e: self.hide_note_tooltip())
         self.tree.heading("#0", text="Nom")
@@ -1648,13 +4539,19 @@ class RDPApp(tk.Tk):
         self.tree.column("Dernière connexion", width=200)
         self.tree.heading("Note", text="Note")
         self.tree.column("Note", width=300)
+        self.tree.heading("Statut", text="Statut")
+        self.tree.column("Statut", width=150)
         self.tree.pack(fill=tk.BOTH, expand=True, padx=15, pady=10)
         self.tree.bind("<Button-3>", lambda event: show_context_menu(self, event))
+        self.tree.bind("<<TreeviewOpen>>", self.on_tree_open)
+        self.tree.bind("<<TreeviewClose>>", lambda e: self.table.set_open(self.tree.focus(), False))
+        self.tree.configure(yscrollcommand=self.on_tree_scroll)
 
         btn_frame = tk.Frame(self, bg=self.theme["bg"])
         btn_frame.pack(fill=tk.X, padx=15, pady=10)
-        btn_texts = [t("connect"), t("add"), t("modify"), t("delete"), t("manage_groups"), t("options")]
-        btn_commands = [self.action_connect, self.action_add, self.action_modify, self.action_delete, self.manage_groups, self.options_menu]
+        btn_texts = [t("connect"), t("add"), t("modify"), t("delete"), t("manage_groups"), t("sessions"), t("options")]
+        btn_commands = [self.action_connect, self.action_add, self.action_modify, self.action_delete, self.manage_groups,
+                        self.show_sessions_panel, self.options_menu]
         for i, (txt, cmd) in enumerate(zip(btn_texts, btn_commands)):
             tk.Button(btn_frame, text=txt, command=cmd, font=self.font_main,
                       bg=self.theme["button_bg"], fg=self.theme["button_fg"], relief="flat").grid(row=0, column=i, padx=10, sticky="ew")
@@ -1664,17 +4561,57 @@ class RDPApp(tk.Tk):
     def refresh_table(self):
         refresh_table_global(self)
 
+    def on_tree_open(self, event):
+        iid = self.tree.focus()
+        self.table.set_open(iid, True)
+        if self.lazy_mode and not self.lazy_loaded.get(iid):
+            self.lazy_loaded[iid] = LAZY_CHUNK
+            self.refresh_table()
+
+    def load_more(self, more_iid):
+        g_iid = group_iid(more_iid[len("more:"):])
+        self.lazy_loaded[g_iid] = self.lazy_loaded.get(g_iid, 0) + LAZY_CHUNK
+        self.refresh_table()
+
+    def on_tree_scroll(self, first, last):
+        # Près du bas de la liste : charger la suite des groupes dont la ligne "..." est visible
+        if self.lazy_mode and float(last) > 0.9 and not self._lazy_check_pending:
+            self._lazy_check_pending = True
+            self.after_idle(self.load_visible_chunks)
+
+    def load_visible_chunks(self):
+        self._lazy_check_pending = False
+        grown = False
+        for g_iid in self.table.opened:
+            more_iid = lazy_more_iid(g_iid[len("grp:"):])
+            if more_iid in self.table.items and self.tree.bbox(more_iid):
+                self.lazy_loaded[g_iid] = self.lazy_loaded.get(g_iid, 0) + LAZY_CHUNK
+                grown = True
+        if grown:
+            self.refresh_table()
+
+    def schedule_search(self):
+        # Anti-rebond : la recherche ne part qu'après une courte pause dans la frappe
+        if self._search_after is not None:
+            self.after_cancel(self._search_after)
+        self._search_after = self.after(SEARCH_DEBOUNCE_MS, self.run_search)
+
+    def run_search(self):
+        self._search_after = None
+        query = self.search_var.get().strip()
+        if not query:
+            self.refresh_table()
+            return
+        self.search.submit(query, lambda: self.after(0, self.refresh_table))
+
     def get_selected_row(self):
         sel = self.tree.selection()
         if not sel:
             messagebox.showinfo(t("info"), t("select_connection"), parent=self)
             return None
-        item = self.tree.item(sel[0])
-        if item.get("values"):
-            full_data = load_connections()
-            for row in full_data:
-                if row[0] == item["text"]:
-                    return row
+        row = get_connection(sel[0])
+        if row is not None:
+            return row
         else:
             messagebox.showinfo(t("info"), "Veuillez sélectionner une connexion (pas un groupe).", parent=self)
             return None
@@ -1696,13 +4633,217 @@ class RDPApp(tk.Tk):
                 return
             self.modify_connection(row)
 
+    def get_selected_rows(self):
+        """
+        Connexions sélectionnées ; un groupe sélectionné apporte toutes ses connexions
+        (y compris celles pas encore affichées en mode paresseux).
+        """
+        selection = self.tree.selection()
+        groups = {iid[len("grp:"):] for iid in selection if iid.startswith("grp:")}
+        rows = []
+        seen = set()
+        if groups:
+            for row in visible_rows(self):
+                if (row[5] or "Sans groupe") in groups and row[7] not in seen:
+                    seen.add(row[7])
+                    rows.append(row.copy())
+        for iid in selection:
+            row = connection_store.get(iid)
+            if row is not None and row[7] not in seen:
+                seen.add(row[7])
+                rows.append(row.copy())
+        return rows
+
+    def _is_multi_selection(self):
+        selection = self.tree.selection()
+        return len(selection) > 1 or any(iid.startswith("grp:") for iid in selection)
+
     def action_delete(self):
+        if self._is_multi_selection():
+            rows = self.get_selected_rows()
+            if rows and messagebox.askyesno(t("confirm"), t("bulk_delete_confirm", count=len(rows)), parent=self):
+                connection_store.bulk_delete([row[7] for row in rows])
+                self.refresh_table()
+                messagebox.showinfo(t("info"), t("bulk_deleted", count=len(rows)), parent=self)
+            return
         row = self.get_selected_row()
         if row and messagebox.askyesno(t("confirm"), f"{t('delete_connection')} {row[0]} ?", parent=self):
-            delete_connection((row[0], row[5]))
+            delete_connection(row[7])
             messagebox.showinfo(t("info"), t("connection_deleted"), parent=self)
             self.refresh_table()
 
+    def bulk_update_selection(self, transform):
+        rows = self.get_selected_rows()
+        if not rows:
+            messagebox.showinfo(t("info"), t("select_connection"), parent=self)
+            return
+        connection_store.bulk_update([row[7] for row in rows], transform)
+        self.refresh_table()
+        messagebox.showinfo(t("info"), t("bulk_updated", count=len(rows)), parent=self)
+
+    def action_bulk_move_group(self):
+        grp = ask_group_selection(get_existing_groups(), parent=self)
+        if grp is None:
+            return
+        if grp:
+            connection_store.add_group(grp)
+        def move(row):
+            row[5] = grp
+            return row
+        self.bulk_update_selection(move)
+
+    def action_bulk_set_login(self):
+        login = simpledialog.askstring(t("set_login"), t("login"), parent=self)
+        if not login or not login.strip():
+            return
+        def set_login(row):
+            row[2] = login.strip()
+            return row
+        self.bulk_update_selection(set_login)
+
+    def action_bulk_set_profile(self):
+        profile = ask_profile_selection(parent=self)
+        if profile is None:
+            return
+        def set_profile(row):
+            row[8] = profile
+            return row
+        self.bulk_update_selection(set_profile)
+
+    def action_bulk_clear_password(self):
+        rows = self.get_selected_rows()
+        if rows and messagebox.askyesno(t("confirm"), t("clear_password_confirm", count=len(rows)), parent=self):
+            def clear(row):
+                row[6] = ""
+                return row
+            self.bulk_update_selection(clear)
+
+    def action_connect_all(self):
+        rows = self.get_selected_rows()
+        if rows:
+            self.connect_batch(rows)
+
+    def resolve_batch_credentials(self, rows):
+        """
+        Identifiants de tout un lot, demandés avant le premier lancement : un seul choix
+        par liste de logins et une seule saisie par login sans mot de passe enregistré.
+        Retourne les tâches du lot ; celles sans mot de passe sont déjà en échec.
+        """
+        chosen_logins = {}
+        typed_passwords = {}
+        jobs = []
+        for row in rows:
+            login = row[2]
+            available_logins = [u.strip() for u in row[2].split(',') if u.strip()]
+            if len(available_logins) > 1:
+                key = tuple(available_logins)
+                if key not in chosen_logins:
+                    chosen_logins[key] = ask_login_selection(available_logins, parent=self)
+                login = chosen_logins[key]
+            if row[6]:
+                pwd = decrypt_password(row[6], MASTER_KEY)
+            else:
+                if login not in typed_passwords:
+                    typed_passwords[login] = simpledialog.askstring(
+                        t("password"),
+                        f"{t('enter_password_for')} {login}:",
+                        show="*",
+                        parent=self
+                    )
+                pwd = typed_passwords[login]
+            job = {"row": row, "login": login, "pwd": pwd}
+            if not pwd:
+                job.update(state="failed", reason="no_password")
+            jobs.append(job)
+        return jobs
+
+    def connect_batch(self, rows):
+        """Ouvre plusieurs connexions via la file de lancement (sessions déjà ouvertes exceptées)."""
+        rows = [row for row in rows if not any(self.supervisor.find(row[7], login)
+                                               for login in connection_logins(row))]
+        if not rows:
+            return
+        jobs = self.resolve_batch_credentials(rows)
+        self.show_launch_progress()
+        self.launcher.submit(jobs)
+
+    def _launch_job(self, job, done):
+        self.launch_session(job["row"], job["login"], job["pwd"], on_result=done)
+
+    def show_launch_progress(self):
+        """Vue unique de la progression des lancements groupés."""
+        if self._launch_view is not None and self._launch_view["win"].winfo_exists():
+            self._launch_view["win"].lift()
+            return
+        win = tk.Toplevel(self)
+        win.iconphoto(False, self.logo)
+        win.title(t("launch_queue"))
+        win.geometry("700x400")
+        win.configure(bg=self.theme["bg"])
+        label = tk.Label(win, font=self.font_main, bg=self.theme["bg"], fg=self.theme["fg"])
+        label.pack(pady=(10, 0))
+        pb = ttk.Progressbar(win, mode="determinate", style="grey.Horizontal.TProgressbar")
+        pb.pack(fill=tk.X, padx=20, pady=10)
+        tree = ttk.Treeview(win, style="My.Treeview", columns=("state", "detail"), show="tree headings")
+        tree.heading("#0", text="Nom")
+        tree.column("#0", width=200)
+        tree.heading("state", text=t("launch_state"))
+        tree.column("state", width=120)
+        tree.heading("detail", text=t("launch_detail"))
+        tree.column("detail", width=340)
+        tree.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 10))
+
+        def on_close():
+            self.launcher.clear_finished()
+            win.destroy()
+        win.protocol("WM_DELETE_WINDOW", on_close)
+        self._launch_view = {"win": win, "tree": tree, "pb": pb, "label": label}
+        for job in self.launcher.jobs:
+            self.update_launch_progress(job)
+
+    def update_launch_progress(self, job):
+        view = self._launch_view
+        if view is None or not view["win"].winfo_exists():
+            return
+        iid = str(id(job))
+        detail = t(job["reason"]) if job["reason"] else ""
+        if job["detail"]:
+            detail = f"{detail} ({job['detail']})" if detail else job["detail"]
+        values = (t("launch_" + job["state"]), detail)
+        if view["tree"].exists(iid):
+            view["tree"].item(iid, values=values)
+        else:
+            view["tree"].insert("", "end", iid=iid, text=job["row"][0] or job["row"][1], values=values)
+        counts = self.launcher.counts()
+        view["pb"]["maximum"] = max(1, len(self.launcher.jobs))
+        view["pb"]["value"] = counts["connected"] + counts["failed"]
+        view["label"].config(text=t("launch_summary", connected=counts["connected"], failed=counts["failed"],
+                                    pending=counts["queued"] + counts["launching"]))
+
+    def probe_rows(self, rows):
+        """Sonde en arrière-plan la disponibilité des connexions données."""
+        addresses = [address for row in rows for address in connection_addresses(row[1])]
+        prober.pending.update(addresses)
+        self.refresh_table()
+        prober.probe_in_background(addresses, force=True,
+                                   on_result=lambda address, result: self.after(0, self.schedule_probe_refresh),
+                                   on_done=lambda results: self.after(0, self.schedule_probe_refresh))
+
+    def schedule_probe_refresh(self):
+        # Un seul rafraîchissement par intervalle, quel que soit le nombre de résultats reçus
+        if self._probe_refresh is None:
+            self._probe_refresh = self.after(PROBE_REFRESH_MS, self._apply_probe_results)
+
+    def _apply_probe_results(self):
+        self._probe_refresh = None
+        self.refresh_table()
+
+    def action_probe(self):
+        self.probe_rows(self.get_selected_rows())
+
+    def action_probe_all(self):
+        self.probe_rows(connection_store.rows())
+
     def edit_connection_note(self, row):
         if window_exists(self, t("modify_note_title")):
             return
@@ -1779,14 +4920,32 @@ def read_patch_note():
 def show_context_menu(app, event):
     iid = app.tree.identify_row(event.y)
     if iid:
-        app.tree.selection_set(iid)
+        if iid not in app.tree.selection():
+            app.tree.selection_set(iid)
+        selection = app.tree.selection()
+        if len(selection) > 1 or iid.startswith("grp:"):
+            # Sélection multiple ou groupe : opérations groupées
+            menu = tk.Menu(app, tearoff=0)
+            menu.add_command(label=t("connect_all"), command=app.action_connect_all)
+            menu.add_command(label=t("probe"), command=app.action_probe)
+            menu.add_command(label=t("move_to_group"), command=app.action_bulk_move_group)
+            menu.add_command(label=t("set_login"), command=app.action_bulk_set_login)
+            menu.add_command(label=t("set_profile"), command=app.action_bulk_set_profile)
+            menu.add_command(label=t("clear_password"), command=app.action_bulk_clear_password)
+            menu.add_command(label=t("delete"), command=app.action_delete)
+            menu.tk_popup(event.x_root, event.y_root)
+            return
         item = app.tree.item(iid)
         if item.get("values"):
             menu = tk.Menu(app, tearoff=0)
             menu.add_command(label=t("connect"), command=lambda: app.connect_connection(app.get_selected_row()))
+            menu.add_command(label=t("new_session"),
+                             command=lambda: app.connect_connection(app.get_selected_row(), force_new=True))
             menu.add_command(label=t("modify"), command=app.action_modify)
             menu.add_command(label=t("delete"), command=app.action_delete)
             menu.add_command(label=t("modify_note_title"), command=lambda: app.edit_connection_note(app.get_selected_row()))
+            menu.add_command(label=t("session_log"), command=app.action_session_log)
+            menu.add_command(label=t("probe"), command=app.action_probe)
             menu.tk_popup(event.x_root, event.y_root)
     return
 
@@ -1815,19 +4974,30 @@ def send_link_to_existing_instance(link):
 # Main
 ######################################
 if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if a != "--profile-startup"]
+    link = args[0] if args and args[0].startswith("rdp://") else None
     # Si une instance est déjà lancée et qu'un lien RDP est fourni, on l'envoie à l'instance existante, puis on quitte.
-    if is_instance_running() and len(sys.argv) > 1 and sys.argv[1].startswith("rdp://"):
-        send_link_to_existing_instance(sys.argv[1])
+    if link and is_instance_running():
+        send_link_to_existing_instance(link)
         sys.exit(0)
 
+    # Cas normal : un simple accès au dossier ; réparation (et sudo) seulement s'il le faut
+    if not config_dir_ready():
+        check_and_fix_permissions()
     app = RDPApp()
+    startup_profiler.mark("first_table_paint")
     threading.Thread(target=socket_listener, args=(app,), daemon=True).start()
     app.withdraw()
     if not check_password(app):
         sys.exit(1)
+    startup_profiler.mark("password_prompt")
     app.deiconify()
-    if len(sys.argv) > 1 and sys.argv[1].startswith("rdp://"):
-        ip = sys.argv[1][len("rdp://"):]
+    app.update_idletasks()
+    startup_profiler.mark("first_paint")
+    startup_profiler.write(STARTUP_LOG_FILE)
+    setup_default_rdp(app)
+    if link:
+        ip = link[len("rdp://"):]
         app.after(100, lambda: app.handle_rdp_link(ip))
     app.after(2000, lambda: check_for_update(app))
     app.mainloop()
@@ -0,0 +1,109 @@
+import pytest
+
+import SwiftRDP_app as app
+
+
+def make_row(name, ip, group=""):
+    return [name, ip, "admin", "", "", group, "", "", "", ""]
+
+
+def set_group(row):
+    row[5] = "prod"
+    return row
+
+
+@pytest.fixture
+def text_store(tmp_path, monkeypatch):
+    store = app.ConnectionStore(str(tmp_path / "connexions.txt"), str(tmp_path / "groups.txt"),
+                                str(tmp_path / "connexions.journal"))
+    store.save([make_row(f"srv{n}", f"10.0.0.{n}") for n in range(50)])
+    writes = []
+    write = store._write_atomic
+    monkeypatch.setattr(store, "_write_atomic", lambda path, lines: (writes.append(path), write(path, lines)))
+    return store, writes
+
+
+def test_text_bulk_update_writes_once(text_store):
+    store, writes = text_store
+    ids = [row[7] for row in store.rows()[:20]]
+    version = store.version
+    store.bulk_update(ids, set_group)
+    assert writes.count(store.conns_path) == 1
+    assert store.version == version + 1
+    rows = store.rows()
+    assert [row[7] for row in rows[:20]] == ids
+    assert all(row[5] == "prod" for row in rows[:20])
+    assert all(row[5] == "" for row in rows[20:])
+
+
+def test_text_bulk_delete_writes_once(text_store):
+    store, writes = text_store
+    ids = [row[7] for row in store.rows()[::2]]
+    store.bulk_delete(ids)
+    assert writes.count(store.conns_path) == 1
+    assert [row[0] for row in store.rows()] == [f"srv{n}" for n in range(1, 50, 2)]
+
+
+@pytest.fixture
+def sqlite_store(tmp_path):
+    store = app.SQLiteConnectionStore(str(tmp_path / "connexions.db"), str(tmp_path / "connexions.txt"),
+                                      str(tmp_path / "groups.txt"))
+    for n in range(50):
+        store.add(make_row(f"srv{n}", f"10.0.0.{n}"))
+    statements = []
+    store._db.set_trace_callback(statements.append)
+    return store, statements
+
+
+def test_sqlite_bulk_update_single_transaction(sqlite_store):
+    store, statements = sqlite_store
+    ids = [row[7] for row in store.rows()[:20]]
+    store.bulk_update(ids, set_group)
+    assert statements.count("COMMIT") == 1
+    assert sum(1 for row in store.rows() if row[5] == "prod") == 20
+
+
+def test_sqlite_bulk_delete_single_transaction(sqlite_store):
+    store, statements = sqlite_store
+    store.bulk_delete([row[7] for row in store.rows()[:20]])
+    assert statements.count("COMMIT") == 1
+    assert len(store.rows()) == 30
+
+
+class FakeApp:
+    """Sélection multiple et rafraîchissements comptés, à la place de RDPApp."""
+    def __init__(self, rows):
+        self.rows = rows
+        self.refreshes = 0
+
+    def get_selected_rows(self):
+        return self.rows
+
+    def _is_multi_selection(self):
+        return True
+
+    def refresh_table(self):
+        self.refreshes += 1
+
+
+@pytest.fixture
+def dialogs(monkeypatch):
+    shown = []
+    monkeypatch.setattr(app.messagebox, "showinfo", lambda *args, **kwargs: shown.append(args))
+    monkeypatch.setattr(app.messagebox, "askyesno", lambda *args, **kwargs: True)
+    return shown
+
+
+def test_bulk_actions_refresh_once(text_store, dialogs, monkeypatch):
+    store, writes = text_store
+    monkeypatch.setattr(app, "connection_store", store)
+    fake = FakeApp([row.copy() for row in store.rows()[:10]])
+    app.RDPApp.bulk_update_selection(fake, set_group)
+    assert fake.refreshes == 1
+    assert writes.count(store.conns_path) == 1
+
+    app.RDPApp.action_delete(fake)
+    assert fake.refreshes == 2
+    assert writes.count(store.conns_path) == 2
+    assert len(store.rows()) == 40
+    assert len(dialogs) == 2
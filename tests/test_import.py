@@ -0,0 +1,81 @@
+import zipfile
+
+import pytest
+
+import SwiftRDP_app as app
+
+
+def make_row(name, ip, login="admin", note=""):
+    return [name, ip, login, "", note, "", "", "", "", ""]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = app.ConnectionStore(str(tmp_path / "connexions.txt"), str(tmp_path / "groups.txt"))
+    monkeypatch.setattr(app, "connection_store", store)
+    return store
+
+
+def make_archive(path, members):
+    with zipfile.ZipFile(path, "w") as zipf:
+        for name, content in members.items():
+            zipf.writestr(name, content)
+    return str(path)
+
+
+def lines(*rows):
+    return "".join(app.format_connection_line(row) for row in rows)
+
+
+def test_oversize_member_is_rejected(tmp_path, store, monkeypatch):
+    monkeypatch.setattr(app, "IMPORT_MAX_MEMBER_SIZE", 1024)
+    archive = make_archive(tmp_path / "big.zip",
+                           {"connexions.txt": lines(*[make_row(f"srv{i}", f"10.0.0.{i}") for i in range(100)])})
+    with pytest.raises(ValueError):
+        app.import_configuration_func(archive, mode="merge")
+    assert store.rows() == []
+
+
+def test_only_root_members_are_read(tmp_path, store):
+    archive = make_archive(tmp_path / "nested.zip", {
+        "sub/connexions.txt": lines(make_row("nested", "10.0.0.1")),
+        "../connexions.txt": lines(make_row("escape", "10.0.0.2")),
+        "sub/groups.txt": "grp\n",
+    })
+    with pytest.raises(ValueError):
+        app.import_configuration_func(archive, mode="merge")
+    archive = make_archive(tmp_path / "mixed.zip", {
+        "sub/connexions.txt": lines(make_row("nested", "10.0.0.1")),
+        "connexions.txt": lines(make_row("root", "10.0.0.3")),
+    })
+    app.import_configuration_func(archive, mode="merge")
+    assert [row[0] for row in store.rows()] == ["root"]
+
+
+def test_merge_dedupes_by_name_ip_login(tmp_path, store):
+    store.save([make_row("srv", "10.0.0.1", note="local note")])
+    archive = make_archive(tmp_path / "dupes.zip", {"connexions.txt": lines(
+        make_row("srv", "10.0.0.1", note="other note"),     # même nom + IP + login : doublon
+        make_row("srv", "10.0.0.9"),                         # même nom, autre IP : conflit
+        make_row("new", "10.0.0.2"),
+        make_row("new", "10.0.0.2"),                         # doublon dans l'archive
+        make_row("other-login", "10.0.0.1", login="root"),
+    )})
+    preview = app.import_configuration_func(archive, mode="dry-run")
+    assert (preview["added"], preview["duplicates"], preview["conflicts"]) == (2, 2, ["srv"])
+    assert len(store.rows()) == 1
+    report = app.import_configuration_func(archive, mode="merge")
+    assert report["added"] == 2
+    assert sorted(row[0] for row in store.rows()) == ["new", "other-login", "srv"]
+    assert store.find_by_name("srv")[4] == "local note"
+
+
+def test_replace_preview_reports_removed_connections(tmp_path, store):
+    store.save([make_row("a", "10.0.0.1"), make_row("b", "10.0.0.2")])
+    archive = make_archive(tmp_path / "replace.zip", {"connexions.txt": lines(make_row("c", "10.0.0.3"))})
+    preview = app.import_configuration_func(archive, mode="replace", dry_run=True)
+    assert (preview["removed"], preview["added"]) == (2, 1)
+    assert len(store.rows()) == 2
+    assert app.import_configuration_func(archive, mode="merge", dry_run=True)["removed"] == 0
+    app.import_configuration_func(archive, mode="replace")
+    assert [row[0] for row in store.rows()] == ["c"]
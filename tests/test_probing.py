@@ -0,0 +1,175 @@
+import asyncio
+import socket
+import threading
+
+import pytest
+
+import SwiftRDP_app as app
+
+
+@pytest.fixture
+def listener():
+    """Port local qui accepte les connexions TCP."""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(16)
+    yield f"127.0.0.1:{sock.getsockname()[1]}"
+    sock.close()
+
+
+@pytest.fixture
+def closed_port():
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    address = f"127.0.0.1:{sock.getsockname()[1]}"
+    sock.close()
+    return address
+
+
+def x224_server(reply):
+    """Serveur local qui lit une X.224 Connection Request et répond 'reply'."""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(1)
+
+    def serve():
+        conn, _ = sock.accept()
+        with conn:
+            conn.recv(len(app.X224_CONNECTION_REQUEST))
+            conn.sendall(reply)
+        sock.close()
+    threading.Thread(target=serve, daemon=True).start()
+    return f"127.0.0.1:{sock.getsockname()[1]}"
+
+
+def test_probe_tcp_ok(listener):
+    result = app.ReachabilityProber(timeout=2).probe([listener])[listener]
+    assert result["ok"]
+    assert result["rtt"] is not None
+
+
+def test_probe_connection_refused(closed_port):
+    result = app.ReachabilityProber(timeout=2).probe([closed_port])[closed_port]
+    assert not result["ok"]
+    assert result["error"] == "connect_failed"
+
+
+def test_probe_dns_failure():
+    result = app.ReachabilityProber(timeout=2).probe(["host.invalid"])["host.invalid"]
+    assert not result["ok"]
+    assert result["error"] == "dns_failed"
+
+
+def test_probe_x224_handshake():
+    confirm = bytes.fromhex("0300000b06d00000123400")
+    address = x224_server(confirm)
+    assert app.ReachabilityProber(timeout=2, x224=True).probe([address])[address]["ok"]
+
+
+def test_probe_x224_rejects_non_rdp_service():
+    address = x224_server(b"SSH-2.0-OpenSSH\r\n")
+    result = app.ReachabilityProber(timeout=2, x224=True).probe([address])[address]
+    assert not result["ok"]
+    assert result["error"] == "not_rdp"
+
+
+def test_probe_rtt_excludes_dns_resolution(listener, monkeypatch):
+    getaddrinfo = asyncio.BaseEventLoop.getaddrinfo
+
+    async def slow_getaddrinfo(self, *args, **kwargs):
+        await asyncio.sleep(0.5)
+        return await getaddrinfo(self, *args, **kwargs)
+    monkeypatch.setattr(asyncio.BaseEventLoop, "getaddrinfo", slow_getaddrinfo)
+    address = listener.replace("127.0.0.1", "localhost")
+    result = app.ReachabilityProber(timeout=2).probe([address])[address]
+    assert result["ok"]
+    assert result["rtt"] < 400
+
+
+def test_race_remembers_winner(tmp_path, listener, closed_port):
+    path = str(tmp_path / "last_addresses.conf")
+    selector = app.AddressSelector(path, stagger=0.05, timeout=2)
+    assert selector.race("conn1", [closed_port, listener]) == listener
+    reloaded = app.AddressSelector(path)
+    assert reloaded.ordered("conn1", [closed_port, listener]) == [listener, closed_port]
+
+
+def test_race_without_answer(closed_port):
+    selector = app.AddressSelector("/nonexistent/last_addresses.conf", stagger=0.05, timeout=1)
+    assert selector.race("", [closed_port]) is None
+
+
+class FakeApp:
+    """Remplace RDPApp pour launch_session : after() immédiat, xfreerdp simulé."""
+    def __init__(self):
+        self.supervisor = self
+        self.started = []
+        self.terminated = []
+        self.ready = threading.Semaphore(0)
+
+    def check_limits(self):
+        return None
+
+    def terminate(self, session):
+        self.terminated.append(session)
+
+    def after(self, delay, callback, *args):
+        callback(*args)
+
+    def _start_session(self, row, login, pwd, on_result, temporary, address, profile, rtt=None, notes=()):
+        self.started.append((address, on_result, list(notes)))
+        self.ready.release()
+        return address
+
+
+@pytest.fixture
+def failover(tmp_path, monkeypatch, listener):
+    """Connexion à deux adresses joignables, la première étant la gagnante retenue."""
+    other = socket.socket()
+    other.bind(("127.0.0.1", 0))
+    other.listen(16)
+    second = f"127.0.0.1:{other.getsockname()[1]}"
+    selector = app.AddressSelector(str(tmp_path / "last_addresses.conf"), stagger=0.05, timeout=2)
+    selector._remember("conn1", listener)
+    monkeypatch.setattr(app, "address_selector", selector)
+    fake = FakeApp()
+    results = []
+    row = ["srv", f"{listener}, {second}", "admin", "", "", "", "", "conn1", "", ""]
+    app.RDPApp.launch_session(fake, row, "admin", "pwd", on_result=lambda *r: results.append(r))
+    assert fake.ready.acquire(timeout=5)
+    yield fake, selector, results, listener, second
+    other.close()
+
+
+def test_failover_after_tls_failure(failover):
+    fake, selector, results, first, second = failover
+    address, finish, _ = fake.started[0]
+    assert address == first
+    finish(False, "tls_failed", "ERRCONNECT_TLS_CONNECT_FAILED")
+    assert fake.ready.acquire(timeout=5)
+    address, finish, notes = fake.started[1]
+    assert address == second
+    assert fake.terminated == [first]
+    assert first in notes[0]
+    assert results == []
+    finish(True, None, "")
+    assert results == [(True, None, "")]
+    assert selector.ordered("conn1", [first, second]) == [second, first]
+
+
+def test_auth_failure_forgets_winner_without_failover(failover):
+    fake, selector, results, first, second = failover
+    fake.started[0][1](False, "auth_failed", "ERRCONNECT_LOGON_FAILURE")
+    assert len(fake.started) == 1
+    assert results == [(False, "auth_failed", "ERRCONNECT_LOGON_FAILURE")]
+    assert selector._winners == {}
+    assert app.AddressSelector(selector.path)._winners == {}
+
+
+def test_failover_exhausted(failover):
+    fake, selector, results, first, second = failover
+    fake.started[0][1](False, "connection_timeout", "")
+    assert fake.ready.acquire(timeout=5)
+    fake.started[1][1](False, "connect_failed", "Connection refused")
+    assert len(fake.started) == 2
+    assert results == [(False, "connect_failed", "Connection refused")]
@@ -0,0 +1,57 @@
+import threading
+
+import SwiftRDP_app as app
+
+
+def make_rows(n):
+    return [[f"srv{i}", f"10.0.{i // 256}.{i % 256}", "admin", "", "", "prod", "", f"id{i}", "", ""]
+            for i in range(n)]
+
+
+def test_index_resync_only_reindexes_changed_rows(monkeypatch):
+    index = app.SearchIndex()
+    rows = make_rows(1000)
+    assert len(index.search("srv99", rows, 1)) == 11
+    calls = []
+    haystack = app.SearchIndex.haystack
+    monkeypatch.setattr(app.SearchIndex, "haystack", staticmethod(lambda row: calls.append(row) or haystack(row)))
+    # Suppression en tête : toutes les lignes suivantes changent de place
+    edited = rows[500].copy()
+    edited[0] = "renamed"
+    rows = rows[1:500] + [edited] + rows[501:]
+    assert [row[0] for row in index.search("renamed", rows, 2)] == ["renamed"]
+    assert calls == [edited]
+
+
+def test_engine_results_never_search_on_caller_thread(monkeypatch):
+    rows = make_rows(50)
+    store = type("Store", (), {"version": 1, "rows": lambda self: rows})()
+    monkeypatch.setattr(app, "connection_store", store)
+    engine = app.SearchEngine()
+    done = threading.Event()
+    # Aucun résultat encore : rien n'est calculé sur place, la recherche part en arrière-plan
+    assert engine.results("srv4", 1, done.set) is None
+    assert done.wait(5)
+    assert [row[0] for row in engine.results("srv4", 1, done.set)] == ["srv4"] + [f"srv{i}" for i in range(40, 50)]
+    # Connexions modifiées : l'ancien résultat est rendu en attendant le nouveau
+    done.clear()
+    store.version = 2
+    stale = engine.results("srv4", 2, done.set)
+    assert len(stale) == 11
+    assert done.wait(5)
+
+
+def test_visible_rows_keeps_table_until_first_result(monkeypatch):
+    rows = make_rows(20)
+    store = type("Store", (), {"version": 1, "rows": lambda self: rows})()
+    monkeypatch.setattr(app, "connection_store", store)
+    done = threading.Event()
+    fake_app = type("App", (), {})()
+    fake_app.search = app.SearchEngine()
+    fake_app.search_var = type("Var", (), {"get": lambda self: "srv1"})()
+    fake_app.after = lambda delay, callback: (callback(), done.set())
+    fake_app.refresh_table = lambda: None
+    # Aucun résultat encore : la liste complète reste affichée, pas un tableau vide
+    assert app.visible_rows(fake_app) is rows
+    assert done.wait(5)
+    assert [row[0] for row in app.visible_rows(fake_app)] == ["srv1"] + [f"srv{i}" for i in range(10, 20)]
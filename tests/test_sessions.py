@@ -0,0 +1,156 @@
+import pytest
+
+import SwiftRDP_app as app
+
+
+def test_scheduler_synchronous_failures_do_not_recurse():
+    def launch(job, done):
+        done(False, "session_limit", "")
+
+    scheduler = app.LaunchScheduler(launch, concurrency=4)
+    scheduler.submit([{"row": None, "login": "u", "pwd": "p"} for _ in range(5000)])
+    assert scheduler.counts() == {"queued": 0, "launching": 0, "connected": 0, "failed": 5000}
+
+
+def test_scheduler_caps_concurrency():
+    pending = []
+    scheduler = app.LaunchScheduler(lambda job, done: pending.append(done), concurrency=3)
+    scheduler.submit([{"row": None, "login": "u", "pwd": "p"} for _ in range(10)])
+    assert scheduler.counts()["launching"] == 3
+    pending.pop(0)(True, None, "")
+    assert scheduler.counts() == {"queued": 6, "launching": 3, "connected": 1, "failed": 0}
+
+
+class FakeProc:
+    def __init__(self, pid):
+        self.pid = pid
+
+
+class FakeSession:
+    def __init__(self, pid, conn_id="", login="u"):
+        self.proc = FakeProc(pid)
+        self.conn_id = conn_id
+        self.login = login
+        self.running = True
+        self.state = "connected"
+        self.rss = None
+        self.cpu = None
+        self.exit_callbacks = []
+
+    def on_exit(self, callback):
+        self.exit_callbacks.append(callback)
+
+    def end(self):
+        self.running = False
+        for callback in self.exit_callbacks:
+            callback(self)
+
+
+def write_proc(root, pid, rss_pages, utime, stime):
+    pid_dir = root / str(pid)
+    pid_dir.mkdir(parents=True, exist_ok=True)
+    (pid_dir / "statm").write_text(f"50000 {rss_pages} 300 10 0 2000 0\n")
+    # Nom de programme avec espaces et parenthèses : seul le dernier ")" délimite
+    fields = ["S", "1", str(pid), str(pid), "0", "-1", "4194560", "100", "0", "0", "0",
+              str(utime), str(stime), "0", "0", "20", "0", "1", "0"]
+    (pid_dir / "stat").write_text(f"{pid} (xfree rdp (x)) " + " ".join(fields) + "\n")
+
+
+def test_read_process_usage_from_fake_proc(tmp_path):
+    write_proc(tmp_path, 42, rss_pages=256, utime=70, stime=30)
+    assert app.read_process_usage(42, str(tmp_path)) == (256 * app.PAGE_SIZE, 100)
+    assert app.read_process_usage(43, str(tmp_path)) is None
+
+
+def test_sample_computes_cpu_between_samples(tmp_path, monkeypatch):
+    supervisor = app.SessionSupervisor(proc_root=str(tmp_path))
+    session = FakeSession(7)
+    supervisor.add(session)
+    clock = [100.0]
+    monkeypatch.setattr(app.time, "monotonic", lambda: clock[0])
+    write_proc(tmp_path, 7, rss_pages=10, utime=0, stime=0)
+    supervisor.sample()
+    assert session.rss == 10 * app.PAGE_SIZE
+    assert session.cpu is None
+    clock[0] += 2
+    write_proc(tmp_path, 7, rss_pages=20, utime=app.CLOCK_TICKS, stime=0)
+    supervisor.sample()
+    assert session.rss == 20 * app.PAGE_SIZE
+    assert session.cpu == pytest.approx(50.0)
+
+
+def test_session_limit(tmp_path):
+    supervisor = app.SessionSupervisor(max_sessions=2, proc_root=str(tmp_path))
+    first, second = FakeSession(1), FakeSession(2)
+    supervisor.add(first)
+    assert supervisor.check_limits() is None
+    supervisor.add(second)
+    assert supervisor.check_limits() == ("session_limit", "2/2")
+    second.end()
+    assert supervisor.check_limits() is None
+
+
+def test_memory_limit(tmp_path):
+    supervisor = app.SessionSupervisor(max_memory_mb=100, proc_root=str(tmp_path))
+    pages_per_mb = 1048576 // app.PAGE_SIZE
+    for pid in (1, 2):
+        write_proc(tmp_path, pid, rss_pages=60 * pages_per_mb, utime=0, stime=0)
+        supervisor.add(FakeSession(pid))
+    assert supervisor.check_limits() == ("memory_limit", "120/100 Mo")
+
+
+def test_registry_forgets_ended_sessions(tmp_path):
+    supervisor = app.SessionSupervisor(proc_root=str(tmp_path))
+    session = FakeSession(1, conn_id="c1")
+    supervisor.add(session)
+    assert supervisor.find("c1", "u") is session
+    session.end()
+    assert supervisor.find("c1", "u") is None
+
+
+FREERDP_LINES = {
+    "auth_failed": "[12:00:01:123] [4242:4243] [ERROR][com.freerdp.core] - freerdp_set_last_error_ex "
+                   "ERRCONNECT_LOGON_FAILURE [0x00020014]",
+    "dns_failed": "[12:00:01:123] [4242:4243] [ERROR][com.freerdp.core] - getaddrinfo: Name or service not known",
+    "tls_failed": "[12:00:01:123] [4242:4243] [ERROR][com.freerdp.core] - freerdp_set_last_error_ex "
+                  "ERRCONNECT_TLS_CONNECT_FAILED [0x00020008]",
+    "connect_failed": "[12:00:01:123] [4242:4243] [ERROR][com.freerdp.core] - freerdp_set_last_error_ex "
+                      "ERRCONNECT_CONNECT_TRANSPORT_FAILED [0x0002000D]",
+    "connected": "[12:00:01:123] [4242:4243] [INFO][com.freerdp.client.x11] - Local framebuffer format  "
+                 "PIXEL_FORMAT_BGRX32",
+}
+
+
+@pytest.mark.parametrize("event", sorted(FREERDP_LINES))
+def test_classify_freerdp_lines(event):
+    assert app.classify_xfreerdp_line(FREERDP_LINES[event]) == event
+
+
+def test_classify_ignores_noise():
+    assert app.classify_xfreerdp_line("[WARN][com.freerdp.crypto] - Certificate verification failure") is None
+
+
+def run_session(script):
+    proc = app.subprocess.Popen(["sh", "-c", script], stdout=app.subprocess.PIPE, stderr=app.subprocess.PIPE,
+                                text=True)
+    session = app.RDPSession(["srv", "10.0.0.1", "u", "", "", "", "", "id1", "", ""], "u", proc)
+    ended = app.threading.Event()
+    session.on_exit(lambda s: ended.set())
+    assert ended.wait(10)
+    return session
+
+
+def test_session_reports_failure_from_stderr():
+    session = run_session(f"echo starting; echo '{FREERDP_LINES['auth_failed']}' >&2; exit 131")
+    assert (session.state, session.reason) == ("failed", "auth_failed")
+    assert session.returncode == 131
+    assert "starting" in session.log_text()
+
+
+def test_session_ring_buffer_keeps_last_lines():
+    total = app.SESSION_LOG_LINES + 50
+    session = run_session(f"i=0; while [ $i -lt {total} ]; do echo line$i; i=$((i+1)); done")
+    assert len(session.log) == app.SESSION_LOG_LINES
+    assert session.log[0] == "line50"
+    assert session.log[-1] == f"line{total - 1}"
+    assert (session.state, session.reason) == ("failed", "session_exited")
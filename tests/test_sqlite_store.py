@@ -0,0 +1,57 @@
+import SwiftRDP_app as app
+
+
+def make_row(name, ip, group=""):
+    return [name, ip, "admin", "", "", group, "", "", "", ""]
+
+
+def open_store(tmp_path):
+    return app.SQLiteConnectionStore(str(tmp_path / "connexions.db"), str(tmp_path / "connexions.txt"),
+                                     str(tmp_path / "groups.txt"))
+
+
+def test_update_and_delete(tmp_path):
+    store = open_store(tmp_path)
+    kept = store.add(make_row("kept", "10.0.0.1"))
+    gone = store.add(make_row("gone", "10.0.0.2"))
+    store.update(store.get(kept), make_row("kept", "10.0.0.10", "prod"))
+    store.delete(gone)
+    reopened = open_store(tmp_path)
+    assert [(row[0], row[1], row[5], row[7]) for row in reopened.rows()] == [("kept", "10.0.0.10", "prod", kept)]
+
+
+def test_update_with_cold_cache(tmp_path):
+    conn_id = open_store(tmp_path).add(make_row("srv", "10.0.0.1"))
+    store = open_store(tmp_path)
+    # Aucune lecture préalable : le cache est vide
+    store.update(make_row("srv", "10.0.0.1")[:7] + [conn_id], make_row("srv", "10.0.0.9"))
+    assert open_store(tmp_path).get(conn_id)[1] == "10.0.0.9"
+    assert store.get(conn_id)[1] == "10.0.0.9"
+
+
+def test_write_from_other_connection_invalidates_cache(tmp_path):
+    first = open_store(tmp_path)
+    conn_id = first.add(make_row("srv", "10.0.0.1"))
+    assert first.get(conn_id)[1] == "10.0.0.1"
+    # Autre processus : autre connexion SQLite sur la même base
+    other = open_store(tmp_path)
+    other.update(other.get(conn_id), make_row("srv", "10.0.0.2"))
+    other.add(make_row("new", "10.0.0.3"))
+    assert first.get(conn_id)[1] == "10.0.0.2"
+    assert sorted(row[0] for row in first.rows()) == ["new", "srv"]
+    # Mise à jour après invalidation : appliquée sur la ligne actuelle
+    first.update(first.get(conn_id), make_row("srv", "10.0.0.4"))
+    assert other.get(conn_id)[1] == "10.0.0.4"
+
+
+def test_migration_from_text_files(tmp_path):
+    text_store = app.ConnectionStore(str(tmp_path / "connexions.txt"), str(tmp_path / "groups.txt"))
+    text_store.save([make_row("a", "10.0.0.1", "prod"), make_row("b", "10.0.0.2")])
+    text_store.save_groups(["prod", "test"])
+    ids = [row[7] for row in text_store.rows()]
+    store = open_store(tmp_path)
+    assert [row[7] for row in store.rows()] == ids
+    assert [row[0] for row in store.rows()] == ["a", "b"]
+    assert store.groups() == ["prod", "test"]
+    # Migration unique : une nouvelle ouverture ne réimporte pas les fichiers texte
+    assert len(open_store(tmp_path).rows()) == 2
@@ -0,0 +1,159 @@
+import os
+
+import pytest
+
+import SwiftRDP_app as app
+
+
+def make_row(name, ip, group=""):
+    return [name, ip, "admin", "", "", group, "", "", "", ""]
+
+
+def test_sqlite_migration_replays_text_journal(tmp_path):
+    conns = str(tmp_path / "connexions.txt")
+    groups = str(tmp_path / "groups.txt")
+    journal = str(tmp_path / "connexions.journal")
+    text_store = app.ConnectionStore(conns, groups, journal)
+    text_store.save([make_row("kept", "10.0.0.1"), make_row("edited", "10.0.0.2"), make_row("deleted", "10.0.0.3")])
+    text_store.save_groups(["prod"])
+    edited = text_store.find_by_name("edited")
+    deleted = text_store.find_by_name("deleted")
+    text_store.update(edited, make_row("edited", "10.0.0.20", "prod"))
+    text_store.delete(deleted[7])
+    text_store.add(make_row("added", "10.0.0.4"))
+    text_store.flush()
+    # Les changements ne sont que dans le journal, connexions.txt n'a pas été compacté
+    with open(conns, encoding="utf-8") as f:
+        assert "10.0.0.20" not in f.read()
+
+    db_store = app.SQLiteConnectionStore(str(tmp_path / "connexions.db"), conns, groups, journal)
+    rows = {row[0]: row for row in db_store.rows()}
+    assert sorted(rows) == ["added", "edited", "kept"]
+    assert rows["edited"][1] == "10.0.0.20"
+    assert rows["edited"][5] == "prod"
+    assert rows["edited"][7] == edited[7]
+    assert db_store.groups() == ["prod"]
+
+
+def test_stamp_last_connection_keeps_concurrent_edits(tmp_path, monkeypatch):
+    store = app.ConnectionStore(str(tmp_path / "connexions.txt"), str(tmp_path / "groups.txt"))
+    monkeypatch.setattr(app, "connection_store", store)
+    conn_id = store.add(make_row("srv", "10.0.0.1"))
+    launched = store.get(conn_id).copy()
+    # Modification faite pendant l'établissement de la session
+    edited = launched.copy()
+    edited[0], edited[4] = "srv-renamed", "note"
+    store.update(launched, edited)
+    app.stamp_last_connection(conn_id)
+    row = store.get(conn_id)
+    assert row[0] == "srv-renamed"
+    assert row[4] == "note"
+    assert row[3]
+
+
+def test_torn_journal_line_does_not_swallow_later_entries(tmp_path):
+    conns = str(tmp_path / "connexions.txt")
+    groups = str(tmp_path / "groups.txt")
+    journal = str(tmp_path / "connexions.journal")
+    store = app.ConnectionStore(conns, groups, journal)
+    store.save([make_row("base", "10.0.0.1")])
+    store.add(make_row("first", "10.0.0.2"))
+    store.add(make_row("second", "10.0.0.3"))
+    store.flush()
+    # Arrêt brutal au milieu de l'écriture de la dernière entrée
+    with open(journal, "rb+") as f:
+        size = f.seek(0, 2)
+        f.truncate(size - 20)
+
+    store = app.ConnectionStore(conns, groups, journal)
+    assert sorted(row[0] for row in store.rows()) == ["base", "first"]
+    store.add(make_row("after-crash", "10.0.0.4"))
+    store.flush()
+
+    reloaded = app.ConnectionStore(conns, groups, journal)
+    assert sorted(row[0] for row in reloaded.rows()) == ["after-crash", "base", "first"]
+
+
+def counting_reads(monkeypatch):
+    """Compte les lignes relues depuis connexions.txt."""
+    reads = []
+    parse = app.parse_connection_line
+
+    def counted(line):
+        reads.append(line)
+        return parse(line)
+    monkeypatch.setattr(app, "parse_connection_line", counted)
+    return reads
+
+
+def rewrite(path, text, mtime_ns=None, replace=False):
+    """Réécrit un fichier, en place ou par remplacement (nouvel inode), à mtime choisie."""
+    target = path + ".new" if replace else path
+    with open(target, "w", encoding="utf-8") as f:
+        f.write(text)
+    if mtime_ns is not None:
+        os.utime(target, ns=(mtime_ns, mtime_ns))
+    if replace:
+        os.replace(target, path)
+
+
+@pytest.fixture
+def cached(tmp_path, monkeypatch):
+    conns = str(tmp_path / "connexions.txt")
+    store = app.ConnectionStore(conns, str(tmp_path / "groups.txt"))
+    store.save([make_row("srv1", "10.0.0.1"), make_row("srv2", "10.0.0.2")])
+    reads = counting_reads(monkeypatch)
+    store.rows()
+    return store, conns, reads
+
+
+def test_cache_not_reread_when_unchanged(cached):
+    store, conns, reads = cached
+    version = store.version
+    for _ in range(3):
+        store.rows()
+        store.get(store.rows()[0][7])
+    assert reads == []
+    assert store.version == version
+
+
+def test_cache_reread_on_mtime_change(cached):
+    store, conns, reads = cached
+    with open(conns, encoding="utf-8") as f:
+        text = f.read()
+    st = os.stat(conns)
+    rewrite(conns, text.replace("srv1", "srvX"), mtime_ns=st.st_mtime_ns + 1_000_000_000)
+    assert os.stat(conns).st_size == st.st_size
+    assert os.stat(conns).st_ino == st.st_ino
+    assert [row[0] for row in store.rows()] == ["srvX", "srv2"]
+    assert len(reads) == 2
+
+
+def test_cache_reread_on_size_change(cached):
+    store, conns, reads = cached
+    with open(conns, encoding="utf-8") as f:
+        text = f.read()
+    st = os.stat(conns)
+    rewrite(conns, text.replace("srv1", "srv-long"), mtime_ns=st.st_mtime_ns)
+    assert [row[0] for row in store.rows()] == ["srv-long", "srv2"]
+
+
+def test_cache_reread_on_inode_change(cached):
+    store, conns, reads = cached
+    with open(conns, encoding="utf-8") as f:
+        text = f.read()
+    st = os.stat(conns)
+    # Même taille et même mtime : seul l'inode distingue le nouveau fichier
+    rewrite(conns, text.replace("srv1", "srvY"), mtime_ns=st.st_mtime_ns, replace=True)
+    assert os.stat(conns).st_ino != st.st_ino
+    assert [row[0] for row in store.rows()] == ["srvY", "srv2"]
+
+
+def test_groups_cache_invalidation(tmp_path):
+    groups = str(tmp_path / "groups.txt")
+    store = app.ConnectionStore(str(tmp_path / "connexions.txt"), groups)
+    store.save_groups(["prod", "test"])
+    assert store.groups() == ["prod", "test"]
+    st = os.stat(groups)
+    rewrite(groups, "prod\ndev\n", mtime_ns=st.st_mtime_ns, replace=True)
+    assert store.groups() == ["prod", "dev"]
@@ -0,0 +1,227 @@
+import random
+
+import pytest
+
+import SwiftRDP_app as app
+
+
+class FakeTree:
+    """Treeview minimal : mêmes règles que ttk pour insert, detach, move et delete."""
+    def __init__(self):
+        self.nodes = {"": {"children": [], "parent": None}}
+        self.calls = []
+        self.focused = ""
+
+    def _unlink(self, iid):
+        parent = self.nodes[iid]["parent"]
+        if parent is not None:
+            self.nodes[parent]["children"].remove(iid)
+            self.nodes[iid]["parent"] = None
+
+    def insert(self, parent, index, iid, text="", values=(), tags=(), open=False):
+        assert iid not in self.nodes
+        self.calls.append(("insert", iid))
+        self.nodes[iid] = {"children": [], "parent": parent, "text": text,
+                           "values": tuple(values), "tags": tuple(tags)}
+        self.nodes[parent]["children"].insert(index, iid)
+
+    def detach(self, iid):
+        self.calls.append(("detach", iid))
+        self._unlink(iid)
+
+    def move(self, iid, parent, index):
+        self.calls.append(("move", iid))
+        self._unlink(iid)
+        self.nodes[iid]["parent"] = parent
+        self.nodes[parent]["children"].insert(index, iid)
+
+    def delete(self, iid):
+        self.calls.append(("delete", iid))
+        self._unlink(iid)
+        stack = [iid]
+        while stack:
+            node = self.nodes.pop(stack.pop())
+            stack.extend(node["children"])
+
+    def item(self, iid, text, values, tags):
+        self.calls.append(("item", iid))
+        self.nodes[iid].update(text=text, values=tuple(values), tags=tuple(tags))
+
+    def focus(self):
+        return self.focused
+
+    def exists(self, iid):
+        return iid in self.nodes
+
+    def get_children(self, parent=""):
+        return tuple(self.nodes[parent]["children"])
+
+
+def lis_length(seq):
+    """Plus longue sous-suite croissante, en O(n²) pour servir de référence."""
+    best = [1] * len(seq)
+    for i in range(len(seq)):
+        for j in range(i):
+            if seq[j] < seq[i]:
+                best[i] = max(best[i], best[j] + 1)
+    return max(best, default=0)
+
+
+def random_model(rng):
+    groups = rng.sample([f"grp:{n}" for n in range(6)], rng.randint(0, 6))
+    kids = {g: [] for g in groups}
+    if groups:
+        for c in rng.sample([f"c{n}" for n in range(40)], rng.randint(0, 40)):
+            kids[rng.choice(groups)].append((c, "", (c, rng.choice("ab")), ("odd",)))
+    return [(g, g, (), ("group",), kids[g], True) for g in groups]
+
+
+def expected_moves(previous, model):
+    """Déplacements minimaux : tout ce qui n'est pas dans la plus longue suite déjà ordonnée."""
+    parents = {"": [g for g, *_ in model]}
+    parents.update({g: [k[0] for k in kids] for g, _t, _v, _tg, kids, _o in model})
+    owner = {iid: parent for parent, iids in parents.items() for iid in iids}
+    moves = 0
+    for parent, current in previous.items():
+        if parent not in parents:
+            moves += sum(1 for iid in current if iid in owner)
+            continue
+        rank = {iid: i for i, iid in enumerate(parents[parent])}
+        same = [rank[iid] for iid in current if owner.get(iid) == parent]
+        moves += len(same) - lis_length(same)
+        moves += sum(1 for iid in current if iid in owner and owner[iid] != parent)
+    return moves
+
+
+def check_tree(tree, model):
+    assert tree.get_children("") == tuple(g for g, *_ in model)
+    for g, _text, _values, _tags, kids, _open in model:
+        assert tree.get_children(g) == tuple(k[0] for k in kids)
+        for iid, text, values, tags in kids:
+            node = tree.nodes[iid]
+            assert (node["text"], node["values"], node["tags"]) == (text, values, tags)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_reconciler_fuzz(seed):
+    rng = random.Random(seed)
+    tree = FakeTree()
+    reconciler = app.TreeReconciler(tree)
+    for _ in range(30):
+        previous = {p: list(c) for p, c in reconciler.children.items()}
+        before = dict(reconciler.items)
+        model = random_model(rng)
+        tree.calls = []
+        reconciler.apply(model)
+        check_tree(tree, model)
+
+        # Les éléments conservés gardent leur iid : jamais supprimés ni recréés
+        survivors = {iid for iid in before if iid in reconciler.items}
+        touched = {iid for call, iid in tree.calls if call in ("insert", "delete")}
+        assert not survivors & touched
+        moved = [iid for call, iid in tree.calls if call == "move"]
+        detached = [iid for call, iid in tree.calls if call == "detach"]
+        assert sorted(moved) == sorted(detached)
+        assert len(moved) == expected_moves(previous, model)
+        # Mise à jour seulement si le texte, les valeurs ou les tags ont changé
+        updated = {iid for call, iid in tree.calls if call == "item"}
+        assert updated == {iid for iid in survivors
+                           if before[iid][1:] != reconciler.items[iid][1:]}
+
+
+def test_reconciler_keeps_manual_order_after_resync():
+    tree = FakeTree()
+    reconciler = app.TreeReconciler(tree)
+    kids = [(f"c{n}", "", (f"c{n}",), ()) for n in range(5)]
+    model = [("grp:a", "a", (), (), kids, True)]
+    reconciler.apply(model)
+    # Tri manuel depuis l'en-tête de colonne
+    for index, iid in enumerate(reversed(tree.get_children("grp:a"))):
+        tree.move(iid, "grp:a", index)
+    reconciler.resync_order()
+    tree.calls = []
+    reconciler.apply([("grp:a", "a", (), (), list(reversed(kids)), True)])
+    assert tree.calls == []
+
+
+class FakeSearchVar:
+    def get(self):
+        return ""
+
+
+class FakeReconnector:
+    def status(self, conn_id):
+        return None
+
+
+class FakeApp:
+    """Ce que refresh_table_global et les méthodes de chargement paresseux utilisent de RDPApp."""
+    def __init__(self):
+        self.tree = FakeTree()
+        self.table = app.TreeReconciler(self.tree)
+        self.search_var = FakeSearchVar()
+        self.reconnector = FakeReconnector()
+        self.lazy_mode = False
+        self.lazy_loaded = {}
+
+    def refresh_table(self):
+        app.refresh_table_global(self)
+
+    def open_group(self, grp):
+        self.tree.focused = app.group_iid(grp)
+        app.RDPApp.on_tree_open(self, None)
+
+    def load_more(self, grp):
+        app.RDPApp.load_more(self, app.lazy_more_iid(grp))
+
+    def shown(self, grp):
+        return [self.tree.nodes[iid]["text"] for iid in self.tree.get_children(app.group_iid(grp))]
+
+
+@pytest.fixture
+def lazy_app(tmp_path, monkeypatch):
+    store = app.ConnectionStore(str(tmp_path / "connexions.txt"), str(tmp_path / "groups.txt"))
+    rows = [[f"srv{n:02d}", f"10.0.0.{n}", "admin", "", "", "prod", "", "", "", ""] for n in range(12)]
+    rows.append(["db", "10.0.1.1", "admin", "", "", "data", "", "", "", ""])
+    store.save(rows)
+    monkeypatch.setattr(app, "connection_store", store)
+    monkeypatch.setattr(app, "LAZY_THRESHOLD", 10)
+    monkeypatch.setattr(app, "LAZY_CHUNK", 5)
+    fake = FakeApp()
+    fake.refresh_table()
+    return fake
+
+
+def test_small_inventory_is_fully_displayed(lazy_app, monkeypatch):
+    monkeypatch.setattr(app, "LAZY_THRESHOLD", 100)
+    fake = FakeApp()
+    fake.refresh_table()
+    assert not fake.lazy_mode
+    assert len(fake.shown("prod")) == 12
+    assert fake.table.is_open(app.group_iid("prod"))
+
+
+def test_large_inventory_starts_collapsed(lazy_app):
+    assert lazy_app.lazy_mode
+    # Seul l'enfant factice est inséré : il rend le groupe dépliable
+    assert lazy_app.shown("prod") == ["..."]
+    assert lazy_app.shown("data") == ["..."]
+    assert not lazy_app.table.is_open(app.group_iid("prod"))
+
+
+def test_groups_are_filled_by_chunks(lazy_app):
+    lazy_app.open_group("prod")
+    assert lazy_app.shown("prod") == [f"srv{n:02d}" for n in range(5)] + [
+        app.t("load_more", count=5, total=7)]
+    assert lazy_app.shown("data") == ["..."]
+
+    lazy_app.tree.calls = []
+    lazy_app.load_more("prod")
+    assert lazy_app.shown("prod")[:-1] == [f"srv{n:02d}" for n in range(10)]
+    assert lazy_app.shown("prod")[-1] == app.t("load_more", count=2, total=2)
+    # Seul le nouveau lot est inséré, les lignes déjà affichées restent en place
+    inserted = [iid for call, iid in lazy_app.tree.calls if call == "insert"]
+    assert len(inserted) == 5
+
+    lazy_app.load_more("prod")
+    assert lazy_app.shown("prod") == [f"srv{n:02d}" for n in range(12)]
@@ -0,0 +1,148 @@
+import json
+import subprocess
+
+import pytest
+
+import SwiftRDP_app as app
+
+
+def git(*args, cwd=None):
+    subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+                   cwd=cwd, check=True, capture_output=True)
+
+
+def publish(work, version):
+    (work / "version.txt").write_text(version + "\n")
+    git("add", "version.txt", cwd=work)
+    git("commit", "-q", "-m", version, cwd=work)
+    git("push", "-q", "origin", "HEAD", cwd=work)
+
+
+@pytest.fixture
+def remote(tmp_path, monkeypatch):
+    bare = tmp_path / "remote.git"
+    work = tmp_path / "work"
+    git("init", "-q", "--bare", str(bare))
+    git("clone", "-q", str(bare), str(work))
+    publish(work, "3.0")
+    monkeypatch.setattr(app, "UPDATE_CACHE_FILE", str(tmp_path / "update_check.json"))
+    monkeypatch.setattr(app, "UPDATE_REPO_URL", f"file://{bare}")
+    monkeypatch.setattr(app, "UPDATE_INTERVAL", 6.0)
+    return work
+
+
+def test_remote_version_from_bare_repo(remote):
+    assert app.probe_remote_version() == "3.0"
+    cache = app.load_update_cache()
+    assert cache["version"] == "3.0"
+    assert len(cache["ref"]) == 40
+
+
+def test_cached_result_within_interval(remote, monkeypatch):
+    assert app.probe_remote_version() == "3.0"
+    publish(remote, "4.0")
+
+    def no_git(*args, **kwargs):
+        raise AssertionError("git must not run while the cached result is valid")
+    monkeypatch.setattr(app, "run_git", no_git)
+    assert app.probe_remote_version() == "3.0"
+
+
+def test_expired_cache_rereads_only_changed_commit(remote, monkeypatch):
+    assert app.probe_remote_version() == "3.0"
+    monkeypatch.setattr(app, "UPDATE_INTERVAL", 0)
+    fetches = []
+    fetch = app.fetch_remote_version
+    monkeypatch.setattr(app, "fetch_remote_version", lambda *args: fetches.append(args) or fetch(*args))
+    # Même commit distant : ls-remote suffit, version.txt n'est pas relu
+    assert app.probe_remote_version() == "3.0"
+    assert fetches == []
+    publish(remote, "4.0")
+    assert app.probe_remote_version() == "4.0"
+    assert len(fetches) == 1
+
+
+def test_offline_returns_empty_and_keeps_cache(remote, tmp_path, monkeypatch):
+    assert app.probe_remote_version() == "3.0"
+    with open(app.UPDATE_CACHE_FILE, encoding="utf-8") as f:
+        before = json.load(f)
+    assert app.probe_remote_version(f"file://{tmp_path}/missing.git", force=True) == ""
+    assert app.load_update_cache() == before
+
+
+@pytest.fixture
+def install(tmp_path, monkeypatch):
+    """Installation d'origine (non versionnée) en version 3.0."""
+    root = tmp_path / "opt"
+    root.mkdir()
+    (root / "version.txt").write_text("3.0\n")
+    (root / "app.py").write_text("print('old')\n")
+    (root / "icon.png").write_bytes(b"same")
+    monkeypatch.setattr(app, "INSTALL_DIR", str(root))
+    monkeypatch.setattr(app, "CURRENT_LINK", str(root / "current"))
+    monkeypatch.setattr(app, "PREVIOUS_LINK", str(root / "previous"))
+    monkeypatch.setattr(app, "VERSIONS_DIR", str(root / "versions"))
+    monkeypatch.setattr(app, "PROJECT_DIR", str(root))
+    return root
+
+
+def publish_tree(work, files):
+    for name, content in files.items():
+        (work / name).write_bytes(content)
+    git("add", "-A", cwd=work)
+    git("commit", "-q", "-m", "release", cwd=work)
+    git("push", "-q", "origin", "HEAD", cwd=work)
+
+
+def test_delta_install_switches_current(remote, install, monkeypatch):
+    publish_tree(remote, {"version.txt": b"4.0\n", "app.py": b"print('new')\n", "icon.png": b"same"})
+    calls = []
+    run_git = app.run_git
+
+    def spy(*args, **kwargs):
+        calls.append(args)
+        return run_git(*args, **kwargs)
+    monkeypatch.setattr(app, "run_git", spy)
+    target = app.install_update(app.UPDATE_REPO_URL, "4.0")
+    # Seuls les fichiers modifiés sont extraits du dépôt
+    changed = [sorted(args[3:]) for args in calls if args[0] == "checkout"]
+    assert changed == [["app.py", "version.txt"]]
+    current = install / "current"
+    assert str(current.resolve()) == app.os.path.realpath(target)
+    assert (current / "app.py").read_text() == "print('new')\n"
+    assert (current / "icon.png").read_bytes() == b"same"
+    assert (install / "previous").resolve() == install.resolve()
+
+
+def test_two_installs_in_the_same_second(remote, install, monkeypatch):
+    publish_tree(remote, {"version.txt": b"4.0\n", "app.py": b"print('new')\n"})
+    monkeypatch.setattr(app.time, "time", lambda: 1700000000.0)
+    first = app.install_update(app.UPDATE_REPO_URL, "4.0")
+    monkeypatch.setattr(app, "PROJECT_DIR", app.CURRENT_LINK)
+    second = app.install_update(app.UPDATE_REPO_URL, "4.0")
+    assert first != second
+    # Seules les versions courante et précédente sont conservées
+    assert sorted(app.os.listdir(app.VERSIONS_DIR)) == sorted(app.os.path.basename(p) for p in (first, second))
+
+
+def test_rollback_restores_previous_version(remote, install, monkeypatch):
+    publish_tree(remote, {"version.txt": b"4.0\n", "app.py": b"print('new')\n"})
+    first = app.install_update(app.UPDATE_REPO_URL, "4.0")
+    monkeypatch.setattr(app, "PROJECT_DIR", app.CURRENT_LINK)
+    publish_tree(remote, {"version.txt": b"5.0\n", "app.py": b"print('newer')\n"})
+    app.install_update(app.UPDATE_REPO_URL, "5.0")
+    assert (install / "current" / "version.txt").read_text() == "5.0\n"
+    assert app.rollback_update()
+    assert str((install / "current").resolve()) == app.os.path.realpath(first)
+    assert (install / "current" / "app.py").read_text() == "print('new')\n"
+
+
+def test_rollback_to_original_install_removes_current(remote, install):
+    publish_tree(remote, {"version.txt": b"4.0\n", "app.py": b"print('new')\n"})
+    app.install_update(app.UPDATE_REPO_URL, "4.0")
+    assert app.rollback_update()
+    assert not (install / "current").exists()
+
+
+def test_rollback_without_previous_version(install):
+    assert not app.rollback_update()